@@ -14,9 +14,15 @@ Update the Hiero export to be Tank/Shotgun aware
 import re
 import os
 import sys
+import time
 import shutil
 import tempfile
 import traceback
+import collections
+
+# time spent loading the app, logged once it is initialized
+_STARTUP_TIMES = collections.OrderedDict()
+_started = time.perf_counter()
 
 import sgtk
 from sgtk.platform.qt import QtCore
@@ -31,6 +37,9 @@ import hiero.exporters
 from hiero.exporters import FnExternalRender
 from hiero.exporters import FnNukeShotExporter
 
+_STARTUP_TIMES["hiero imports"] = time.perf_counter() - _started
+_started = time.perf_counter()
+
 # do not use tk import here, hiero needs the classes to be in their
 # standard namespace, hack to get the right path in sys.path
 sys.path.append(os.path.join(os.path.dirname(__file__), "python"))
@@ -51,12 +60,15 @@ from tk_hiero_export import (
     ShotgunNukeShotExporterUI,
     ShotgunAudioExporterUI,
     ShotgunHieroObjectBase,
-    ShotgunDeadlineRenderSubmission,
-    ShotgunDeadlineRenderTask,
+    ShotgunDeadlineSubmission,
+    NULL_TRACER,
+    SGCallGuard,
 )
 
 sys.path.pop()
 
+_STARTUP_TIMES["tk_hiero_export imports"] = time.perf_counter() - _started
+
 # list keywords Hiero is using in its export substitution
 HIERO_SUBSTITUTION_KEYWORDS = [
     "clip",
@@ -91,7 +103,127 @@ class HieroExport(Application):
     def init_app(self):
         # let the shot exporter know when the first shot is being run
         self.first_shot = False
+        # timing spans of the current export, see the trace_exports setting
+        self.tracer = NULL_TRACER
+        # ledger of the api calls of the current export, see the
+        # sg_call_ledger setting
+        self.sg_ledger = None
+        # hook instances of the current export, see the
+        # cache_hook_instances setting
+        self.hook_dispatcher = None
+        # writes of the current export, see the queue_sg_writes setting
+        self.sg_write_queue = None
+        # sends the queued writes, outliving the export which queued them
+        self.sg_write_flusher = None
+        # hiero paths of the default preset templates, see
+        # _translate_template
+        self._translated_templates = {}
+        # property definitions of the customize export ui hook, by hook
+        # method, for the current context
+        self.custom_property_cache = {}
+        # lists shown by the export dialog, see
+        # ShotgunShotProcessorUI._get_ui_lookup
+        self.ui_lookup_cache = {}
+        # the headless batch export running, see run_batch_export
+        self.batch_job = None
+        # rate limits and retries the api calls of all the exports, see the
+        # sg_max_call_rate and sg_call_retries settings
+        self.sg_call_guard = SGCallGuard(
+            self.logger,
+            max_rate=self.get_setting("sg_max_call_rate"),
+            retries=self.get_setting("sg_call_retries"),
+            cool_off=self.get_setting("sg_circuit_cool_off"),
+        )
+
+        start = time.perf_counter()
         self._register_exporter()
+        _STARTUP_TIMES["exporter registration"] = time.perf_counter() - start
+        self.log_debug(
+            "App loaded in %.1f ms: %s"
+            % (
+                sum(_STARTUP_TIMES.values()) * 1000.0,
+                ", ".join(
+                    "%s %.1f ms" % (name, seconds * 1000.0)
+                    for (name, seconds) in _STARTUP_TIMES.items()
+                ),
+            )
+        )
+
+    @property
+    def shotgun(self):
+        """
+        The Flow Production Tracking connection, rate limiting and retrying
+        the calls made through it, queuing its writes when the current export
+        queues them, and recording the calls, queued writes included, when
+        the current export keeps a call ledger.
+        """
+        shotgun = super(HieroExport, self).shotgun
+        guard = getattr(self, "sg_call_guard", None)
+        if guard is not None:
+            shotgun = guard.wrap(shotgun)
+        queue = getattr(self, "sg_write_queue", None)
+        if queue is not None:
+            shotgun = queue.wrap(shotgun)
+        ledger = getattr(self, "sg_ledger", None)
+        if ledger is not None:
+            shotgun = ledger.wrap(shotgun)
+        return shotgun
+
+    def execute_hook(self, key, **kwargs):
+        """
+        Executes a hook, recording a span for it when exports are traced.
+        During an export, the hook instance is reused from one call to the
+        next.
+        """
+        with self.tracer.span(key, "hook"):
+            dispatcher = getattr(self, "hook_dispatcher", None)
+            if dispatcher is not None:
+                return dispatcher.call(key, "execute", **kwargs)
+            return super(HieroExport, self).execute_hook(key, **kwargs)
+
+    def execute_hook_method(self, key, method_name, **kwargs):
+        """
+        Executes a hook method, recording a span for it when exports are
+        traced. During an export, the hook instance is reused from one call
+        to the next.
+        """
+        with self.tracer.span("%s.%s" % (key, method_name), "hook"):
+            dispatcher = getattr(self, "hook_dispatcher", None)
+            if dispatcher is not None:
+                return dispatcher.call(key, method_name, **kwargs)
+            return super(HieroExport, self).execute_hook_method(
+                key, method_name, **kwargs
+            )
+
+    def _execute_hook_method_uncached(self, key, method_name, **kwargs):
+        """
+        Executes a hook method with a new hook instance, for the hooks the
+        dispatcher of the export can't instantiate up front.
+        """
+        return super(HieroExport, self).execute_hook_method(key, method_name, **kwargs)
+
+    @property
+    def export_state_location(self):
+        """
+        The folder the state of the current export is kept in: its journal,
+        write queue, traces and call ledgers. Each batch export has its own,
+        so that several of them can run at once on the same machine.
+        """
+        if self.batch_job is not None:
+            return self.batch_job.state_location(self.cache_location)
+        return self.cache_location
+
+    def run_batch_export(self, argv):
+        """
+        Runs a headless batch export of Hiero projects, see
+        ``tk_hiero_export.batch_export`` for the arguments.
+
+        :param list argv: The command line arguments.
+        :returns: The exit code of the batch export.
+        """
+        from tk_hiero_export.batch_export import run_batch_export
+
+        return run_batch_export(self, argv)
 
     @property
     def context_change_allowed(self):
@@ -100,6 +232,15 @@ class HieroExport(Application):
         """
         return True
 
+    def post_context_change(self, old_context, new_context):
+        """
+        Forgets the custom property definitions and the export dialog lists
+        of the previous context, the customize export ui hook may define
+        other properties for the new one and the new project other tags.
+        """
+        self.custom_property_cache.clear()
+        self.ui_lookup_cache.clear()
+
     def get_default_encoder_name(self):
         """Returns the default encoder for use in quicktime generation.
 
@@ -172,20 +313,26 @@ class HieroExport(Application):
             ShotgunShotProcessorPreset, ShotgunShotProcessor
         )
 
-        hiero.ui.taskUIRegistry.registerTaskUI(
-            ShotgunTranscodePreset, ShotgunTranscodeExporterUI
-        )
-        hiero.ui.taskUIRegistry.registerTaskUI(
-            ShotgunNukeShotPreset, ShotgunNukeShotExporterUI
-        )
-        hiero.ui.taskUIRegistry.registerTaskUI(
-            ShotgunAudioPreset, ShotgunAudioExporterUI
-        )
-        hiero.ui.taskUIRegistry.registerProcessorUI(
-            ShotgunShotProcessorPreset, ShotgunShotProcessorUI
-        )
+        # there is no export dialog in terminal mode
+        if self.engine.has_ui:
+            hiero.ui.taskUIRegistry.registerTaskUI(
+                ShotgunTranscodePreset, ShotgunTranscodeExporterUI
+            )
+            hiero.ui.taskUIRegistry.registerTaskUI(
+                ShotgunNukeShotPreset, ShotgunNukeShotExporterUI
+            )
+            hiero.ui.taskUIRegistry.registerTaskUI(
+                ShotgunAudioPreset, ShotgunAudioExporterUI
+            )
+            hiero.ui.taskUIRegistry.registerProcessorUI(
+                ShotgunShotProcessorPreset, ShotgunShotProcessorUI
+            )
 
-        hiero.core.taskRegistry.addSubmission( "SG Submit to Deadline", ShotgunDeadlineRenderSubmission )
+        # the Deadline submission module is only loaded when an export is
+        # submitted to Deadline
+        hiero.core.taskRegistry.addSubmission(
+            "SG Submit to Deadline", ShotgunDeadlineSubmission
+        )
 
 
         # Add our default preset
@@ -214,24 +361,14 @@ class HieroExport(Application):
             render_template = self.get_template("template_render_path")
 
             # call the hook to translate them into hiero paths, using hiero keywords
-            plate_hiero_str = self.execute_hook(
-                "hook_translate_template", template=plate_template, output_type="plate"
-            )
-            self.log_debug("Translated %s --> %s" % (plate_template, plate_hiero_str))
-
-            script_hiero_str = self.execute_hook(
-                "hook_translate_template",
-                template=script_template,
-                output_type="script",
-            )
-            self.log_debug("Translated %s --> %s" % (script_template, script_hiero_str))
-
-            render_hiero_str = self.execute_hook(
-                "hook_translate_template",
-                template=render_template,
-                output_type="render",
+            start = time.perf_counter()
+            plate_hiero_str = self._translate_template(plate_template, "plate")
+            script_hiero_str = self._translate_template(script_template, "script")
+            render_hiero_str = self._translate_template(render_template, "render")
+            self.log_debug(
+                "Translated the default preset templates in %.1f ms"
+                % ((time.perf_counter() - start) * 1000.0)
             )
-            self.log_debug("Translated %s --> %s" % (render_template, render_hiero_str))
 
             # check so that no unknown keywords exist in the templates after translation
             self._validate_hiero_export_template(plate_hiero_str)
@@ -268,6 +405,28 @@ class HieroExport(Application):
             hiero.core.taskRegistry.removeProcessorPreset(name)
             hiero.core.taskRegistry.addProcessorPreset(name, preset)
 
+    def _translate_template(self, template, output_type):
+        """
+        Returns the hiero path of a template, as translated by the translate
+        template hook. Translations are cached by template definition, so
+        resetting the presets doesn't run the hook again.
+
+        :param template: The template to translate.
+        :param str output_type: The output type of the template.
+        """
+        key = (
+            self.get_setting("hook_translate_template"),
+            template.definition,
+            output_type,
+        )
+        if key not in self._translated_templates:
+            hiero_str = self.execute_hook(
+                "hook_translate_template", template=template, output_type=output_type
+            )
+            self.log_debug("Translated %s --> %s" % (template, hiero_str))
+            self._translated_templates[key] = hiero_str
+        return self._translated_templates[key]
+
     def _validate_hiero_export_template(self, template_str):
         """
         Validate that a template_str only contains Hiero substitution keywords or custom
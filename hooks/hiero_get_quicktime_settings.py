@@ -52,3 +52,18 @@ class HieroGetQuicktimeSettings(Hook):
             }
 
         return (file_type, properties)
+
+    def get_review_settings(self, **kwargs):
+        """
+        Gets the settings of the review movie uploaded to Flow Production
+        Tracking for transcodes that don't output a movie themselves.
+
+        The review movie is encoded with the settings returned by
+        :meth:`execute` for Flow Production Tracking, after reformatting the
+        plate down to the maximum width returned here.
+
+        :returns: A dictionary with a ``max_width`` key, the maximum width in
+            pixels of the review movie. ``None`` keeps the plate's resolution.
+        :rtype: dict
+        """
+        return {"max_width": 2048}
@@ -17,8 +17,8 @@ class HieroResolveCustomStrings(Hook):
     their concrete value when paths are being processed during the export.
     """
 
-    # Cache of shots that have already been pulled from shotgun
-    _sg_lookup_cache = {}
+    # number of shot codes per query when resolving keywords in bulk
+    QUERY_CHUNK_SIZE = 500
 
     def execute(self, task, keyword, **kwargs):
         """
@@ -36,8 +36,11 @@ class HieroResolveCustomStrings(Hook):
         """
         shot_code = task._item.name()
 
-        # grab the shot from the cache, or the get_shot hook if not cached
-        sg_shot = self._sg_lookup_cache.get(shot_code)
+        # grab the shot from the cache of the export, or the get_shot hook
+        # if not cached
+        cache = self.parent.preprocess_data.setdefault("custom_strings_shots", {})
+        cache_key = self._cache_key(task)
+        sg_shot = cache.get(cache_key)
         if sg_shot is None:
             fields = [
                 ctf["keyword"]
@@ -52,7 +55,7 @@ class HieroResolveCustomStrings(Hook):
                 upload_thumbnail=False,
             )
 
-            self._sg_lookup_cache[shot_code] = sg_shot
+            cache[cache_key] = sg_shot
 
         if sg_shot is None:
             raise RuntimeError("Could not find shot for custom resolver: %s" % keyword)
@@ -66,3 +69,83 @@ class HieroResolveCustomStrings(Hook):
         )
 
         return result
+
+    def resolve_keywords(self, tasks, keywords, **kwargs):
+        """
+        Resolves the keywords of all the exported shots with a query per
+        sequence and :attr:`QUERY_CHUNK_SIZE` shots, rather than a get_shot
+        hook call per shot.
+
+        The shots which don't exist yet, or can't be told apart by name, are
+        left out and resolved by :meth:`execute`, which creates them.
+
+        :param list tasks: An export task for each exported shot.
+        :param list keywords: The keyword tokens to resolve, curly brackets
+            included.
+
+        :returns: A dictionary of keyword values for each task.
+        :rtype: list
+        """
+        fields = [keyword[1:-1] for keyword in keywords]
+
+        # the tasks of each sequence, by shot code
+        sequences = {}
+        for task in tasks:
+            sequence = task._item.parentSequence()
+            if sequence is None:
+                continue
+            sequences.setdefault(sequence.name(), {}).setdefault(
+                task._item.name(), []
+            ).append(task)
+
+        sg = self.parent.shotgun
+        shots = {}
+        for sequence_name, codes in sequences.items():
+            codes = sorted(codes)
+            for start in range(0, len(codes), self.QUERY_CHUNK_SIZE):
+                chunk = codes[start : start + self.QUERY_CHUNK_SIZE]
+                found = sg.find(
+                    "Shot",
+                    [
+                        ["project", "is", self.parent.context.project],
+                        ["sg_sequence.Sequence.code", "is", sequence_name],
+                        ["code", "in", chunk],
+                    ],
+                    fields=["code"] + fields,
+                )
+                for sg_shot in found:
+                    key = (sequence_name, sg_shot["code"])
+                    # shots sharing a name are left to execute, which
+                    # reports them
+                    shots[key] = None if key in shots else sg_shot
+
+        cache = self.parent.preprocess_data.setdefault("custom_strings_shots", {})
+        results = []
+        for task in tasks:
+            sequence = task._item.parentSequence()
+            sg_shot = None
+            if sequence is not None:
+                sg_shot = shots.get((sequence.name(), task._item.name()))
+            if sg_shot is None:
+                results.append({})
+                continue
+            cache[self._cache_key(task)] = sg_shot
+            results.append(
+                dict(
+                    (keyword, sg_shot.get(field, ""))
+                    for (keyword, field) in zip(keywords, fields)
+                )
+            )
+
+        return results
+
+    def _cache_key(self, task):
+        """
+        Returns the key of the shot of a task in the cache of the export.
+        """
+        sequence = task._item.parentSequence()
+        return (
+            self.parent.context.project["id"],
+            sequence.name() if sequence is not None else None,
+            task._item.name(),
+        )
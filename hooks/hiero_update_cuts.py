@@ -53,7 +53,7 @@ class HieroUpdateCuts(HookBaseClass):
             no CutItem entity was created.
         :rtype: dict or None
         """
-        cut_item = self.parent.sgtk.shotgun.create("CutItem", cut_item_data)
+        cut_item = self.parent.shotgun.create("CutItem", cut_item_data)
         self.parent.logger.info(
             "Created CutItem in Flow Production Tracking: %s" % cut_item
         )
@@ -60,4 +60,4 @@ class HieroUpdateShot(HookBaseClass):
         self.parent.logger.debug(
             "Updating info for %s %s: %s" % (entity_type, entity_id, entity_data)
         )
-        self.parent.sgtk.shotgun.update(entity_type, entity_id, entity_data)
+        self.parent.shotgun.update(entity_type, entity_id, entity_data)
@@ -35,3 +35,32 @@ class HieroResolveCustomStrings(HookBaseClass):
         :rtype: str
         """
         pass
+
+    def resolve_keywords(self, tasks, keywords, **kwargs):
+        """
+        Resolves the keywords of several shots at once. Called once per
+        export, before the tasks are queued, with a task for each exported
+        shot. The values returned are cached by project, sequence and shot
+        for the rest of the export, so the paths of the export tasks are
+        resolved without calling :meth:`execute` again.
+
+        The default implementation calls :meth:`execute` for each task and
+        keyword. Override it to fetch the values of all the shots with a
+        few queries.
+
+        :param list tasks: An export task for each exported shot.
+        :param list keywords: The keyword tokens to resolve, curly brackets
+            included.
+
+        :returns: A dictionary of keyword values for each task, in the order
+            of the tasks. The keywords missing from a dictionary are
+            resolved with :meth:`execute` when a path needs them.
+        :rtype: list
+        """
+        return [
+            dict(
+                (keyword, self.execute(task=task, keyword=keyword))
+                for keyword in keywords
+            )
+            for task in tasks
+        ]
@@ -71,7 +71,7 @@ class HieroUpdateShot(HookBaseClass):
             if not preset_properties.get("custom_update_cut_in_property", True):
                 del entity_data["sg_cut_in"]
 
-            self.parent.sgtk.shotgun.update(entity_type, entity_id, entity_data)
+            self.parent.shotgun.update(entity_type, entity_id, entity_data)
 
         :param str entity_type: The entity type to update.
         :param int entity_id: The id of the entity to update.
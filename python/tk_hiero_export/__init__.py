@@ -10,6 +10,7 @@
 
 import os
 import sys
+import importlib
 
 # We have the situation where we need the base_hooks module to be accessible
 # when building docs, but since the tk_hiero_export module requires the
@@ -63,7 +64,20 @@ from .sg_audio_export import (
     ShotgunAudioExporter,
     ShotgunAudioPreset,
 )
-from .deadline_submission import (
-    ShotgunDeadlineRenderTask,
-    ShotgunDeadlineRenderSubmission,
-)
\ No newline at end of file
+from .submissions import ShotgunDeadlineSubmission
+from .tracing import NULL_TRACER
+from .sg_call_guard import SGCallGuard
+
+# the classes imported the first time they are used, see
+# ShotgunDeadlineSubmission
+_LAZY_CLASSES = {
+    "ShotgunDeadlineRenderTask": "deadline_submission",
+    "ShotgunDeadlineRenderSubmission": "deadline_submission",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_CLASSES:
+        module = importlib.import_module(".%s" % _LAZY_CLASSES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -0,0 +1,219 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Sequence level audio cache.
+
+Bouncing the audio of a shot down means mixing the whole timeline for the
+shot's range. Rather than doing that for every shot, the mix of the range
+of the sequence covering all the exported shots is written once per export
+and audio settings, and the WAV of each shot is sliced out of the memory
+mapped master file.
+"""
+
+import os
+import mmap
+import shutil
+import struct
+import tempfile
+
+
+class WavError(Exception):
+    """
+    Raised when a master file isn't a WAV file we can slice.
+    """
+
+
+def read_wav_layout(fh):
+    """
+    Reads the layout of a WAV file.
+
+    :param fh: A file object opened in binary mode.
+    :returns: A tuple ``(fmt_chunk, data_offset, data_size, block_align,
+        sample_rate)`` where ``fmt_chunk`` is the complete ``fmt`` chunk,
+        header included.
+    """
+    header = fh.read(12)
+    if len(header) != 12 or header[0:4] != b"RIFF" or header[8:12] != b"WAVE":
+        raise WavError("Not a RIFF WAVE file")
+
+    file_size = os.fstat(fh.fileno()).st_size
+    fmt_chunk = None
+    while True:
+        chunk_header = fh.read(8)
+        if len(chunk_header) < 8:
+            raise WavError("No data chunk found")
+
+        (chunk_id, chunk_size) = struct.unpack("<4sI", chunk_header)
+        if chunk_id == b"fmt ":
+            body = fh.read(chunk_size + (chunk_size & 1))
+            fmt_chunk = chunk_header + body
+        elif chunk_id == b"data":
+            if fmt_chunk is None:
+                raise WavError("Data chunk found before the fmt chunk")
+            data_offset = fh.tell()
+            # streaming writers leave the size of the data chunk unset
+            data_size = min(chunk_size, file_size - data_offset)
+            (sample_rate,) = struct.unpack("<I", fmt_chunk[12:16])
+            (block_align,) = struct.unpack("<H", fmt_chunk[20:22])
+            return (fmt_chunk, data_offset, data_size, block_align, sample_rate)
+        else:
+            fh.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+
+def wav_header(fmt_chunk, data_size):
+    """
+    Returns the header of a WAV file holding ``data_size`` bytes of samples.
+    """
+    riff_size = 4 + len(fmt_chunk) + 8 + data_size + (data_size & 1)
+    return (
+        b"RIFF"
+        + struct.pack("<I", riff_size)
+        + b"WAVE"
+        + fmt_chunk
+        + b"data"
+        + struct.pack("<I", data_size)
+    )
+
+
+class SequenceAudioCache(object):
+    """
+    Writes the audio of sequence ranges by slicing a mix of the sequence,
+    rendered once.
+
+    The ranges to export are registered up front with :meth:`add_range`, so
+    that the master only covers the exported part of the sequence. The
+    masters are written in a temporary folder removed by :meth:`clear`.
+    """
+
+    def __init__(self):
+        self._folder = None
+        self._masters = {}
+        self._ranges = {}
+
+    def add_range(self, sequence, start, end):
+        """
+        Registers a range of the sequence which will be written.
+        """
+        ranges = self._ranges.setdefault(
+            sequence.guid(), {"start": start, "end": end, "count": 0}
+        )
+        ranges["start"] = min(ranges["start"], start)
+        ranges["end"] = max(ranges["end"], end)
+        ranges["count"] += 1
+
+    def write_slice(self, sequence, path, start, end, write_args=()):
+        """
+        Writes the audio of a range of the sequence to a WAV file.
+
+        :param sequence: The hiero.core.Sequence to bounce down.
+        :param str path: The WAV file to write.
+        :param int start: The first frame of the range.
+        :param int end: The end frame of the range, as passed to
+            ``writeAudioToFile``.
+        :param tuple write_args: The extra ``writeAudioToFile`` arguments:
+            channels, sample rate, bit depth and bit rate.
+        :returns: True if the file was written, False if the range isn't
+            covered by the master and has to be bounced down directly.
+        """
+        ranges = self._ranges.get(sequence.guid())
+        if ranges is None or ranges["count"] < 2:
+            # a master is only worth it for several shots
+            return False
+
+        if start < ranges["start"] or end > ranges["end"]:
+            return False
+
+        master = self._master(sequence, tuple(write_args), ranges)
+        if master is None:
+            return False
+
+        # frames relative to the start of the master
+        start -= ranges["start"]
+        end -= ranges["start"]
+
+        fps = sequence.framerate().toFloat()
+        block_align = master["block_align"]
+        sample_rate = master["sample_rate"]
+
+        # round the boundaries rather than the lengths so that consecutive
+        # shots line up sample accurately
+        first = int(round(start * sample_rate / fps)) * block_align
+        last = int(round(end * sample_rate / fps)) * block_align
+        data_start = master["data_offset"] + first
+        data_end = master["data_offset"] + min(last, master["data_size"])
+
+        data = master["view"][data_start:data_end]
+        try:
+            with open(path, "wb") as fh:
+                fh.write(wav_header(master["fmt_chunk"], len(data)))
+                fh.write(data)
+                if len(data) & 1:
+                    fh.write(b"\0")
+        finally:
+            data.release()
+
+        return True
+
+    def _master(self, sequence, write_args, ranges):
+        """
+        Returns the master of the sequence for the audio settings, bouncing
+        the registered range down the first time.
+        """
+        key = (sequence.guid(), write_args)
+        if key in self._masters:
+            return self._masters[key]
+
+        if self._folder is None:
+            self._folder = tempfile.mkdtemp(prefix="hiero_audio_")
+
+        path = os.path.join(self._folder, "master_%d.wav" % len(self._masters))
+        sequence.writeAudioToFile(path, ranges["start"], ranges["end"], *write_args)
+
+        master = None
+        fh = open(path, "rb")
+        try:
+            (fmt_chunk, data_offset, data_size, block_align, sample_rate) = (
+                read_wav_layout(fh)
+            )
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            master = {
+                "file": fh,
+                "mmap": mapped,
+                "view": memoryview(mapped),
+                "fmt_chunk": fmt_chunk,
+                "data_offset": data_offset,
+                "data_size": data_size,
+                "block_align": block_align,
+                "sample_rate": sample_rate,
+            }
+        except (WavError, ValueError, struct.error):
+            # not something we can slice, every shot will be bounced down
+            # on its own
+            fh.close()
+
+        self._masters[key] = master
+        return master
+
+    def clear(self):
+        """
+        Releases the masters and removes them from disk.
+        """
+        for master in self._masters.values():
+            if master is None:
+                continue
+            master["view"].release()
+            master["mmap"].close()
+            master["file"].close()
+        self._masters = {}
+
+        if self._folder is not None:
+            shutil.rmtree(self._folder, ignore_errors=True)
+            self._folder = None
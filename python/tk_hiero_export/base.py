@@ -10,8 +10,10 @@
 
 import os
 import sys
+import copy
 import shutil
 import time
+import contextlib
 import collections
 
 import hiero.core
@@ -24,6 +26,10 @@ import tank
 from tank.platform.qt import QtGui, QtCore
 
 from . import HieroCustomizeExportUI
+from .media_cache import SourceMediaCache
+from .export_journal import task_key
+from .item_snapshot import TrackItemSnapshot
+from .memory_policy import compress_thumbnail
 
 
 class ShotgunHieroObjectBase(object):
@@ -42,9 +48,10 @@ class ShotgunHieroObjectBase(object):
     def _get_custom_properties(self, get_method):
         """
         Gets a list of custom property descriptions from the customize_export_ui
-        hook, calling the hook method provided. This method will cache the
-        list of property descriptions, and any subsequent calls here will
-        return cached data.
+        hook, calling the hook method provided. The property descriptions are
+        cached by the app until its context changes, as Hiero creates presets
+        all the time, and any subsequent calls here will return a copy of the
+        cached data.
 
         :param str get_method: The name of the getter hook method to call.
 
@@ -52,25 +59,18 @@ class ShotgunHieroObjectBase(object):
             the hook_customize_export_ui hook getter methods.
         :rtype: list
         """
-        # This base class isn't intended to be run through an __init__ since
-        # it's a utility container used as part of a mixin. Little backwards
-        # here, but if we don't have a cache location for these property
-        # definitions we can just create it here before moving on.
-        if not hasattr(self, "_custom_property_definitions"):
-            self._custom_property_definitions = dict()
-
         # We key off of the method name since we allow for different
         # properties and custom widgets per exporter type.
-        if get_method not in self._custom_property_definitions:
-            self._custom_property_definitions[get_method] = (
-                self.app.execute_hook_method(
-                    "hook_customize_export_ui",
-                    get_method,
-                    base_class=HieroCustomizeExportUI,
-                )
+        cache = self.app.custom_property_cache
+        if get_method not in cache:
+            cache[get_method] = self.app.execute_hook_method(
+                "hook_customize_export_ui",
+                get_method,
+                base_class=HieroCustomizeExportUI,
             )
 
-        return self._custom_property_definitions[get_method]
+        # the presets keep the default values, they must not share them
+        return copy.deepcopy(cache[get_method])
 
     def _get_custom_widget(
         self, parent, create_method, get_method, set_method, properties=None
@@ -160,9 +160,12 @@ class ShotgunHieroObjectBase(object):
         tk_version_str = version_template.apply_fields({"version": version_number})
         return tk_version_str
 
-    def _upload_thumbnail_to_sg(self, sg_entity, thumb_qimage):
+    def _upload_thumbnail_to_sg(self, sg_entity, thumbnail):
         """
         Updates the thumbnail for an entity in Shotgun
+
+        :param thumbnail: The thumbnail, either a ``QImage`` or the png bytes
+            returned by :func:`compress_thumbnail`.
         """
         import tempfile
         import uuid
@@ -170,11 +173,11 @@ class ShotgunHieroObjectBase(object):
         thumbdir = tempfile.mkdtemp(prefix="hiero_process_thumbnail_")
         try:
             path = "%s.png" % os.path.join(thumbdir, sg_entity.get("name", "thumbnail"))
-            # scale it down to 600px wide
-            thumb_qimage_scaled = thumb_qimage.scaledToWidth(
-                600, QtCore.Qt.SmoothTransformation
-            )
-            thumb_qimage_scaled.save(path)
+            # scale it down to 600px wide, unless it already is
+            if not isinstance(thumbnail, bytes):
+                thumbnail = compress_thumbnail(thumbnail)
+            with open(path, "wb") as fh:
+                fh.write(thumbnail)
             self.app.log_debug(
                 "Uploading thumbnail for %s %s..."
                 % (sg_entity["type"], sg_entity["id"])
@@ -201,3 +204,161 @@ class ShotgunHieroObjectBase(object):
     def _cutsSupported(self):
         """Returns True if the site has Cut support, False otherwise."""
         return self.app.shotgun.server_caps.version >= (7, 0, 0)
+
+    def _get_source_media(self, clip):
+        """
+        Returns the colorspace, format, framerate, timecode start and media
+        presence of a source clip. They are gathered once per clip and export
+        rather than once per task.
+
+        :param clip: A ``hiero.core.Clip``.
+        :returns: A :class:`SourceMediaInfo`.
+        """
+        cache = getattr(self.app, "media_cache", None)
+        if cache is None:
+            cache = SourceMediaCache(self.app)
+        return cache.get(clip)
+
+    def _item_snapshot(self):
+        """
+        Returns the :class:`TrackItemSnapshot` of the track item of this
+        task, taken by the shot processor before the tasks were queued, or
+        taken now otherwise.
+        """
+        snapshot = getattr(self, "_snapshot", None)
+        if snapshot is None:
+            snapshot = TrackItemSnapshot.take(
+                self._item, self._item.source().timecodeStart()
+            )
+            self._snapshot = snapshot
+        return snapshot
+
+    def _get_schema_valid_values(self, entity_type, field_name):
+        """
+        Returns the valid values of a list field of the site schema. The
+        schema is read once per export rather than once per shot.
+
+        :param str entity_type: The entity type of the field.
+        :param str field_name: The name of the list field.
+
+        :returns: A list of the valid values.
+        :rtype: list
+        """
+        cache = getattr(self.app, "sg_lookup_cache", None)
+        key = ("schema", entity_type, field_name)
+        if cache is None or key not in cache:
+            schema = self.app.shotgun.schema_field_read(entity_type, field_name)
+            values = schema[field_name]["properties"]["valid_values"]["value"]
+            if cache is None:
+                return values
+            cache[key] = values
+        return list(cache[key])
+
+    def _find_task_template(self, entity_type, code):
+        """
+        Returns the task template with the given name for an entity type, or
+        None if there is no such template. Templates are looked up once per
+        export rather than once per shot.
+
+        :param str entity_type: The entity type the template applies to.
+        :param str code: The name of the task template.
+        """
+        cache = getattr(self.app, "sg_lookup_cache", None)
+        key = ("TaskTemplate", entity_type, code)
+        if cache is None or key not in cache:
+            template = self.app.shotgun.find_one(
+                "TaskTemplate",
+                [
+                    ["entity_type", "is", entity_type],
+                    ["code", "is", code],
+                ],
+            )
+            if cache is None:
+                return template
+            cache[key] = template
+        return cache[key]
+
+    def _is_skipped_export(self):
+        """
+        Returns True if the shot processor decided this task has nothing to
+        export, for example because the track item is unchanged since the
+        last successful export.
+        """
+        return getattr(self, "_skip_export", False)
+
+    def _journaled(self, step):
+        """
+        Returns a ``(done, entity)`` tuple telling if a step of this task was
+        completed by the interrupted export being resumed, and the entity it
+        created or updated.
+
+        :param str step: One of the steps of :mod:`export_journal`.
+        """
+        journal = getattr(self.app, "export_journal", None)
+        if journal is None:
+            return (False, None)
+        return journal.get(task_key(self), step)
+
+    def _journal(self, step, entity=None):
+        """
+        Records a completed step of this task in the journal of the export,
+        if there is one.
+
+        :param str step: One of the steps of :mod:`export_journal`.
+        :param dict entity: The entity created or updated by the step.
+        """
+        journal = getattr(self.app, "export_journal", None)
+        if journal is not None:
+            journal.record(task_key(self), step, entity)
+
+    def _memory_admitted(self):
+        """
+        Returns True if this task can start, False if it is held back by the
+        memory ceiling of the export.
+        """
+        memory_policy = getattr(self.app, "memory_policy", None)
+        return memory_policy is None or memory_policy.admit(self)
+
+    @contextlib.contextmanager
+    def _finishing_task(self):
+        """
+        Wraps the body of finishTask, letting the export bookkeeping know that
+        this task is done once it is over, even if it raised. A task which
+        raised is reported as failed.
+        """
+        try:
+            yield
+        except Exception as e:
+            if not self.error():
+                self.setError(str(e))
+            raise
+        finally:
+            self._task_finished()
+
+    def _task_finished(self):
+        """
+        Lets the export bookkeeping know that this task is done. Called by
+        :meth:`_finishing_task`.
+        """
+        try:
+            store = getattr(self.app, "fingerprint_store", None)
+            if store is not None:
+                store.task_finished(self, not self.error())
+
+            journal = getattr(self.app, "export_journal", None)
+            if journal is not None:
+                journal.task_finished(self, not self.error())
+
+            batch_job = getattr(self.app, "batch_job", None)
+            if batch_job is not None:
+                batch_job.task_finished(self)
+        finally:
+            # whatever failed above, the task must stop holding back the
+            # others, and the export must end
+            memory_policy = getattr(self.app, "memory_policy", None)
+            if memory_policy is not None:
+                memory_policy.task_finished(self)
+
+            session = getattr(self.app, "export_session", None)
+            if session is not None:
+                session.task_finished(self)
@@ -0,0 +1,332 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Headless batch exports, run without a Nuke Studio session.
+
+A batch export opens a list of Hiero projects, exports their sequences with
+a Flow Production Tracking shot processor preset, synchronously, and writes
+a json summary of the export. It runs under the Python of Nuke Studio in
+terminal mode, see ``scripts/hiero_batch_export.py``.
+
+The journal, write queue, traces and call ledgers of each batch job are kept
+in a folder of their own in the app's cache location, so several jobs can
+run at once on the same machine, and a job can be resumed by running it
+again with ``--resume``.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+import collections
+
+import hiero.core
+from sgtk import TankError
+
+from .export_journal import task_key
+from .sg_shot_processor import ShotgunShotProcessorPreset
+
+
+class BatchJob(object):
+    """
+    A batch export, collecting the outcome of its tasks.
+
+    :param str name: The name of the job, see :func:`job_name`.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._expected = collections.OrderedDict()
+        self._results = []
+
+    def state_location(self, cache_location):
+        """
+        Returns the folder the state of the export of this job is kept in.
+        """
+        return os.path.join(cache_location, "batch", self.name)
+
+    def expect(self, task):
+        """
+        Called for each task of the export before it is queued, so the tasks
+        which never report back can be told apart.
+        """
+        with self._lock:
+            self._expected[id(task)] = self._describe(task)
+
+    def task_finished(self, task):
+        """
+        Called by a task when it is done.
+        """
+        description = self._describe(task)
+        with self._lock:
+            self._expected.pop(id(task), None)
+            self._results.append(description + (task.error(),))
+
+    def results(self):
+        """
+        Returns a ``(sequence guid, shot name, task key, error)`` tuple for
+        each task of the job. The tasks which never reported back are failed.
+        """
+        with self._lock:
+            return list(self._results) + [
+                description + ("The task never finished.",)
+                for description in self._expected.values()
+            ]
+
+    def _describe(self, task):
+        """
+        Returns the ``(sequence guid, shot name, task key)`` of a task.
+        """
+        sequence = None
+        if isinstance(getattr(task, "_item", None), hiero.core.TrackItem):
+            snapshot = task._item_snapshot()
+            (sequence, shot) = (snapshot.sequence.guid, snapshot.name)
+        else:
+            shot = task._item.name()
+        return (sequence, shot, task_key(task))
+
+
+def job_name(preset_name, projects, sequences):
+    """
+    Returns the default name of a batch job, the same every time the same
+    sequences are exported with the same preset.
+    """
+    digest = hashlib.sha1(
+        json.dumps(
+            [
+                preset_name,
+                sorted(os.path.abspath(p) for p in projects),
+                sorted(sequences),
+            ]
+        ).encode("utf-8")
+    ).hexdigest()
+    return "job_%s" % digest[:12]
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="hiero_batch_export",
+        description="Exports the sequences of Hiero projects with a Flow "
+        "Production Tracking shot processor preset.",
+    )
+    parser.add_argument("projects", nargs="+", help="The .hrox projects to export.")
+    parser.add_argument(
+        "--preset", required=True, help="The name of the shot processor preset."
+    )
+    parser.add_argument(
+        "--sequence",
+        action="append",
+        default=[],
+        help="The name of a sequence to export, every sequence of the projects "
+        "by default. Can be repeated.",
+    )
+    parser.add_argument(
+        "--job",
+        help="The name of the job, used to resume it. Built from the projects, "
+        "sequences and preset by default.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume the interrupted export of the job.",
+    )
+    parser.add_argument(
+        "--summary",
+        help="The json file the summary is written to, the standard output by "
+        "default.",
+    )
+    parser.add_argument(
+        "--write-timeout",
+        type=float,
+        default=600.0,
+        help="How long to wait for the queued Flow Production Tracking writes "
+        "to be sent before exiting, in seconds.",
+    )
+    return parser.parse_args(argv)
+
+
+def find_preset(name, projects):
+    """
+    Returns the shot processor preset with the given name, looking in the
+    presets of the projects first, then in the local presets.
+    """
+    presets = []
+    for project in projects:
+        presets.extend(hiero.core.taskRegistry.projectPresets(project))
+    presets.extend(hiero.core.taskRegistry.localPresets())
+    for preset in presets:
+        if preset.name() == name and isinstance(preset, ShotgunShotProcessorPreset):
+            return preset
+    raise TankError(
+        "No Flow Production Tracking shot processor preset named '%s'." % name
+    )
+
+
+def run_batch_export(app, argv):
+    """
+    Runs a batch export, see :func:`parse_args` for the arguments.
+
+    :param app: The app instance.
+    :param list argv: The command line arguments.
+    :returns: The exit code, 0 if every task succeeded.
+    """
+    args = parse_args(argv)
+    job = BatchJob(args.job or job_name(args.preset, args.projects, args.sequence))
+    summary = collections.OrderedDict(
+        [
+            ("job", job.name),
+            ("preset", args.preset),
+            ("state_location", job.state_location(app.cache_location)),
+            ("status", "failed"),
+            ("projects", []),
+            ("missing_sequences", []),
+            ("pending_writes", 0),
+            ("seconds", 0.0),
+        ]
+    )
+    start = time.time()
+
+    projects = []
+    try:
+        # open all the projects, their sequences are exported together
+        sequences = []
+        for path in args.projects:
+            project = hiero.core.openProject(os.path.abspath(path))
+            projects.append(project)
+            selected = [
+                sequence
+                for sequence in project.sequences()
+                if not args.sequence or sequence.name() in args.sequence
+            ]
+            sequences.extend(selected)
+            summary["projects"].append(
+                collections.OrderedDict(
+                    [
+                        ("path", path),
+                        ("sequences", [_sequence_summary(s) for s in selected]),
+                    ]
+                )
+            )
+        found = set(sequence.name() for sequence in sequences)
+        summary["missing_sequences"] = [s for s in args.sequence if s not in found]
+
+        if sequences:
+            preset = find_preset(args.preset, projects)
+            preset.properties().setdefault("shotgunShotCreateProperties", {})[
+                "resumeExport"
+            ] = args.resume
+
+            app.log_info(
+                "Batch export %s: exporting %d sequence(s) with the '%s' preset."
+                % (job.name, len(sequences), args.preset)
+            )
+            app.batch_job = job
+            try:
+                hiero.core.taskRegistry.createAndExecuteProcessor(
+                    preset,
+                    [hiero.core.ItemWrapper(sequence) for sequence in sequences],
+                    synchronous=True,
+                )
+            finally:
+                app.batch_job = None
+
+            summary["pending_writes"] = _wait_for_writes(app, args.write_timeout)
+    except Exception as e:
+        app.logger.exception("Batch export %s failed" % job.name)
+        summary["error"] = str(e)
+    finally:
+        # the tasks which failed or never finished fail their sequence
+        _add_results(summary, job.results())
+        for project in projects:
+            project.close()
+
+    failed = (
+        summary.get("error")
+        or summary["missing_sequences"]
+        or any(
+            sequence["failed"]
+            for project in summary["projects"]
+            for sequence in project["sequences"]
+        )
+    )
+    summary["status"] = "failed" if failed else "ok"
+    summary["seconds"] = round(time.time() - start, 3)
+
+    text = json.dumps(summary, indent=2)
+    if args.summary:
+        with open(args.summary, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+    return 1 if failed else 0
+
+
+def _sequence_summary(sequence):
+    return collections.OrderedDict(
+        [
+            ("name", sequence.name()),
+            ("guid", sequence.guid()),
+            ("shots", 0),
+            ("tasks", 0),
+            ("failed", []),
+        ]
+    )
+
+
+def _add_results(summary, results):
+    """
+    Adds the outcome of the tasks to the summary of their sequence.
+    """
+    by_guid = dict(
+        (sequence["guid"], sequence)
+        for project in summary["projects"]
+        for sequence in project["sequences"]
+    )
+    shots = collections.defaultdict(set)
+    for guid, shot, key, error in results:
+        sequence = by_guid.get(guid)
+        if sequence is None:
+            continue
+        shots[guid].add(shot)
+        sequence["tasks"] += 1
+        if error:
+            sequence["failed"].append(
+                collections.OrderedDict([("task", key), ("error", error)])
+            )
+    for guid, names in shots.items():
+        by_guid[guid]["shots"] = len(names)
+
+
+def _wait_for_writes(app, timeout):
+    """
+    Waits for the queued writes of the export to be sent, if they are queued.
+
+    :returns: The number of writes left to send. They are sent by the next
+        run of the job.
+    """
+    flusher = app.sg_write_flusher
+    if flusher is None:
+        return 0
+    if not flusher.join(timeout):
+        flusher.stop()
+    app.sg_write_flusher = None
+    pending = flusher.queue.pending_count()
+    flusher.queue.close()
+    if pending:
+        app.log_warning(
+            "%d Flow Production Tracking write(s) could not be sent, they will "
+            "be sent by the next run of the job." % pending
+        )
+    return pending
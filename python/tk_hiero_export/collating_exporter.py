@@ -13,6 +13,8 @@ import math
 
 import hiero
 
+from .tracing import traced
+
 
 class CollatingExporter(object):
     def __init__(self, properties=None):
@@ -182,6 +184,7 @@ class CollatingExporter(object):
             collatedItems = orderedMatches
         return collatedItems
 
+    @traced("collate")
     def _buildCollatedSequence(self, properties):
         """
         Build a sequence form a list of collated items.
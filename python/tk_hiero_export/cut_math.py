@@ -0,0 +1,181 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+The cut math of the exported shots: the head, cut, tail and edit frames
+written to the Shots and CutItems.
+
+The frames of every shot of an export are computed in one pass, a column at
+a time, from the columns listed in :data:`INPUT_COLUMNS`. The shot processor
+computes them once before the tasks are queued, and the shot updaters and
+the Cut preprocessing read the result.
+
+Nothing in here depends on Hiero.
+"""
+
+# the columns the cut math is computed from, one value per shot:
+#
+# head_in, tail_out: the output range of the export, unclamped to the source
+# source_in, source_out: the source range of the track item
+# duration: the duration of the track item
+# timeline_in, timeline_out: the timeline range of the track item
+# timecode_start: the timecode start of the sequence, in frames
+# handles: the handles of the export
+# start_frame: the custom start frame of the export, 0 if none
+# cut_length: whether only the cut length of the source is exported
+# clamp_in_handle: whether the head handle is limited by the source in, as
+#     done by the versions of Hiero with a Nuke backend
+# head_room_offset: the offset to remove from the head and tail, for the
+#     collated shots of the older versions of Hiero
+INPUT_COLUMNS = (
+    "head_in",
+    "tail_out",
+    "source_in",
+    "source_out",
+    "duration",
+    "timeline_in",
+    "timeline_out",
+    "timecode_start",
+    "handles",
+    "start_frame",
+    "cut_length",
+    "clamp_in_handle",
+    "head_room_offset",
+)
+
+# the columns computed, named after the cut item data of the shot updater
+OUTPUT_COLUMNS = (
+    "cut_item_in",
+    "cut_item_out",
+    "cut_item_duration",
+    "edit_in",
+    "edit_out",
+    "edit_duration",
+    "head_in",
+    "tail_out",
+    "working_duration",
+)
+
+
+def compute_cut_math(columns):
+    """
+    Computes the cut math of a list of shots.
+
+    :param dict columns: A list of values per column of :data:`INPUT_COLUMNS`,
+        all of the same length.
+    :returns: A dict with a list of values per column of
+        :data:`OUTPUT_COLUMNS`, in the order of the shots.
+    """
+    missing = [name for name in INPUT_COLUMNS if name not in columns]
+    if missing:
+        raise ValueError("Missing cut math columns: %s" % ", ".join(missing))
+    if len(set(len(columns[name]) for name in INPUT_COLUMNS)) > 1:
+        raise ValueError("The cut math columns are not all of the same length.")
+
+    head_in = columns["head_in"]
+    tail_out = columns["tail_out"]
+    source_in = [int(frame) for frame in columns["source_in"]]
+    source_out = [int(frame) for frame in columns["source_out"]]
+    handles = columns["handles"]
+    start_frame = columns["start_frame"]
+    cut_length = columns["cut_length"]
+
+    # no black frames are written for the head when there isn't enough
+    # source for the handle, the handle is limited by the source in
+    in_handle = [
+        frame if clamp and frame < handle else handle
+        for (frame, handle, clamp) in zip(
+            source_in, handles, columns["clamp_in_handle"]
+        )
+    ]
+
+    # the cut length exports are cut by the handles, the full clip exports
+    # start at the custom start frame
+    cut_in = [
+        head + handle if cut else frame + start
+        for (head, handle, cut, frame, start) in zip(
+            head_in, in_handle, cut_length, source_in, start_frame
+        )
+    ]
+    cut_out = [
+        tail - handle if cut else frame + start
+        for (tail, handle, cut, frame, start) in zip(
+            tail_out, handles, cut_length, source_out, start_frame
+        )
+    ]
+
+    # the output range is not correct for negative retimes, so the frames of
+    # the cut length exports with handles and a custom start frame are built
+    # from the start frame
+    override = [
+        bool(start and handle and cut)
+        for (start, handle, cut) in zip(start_frame, handles, cut_length)
+    ]
+    head_in = [
+        start if over else head
+        for (start, over, head) in zip(start_frame, override, head_in)
+    ]
+    cut_in = [
+        start + handle if over else frame
+        for (start, handle, over, frame) in zip(
+            start_frame, in_handle, override, cut_in
+        )
+    ]
+    cut_out = [
+        first + duration - 1 if over else frame
+        for (first, duration, over, frame) in zip(
+            cut_in, columns["duration"], override, cut_out
+        )
+    ]
+    tail_out = [
+        last + handle if over else tail
+        for (last, handle, over, tail) in zip(cut_out, handles, override, tail_out)
+    ]
+
+    # the edit range accounts for the timecode start of the sequence
+    edit_in = [
+        frame + start
+        for (frame, start) in zip(columns["timeline_in"], columns["timecode_start"])
+    ]
+    edit_out = [
+        frame + start
+        for (frame, start) in zip(columns["timeline_out"], columns["timecode_start"])
+    ]
+
+    working_duration = [tail - head + 1 for (head, tail) in zip(head_in, tail_out)]
+
+    return {
+        "cut_item_in": cut_in,
+        "cut_item_out": cut_out,
+        "cut_item_duration": [
+            last - first + 1 for (first, last) in zip(cut_in, cut_out)
+        ],
+        "edit_in": edit_in,
+        "edit_out": edit_out,
+        "edit_duration": [last - first + 1 for (first, last) in zip(edit_in, edit_out)],
+        "head_in": [
+            head - offset
+            for (head, offset) in zip(head_in, columns["head_room_offset"])
+        ],
+        "tail_out": [
+            tail - offset
+            for (tail, offset) in zip(tail_out, columns["head_room_offset"])
+        ],
+        "working_duration": working_duration,
+    }
+
+
+def cut_math_rows(results):
+    """
+    Returns the cut math computed by :func:`compute_cut_math` as a dict per
+    shot.
+    """
+    names = list(results)
+    return [dict(zip(names, values)) for values in zip(*results.values())]
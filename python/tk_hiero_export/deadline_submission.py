@@ -31,7 +31,9 @@ import sgtk
 import sgtk.util
 
 from .base import ShotgunHieroObjectBase
+from .submissions import ShotgunDeadlineSubmission
 from .collating_exporter import CollatingExporter, CollatedShotPreset
+from .export_journal import RENDER_DONE
 
 from . import (
     HieroGetQuicktimeSettings,
@@ -117,12 +119,18 @@ class ShotgunDeadlineRenderTask(ShotgunHieroObjectBase, hiero.core.TaskBase):
         if not self.deadlineApiCon:
             self.app.log_error("ERROR: Could not connect to deadline")
             return
-        
-        fw = self.app.frameworks['tk-framework-nozon']
-        self.csp = fw.import_module("colorspace")
 
     def startTask(self):
 
+        # the export being resumed submitted this job already
+        (submitted, _) = self._journaled(RENDER_DONE)
+        if submitted:
+            self.app.log_info(
+                "Not submitting %s again, it was submitted to Deadline by the "
+                "interrupted export." % self.jobName
+            )
+            return
+
         resolved_export_path = self.resolvedExportPath()
         # convert slashes to native os style..
         resolved_export_path = resolved_export_path.replace( "/", os.path.sep )
@@ -290,8 +298,9 @@ class ShotgunDeadlineRenderTask(ShotgunHieroObjectBase, hiero.core.TaskBase):
 
         if first_comp_colorspace.lower() == 'camera':
             if isinstance(self._item, TrackItem):
-                read_node = self._item.source().readNode()
-                first_comp_colorspace = self.csp.ColorSpace().get_read_colorspace_name(read_node)
+                first_comp_colorspace = self._get_source_media(
+                    self._item.source()
+                ).colorspace
 
 
         #NovMov app
@@ -400,6 +409,7 @@ class ShotgunDeadlineRenderTask(ShotgunHieroObjectBase, hiero.core.TaskBase):
 
         # Submit job to deadline using the deadline API
         job = self.deadlineApiCon.Jobs.SubmitJob(JobInfo, PluginInfo)
+        self._journal(RENDER_DONE)
 
         if sg_task:
             self.app.shotgun.update("Task", sg_task["id"], {'sg_status_list':'ip'})
@@ -443,7 +453,7 @@ class ShotgunDeadlineRenderTask(ShotgunHieroObjectBase, hiero.core.TaskBase):
             publish_filters.append([field, "is", publish_data[field]])
 
         # run the
-        publishes = self.app.sgtk.shotgun.find("PublishedFile", publish_filters, ["path"])
+        publishes = self.app.shotgun.find("PublishedFile", publish_filters, ["path"])
 
         # ensure the path is normalized for comparison
         normalized_path = sgtk.util.ShotgunPath.normalize(path)
@@ -468,9 +478,7 @@ class ShotgunDeadlineRenderTask(ShotgunHieroObjectBase, hiero.core.TaskBase):
 
 
 # Create a Submission and add your Task
-class ShotgunDeadlineRenderSubmission(ShotgunHieroObjectBase, Submission):
-
-    kNukeRender = "deadline_submission"
+class ShotgunDeadlineRenderSubmission(ShotgunDeadlineSubmission):
 
     def __init__(self):
         Submission.__init__(self)
@@ -489,6 +497,15 @@ class ShotgunDeadlineRenderSubmission(ShotgunHieroObjectBase, Submission):
         deadlineHome = deadlineHome.decode()
         deadlineHome = deadlineHome.replace( "\n", "" ).replace( "\r", "" )
         self.deadlineTemp = deadlineHome + "/temp"
+
+        # in terminal mode, submit with the settings saved the last time the
+        # dialog was accepted
+        if not self.app.engine.has_ui:
+            self.app.log_info(
+                "No UI, submitting with the saved Deadline settings: "
+                + self.settingsFile
+            )
+            return
         
         # Get maximum priority.
         maximumPriority = 100
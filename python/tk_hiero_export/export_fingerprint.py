@@ -0,0 +1,187 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Fingerprinting of exported track items, used to skip shots that have not
+changed since the last successful export.
+"""
+
+import os
+import json
+import hashlib
+
+import hiero.core
+
+
+def item_key(item):
+    """
+    Returns the key used to store the fingerprint of a track item.
+
+    The key is built from names rather than guids so that a re-conformed
+    sequence still matches the fingerprints of the previous export.
+
+    :param item: The hiero.core.TrackItem being exported.
+    :return: str - the fingerprint key
+    """
+    return "%s/%s/%s" % (
+        item.parentSequence().name(),
+        item.parentTrack().name(),
+        item.name(),
+    )
+
+
+def compute_fingerprint(tasks):
+    """
+    Computes a fingerprint for a group of tasks exporting the same track item.
+
+    The fingerprint covers everything that changes the output of the export:
+    the source media and range, the timeline range, handles, retime, tags,
+    effects and the preset properties of every task in the group.
+
+    :param tasks: The list of tasks of a task group.
+    :return: str - a hex digest
+    """
+    item = tasks[0]._item
+    source = item.source()
+
+    try:
+        media_path = source.mediaSource().firstpath()
+    except Exception:
+        media_path = source.name()
+
+    effects = []
+    for task in tasks:
+        effects.extend(getattr(task, "_effects", None) or [])
+    effects.extend(
+        linked
+        for linked in item.linkedItems()
+        if isinstance(linked, hiero.core.EffectTrackItem)
+    )
+
+    data = {
+        "media": media_path,
+        "source": [item.sourceIn(), item.sourceOut()],
+        "timeline": [item.timelineIn(), item.timelineOut()],
+        "handles": getattr(tasks[0], "_cutHandles", None),
+        "retime": item.playbackSpeed(),
+        "tags": sorted((tag.name(), tag.note()) for tag in item.tags()),
+        "effects": [effect_data(effect) for effect in effects],
+        "tasks": sorted(
+            [
+                (
+                    task.__class__.__name__,
+                    getattr(task, "_exportPath", ""),
+                    task._preset.properties(),
+                )
+                for task in tasks
+            ],
+            key=lambda task_data: json.dumps(task_data, sort_keys=True, default=str),
+        ),
+    }
+
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def effect_data(effect):
+    """
+    Returns a serializable description of a soft effect.
+    """
+    knobs = None
+    try:
+        import nuke
+
+        knobs = effect.node().writeKnobs(nuke.WRITE_NON_DEFAULT_ONLY | nuke.TO_SCRIPT)
+    except Exception:
+        # older Hiero versions or effects without a node. fall back on the
+        # name and timing only.
+        pass
+
+    return [effect.name(), effect.timelineIn(), effect.timelineOut(), knobs]
+
+
+class ExportFingerprintStore(object):
+    """
+    Keeps the fingerprints of the last successful export of each track item.
+
+    The fingerprints are stored as a json file in the app's cache location.
+    A fingerprint is only recorded once every task registered for an item has
+    finished without error.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._fingerprints = {}
+        self._pending = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as fh:
+                    self._fingerprints = json.load(fh)
+            except (IOError, ValueError):
+                # a corrupt file just means everything gets exported again
+                self._fingerprints = {}
+
+    def is_unchanged(self, key, fingerprint):
+        """
+        Returns ``True`` if the fingerprint matches the last successful export.
+        """
+        return self._fingerprints.get(key) == fingerprint
+
+    def track(self, key, fingerprint, tasks):
+        """
+        Starts tracking a group of tasks. Once all of them are finished without
+        error the fingerprint will be recorded for the key.
+        """
+        self._pending[key] = {
+            "fingerprint": fingerprint,
+            "tasks": set(id(task) for task in tasks),
+            "failed": False,
+        }
+        for task in tasks:
+            task._fingerprint_key = key
+
+    def task_finished(self, task, success):
+        """
+        Called by a tracked task when it is done.
+
+        :param task: The finished task.
+        :param bool success: Whether the task finished without error.
+        """
+        key = getattr(task, "_fingerprint_key", None)
+        pending = self._pending.get(key)
+        if pending is None:
+            return
+
+        pending["tasks"].discard(id(task))
+        pending["failed"] = pending["failed"] or not success
+
+        if pending["tasks"]:
+            return
+
+        del self._pending[key]
+        if not pending["failed"]:
+            self._fingerprints[key] = pending["fingerprint"]
+            self.save()
+
+    def save(self):
+        """
+        Writes the fingerprints to disk.
+        """
+        folder = os.path.dirname(self._path)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        # write to a temporary file first so that a crash never leaves a
+        # truncated file behind
+        tmp_path = "%s.tmp" % self._path
+        with open(tmp_path, "w") as fh:
+            json.dump(self._fingerprints, fh, indent=2, sort_keys=True)
+        os.replace(tmp_path, self._path)
@@ -0,0 +1,207 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Journal of the steps completed by an export, used to resume an export that
+was interrupted rather than starting it over.
+
+Every completed step is appended to a json lines file and flushed to disk
+right away, so the journal survives a crash of Hiero. Resuming an export
+replays the same tasks, and each of them skips the steps found in the
+journal.
+"""
+
+import os
+import json
+import time
+import threading
+
+import hiero.core
+
+from .export_fingerprint import item_key
+
+# the steps recorded by the tasks
+SHOT_UPDATED = "shot_updated"
+CUT_CREATED = "cut_created"
+CUT_ITEM_CREATED = "cut_item_created"
+RENDER_DONE = "render_done"
+PUBLISH_REGISTERED = "publish_registered"
+VERSION_CREATED = "version_created"
+UPLOAD_DONE = "upload_done"
+
+
+def task_key(task):
+    """
+    Returns the key the steps of a task are journaled under.
+
+    The key is built from the names of the track item and the export path of
+    the task, so that the tasks created when an export is replayed match the
+    ones of the interrupted export.
+    """
+    item = task._item
+    if isinstance(item, hiero.core.TrackItem):
+        name = item_key(item)
+    else:
+        name = item.name()
+    return "%s|%s:%s" % (
+        name,
+        task.__class__.__name__,
+        getattr(task, "_exportPath", ""),
+    )
+
+
+class ExportJournal(object):
+    """
+    The steps completed by the tasks of an export.
+
+    A step is journaled with the entity it created or updated in Flow
+    Production Tracking, if any. The journal is removed once every task of
+    the export has finished without error.
+
+    :param str path: The path of the journal file.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._steps = {}
+        self._failed = False
+        self._lock = threading.Lock()
+        self._fh = None
+
+    def start(self, plan):
+        """
+        Starts the journal of a new export, discarding the steps of the
+        previous one.
+
+        :param list plan: The keys of the tasks of the export.
+        """
+        self._steps = {}
+        self._open("w")
+        self._write({"started": time.time(), "plan": plan})
+
+    def resume(self):
+        """
+        Loads the steps of the interrupted export so that they are skipped.
+
+        :returns: The number of journaled steps.
+        """
+        self._steps = {}
+        if os.path.exists(self._path):
+            with open(self._path, "rb") as fh:
+                end = 0
+                for line in iter(fh.readline, b""):
+                    # the last line is truncated if the crash happened while
+                    # it was written
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line.decode("utf-8"))
+                    except ValueError:
+                        break
+                    end += len(line)
+                    if "step" in record:
+                        self._steps[(record["key"], record["step"])] = record.get(
+                            "entity"
+                        )
+            # drop the truncated line before appending to the journal
+            os.truncate(self._path, end)
+        self._open("a")
+        return len(self._steps)
+
+    def reconcile(self, shotgun):
+        """
+        Forgets the journaled steps whose entity no longer exists, for
+        example because it was deleted after the export was interrupted.
+        The entities are looked up with one query per entity type.
+
+        :param shotgun: The Flow Production Tracking connection.
+        :returns: The number of forgotten steps.
+        """
+        ids = {}
+        for entity in self._steps.values():
+            if entity:
+                ids.setdefault(entity["type"], set()).add(entity["id"])
+
+        existing = set()
+        for entity_type, entity_ids in ids.items():
+            for entity in shotgun.find(
+                entity_type, [["id", "in", sorted(entity_ids)]], ["id"]
+            ):
+                existing.add((entity_type, entity["id"]))
+
+        stale = [
+            step
+            for (step, entity) in self._steps.items()
+            if entity and (entity["type"], entity["id"]) not in existing
+        ]
+        for step in stale:
+            del self._steps[step]
+        return len(stale)
+
+    def get(self, key, step):
+        """
+        Returns a ``(done, entity)`` tuple for a step.
+
+        :param str key: The key of the task, see :func:`task_key`.
+        :param str step: The step.
+        """
+        with self._lock:
+            if (key, step) in self._steps:
+                return (True, self._steps[(key, step)])
+        return (False, None)
+
+    def record(self, key, step, entity=None):
+        """
+        Journals a completed step, and flushes it to disk.
+
+        :param str key: The key of the task, see :func:`task_key`.
+        :param str step: The step.
+        :param dict entity: The entity created or updated by the step.
+        """
+        if entity is not None:
+            entity = dict(entity)
+        with self._lock:
+            self._steps[(key, step)] = entity
+            self._write({"key": key, "step": step, "entity": entity})
+
+    def task_finished(self, task, success):
+        """
+        Called by a task when it is done.
+        """
+        if not success:
+            self._failed = True
+
+    def close(self):
+        """
+        Closes the journal once the export is over. The journal is kept if
+        a task failed, so the export can be resumed.
+
+        :returns: True if the journal was kept.
+        """
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            if not self._failed and os.path.exists(self._path):
+                os.remove(self._path)
+        return self._failed
+
+    def _open(self, mode):
+        folder = os.path.dirname(self._path)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        if self._fh is not None:
+            self._fh.close()
+        self._fh = open(self._path, mode)
+
+    def _write(self, record):
+        self._fh.write(json.dumps(record, default=str) + "\n")
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
@@ -0,0 +1,69 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+
+class ExportSession(object):
+    """
+    Keeps track of the tasks of an export, and runs the registered finalizers
+    once the last of them is finished.
+
+    The tasks are queued by the shot processor and run asynchronously after
+    ``startProcessing`` returns, so this is the only place where we know an
+    export is over.
+    """
+
+    def __init__(self, app):
+        self._app = app
+        self._tasks = set()
+        self._finalizers = []
+
+    def register(self, task):
+        """
+        Registers a task which will report back through :meth:`task_finished`.
+        """
+        self._tasks.add(id(task))
+
+    def add_finalizer(self, callback):
+        """
+        Adds a callable to run, without arguments, once every registered task
+        is finished.
+        """
+        self._finalizers.append(callback)
+
+    def start(self):
+        """
+        Called once every task is registered and every finalizer added. An
+        export without any registered task is over right away.
+        """
+        if not self._tasks:
+            self.finalize()
+
+    def task_finished(self, task):
+        """
+        Called by a task when it is done, only the last of the registered
+        tasks finalizes the export.
+        """
+        if id(task) not in self._tasks:
+            return
+        self._tasks.remove(id(task))
+        if not self._tasks:
+            self.finalize()
+
+    def finalize(self):
+        """
+        Runs the finalizers, in the order they were added. A failing
+        finalizer doesn't prevent the others from running.
+        """
+        (finalizers, self._finalizers) = (self._finalizers, [])
+        for callback in finalizers:
+            try:
+                callback()
+            except Exception:
+                self._app.logger.exception("Export finalizer %r failed" % (callback,))
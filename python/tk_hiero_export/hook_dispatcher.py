@@ -0,0 +1,180 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Dispatcher of the hook calls made during an export.
+
+``execute_hook`` and ``execute_hook_method`` look the hook up and create a
+new instance of it on every call, which adds up for the hooks called for
+every shot. The dispatcher creates each configured hook once per export
+and base class, and hands out bound methods of the instances.
+"""
+
+import time
+import threading
+
+from tank.errors import TankError, TankHookMethodDoesNotExistError
+
+
+class HookDispatcher(object):
+    """
+    Hook instances of an export, with call counts and timings.
+
+    :param app: The app instance.
+    :param fallback: Called as ``fallback(key, method_name, **kwargs)``,
+        ``base_class`` included, to execute the hooks which can't be
+        instantiated up front. This is the case with cores older than
+        ``create_hook_instance``.
+    """
+
+    def __init__(self, app, fallback):
+        self._app = app
+        self._fallback = fallback
+        self._instances = {}
+        self._methods = {}
+        self._lock = threading.Lock()
+
+    def bind(self, key, method_name="execute", base_class=None):
+        """
+        Returns a callable running a hook method with keyword arguments.
+
+        :param str key: The name of the hook setting.
+        :param str method_name: The name of the hook method.
+        :param base_class: The base class of the hook, as passed to
+            ``execute_hook_method``.
+        :raises TankHookMethodDoesNotExistError: If the hook has no such
+            method.
+        """
+        cache_key = (key, method_name, base_class)
+        method = self._methods.get(cache_key)
+        if method is None:
+            with self._lock:
+                method = self._methods.get(cache_key)
+                if method is None:
+                    method = BoundHookMethod(
+                        key, method_name, self._resolve(key, method_name, base_class)
+                    )
+                    self._methods[cache_key] = method
+        return method
+
+    def call(self, key, method_name, base_class=None, **kwargs):
+        """
+        Runs a hook method, like ``execute_hook_method``.
+        """
+        return self.bind(key, method_name, base_class)(**kwargs)
+
+    def stats(self):
+        """
+        Returns the hook methods called so far.
+
+        :returns: A list of dictionaries with the ``hook``, ``method``,
+            ``count`` and ``total`` keys, the most expensive first.
+        """
+        with self._lock:
+            methods = list(self._methods.values())
+        stats = {}
+        for method in methods:
+            stat = stats.setdefault(
+                (method.key, method.method_name),
+                {
+                    "hook": method.key,
+                    "method": method.method_name,
+                    "count": 0,
+                    "total": 0.0,
+                },
+            )
+            stat["count"] += method.count
+            stat["total"] += method.total
+        return sorted(
+            (stat for stat in stats.values() if stat["count"]),
+            key=lambda stat: -stat["total"],
+        )
+
+    def format_stats(self):
+        """
+        Returns the stats as a text table.
+        """
+        rows = [("Hook", "Method", "Calls", "Total ms", "Mean ms")]
+        for stat in self.stats():
+            rows.append(
+                (
+                    stat["hook"],
+                    stat["method"],
+                    str(stat["count"]),
+                    "%.1f" % (stat["total"] * 1000.0),
+                    "%.2f" % (stat["total"] * 1000.0 / stat["count"]),
+                )
+            )
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = [
+            "  ".join(cell.ljust(width) for (cell, width) in zip(row, widths))
+            for row in rows
+        ]
+        lines.insert(1, "  ".join("-" * width for width in widths))
+        return "\n".join(lines)
+
+    def _resolve(self, key, method_name, base_class):
+        """
+        Returns the function running a hook method.
+        """
+        instance = self._instance(key, base_class)
+        if instance is None:
+            return lambda **kwargs: self._fallback(
+                key, method_name, base_class=base_class, **kwargs
+            )
+
+        method = getattr(instance, method_name, None)
+        if method is None:
+            raise TankHookMethodDoesNotExistError(
+                "Cannot execute hook '%s' - the hook does not have a method '%s'"
+                % (key, method_name)
+            )
+        return method
+
+    def _instance(self, key, base_class):
+        """
+        Returns the instance of a hook for a base class, or None if it can't
+        be created up front.
+        """
+        cache_key = (key, base_class)
+        if cache_key not in self._instances:
+            instance = None
+            create = getattr(self._app, "create_hook_instance", None)
+            if create is not None:
+                try:
+                    instance = create(self._app.get_setting(key), base_class=base_class)
+                except (TankError, TypeError) as e:
+                    self._app.log_debug(
+                        "Hook %s is executed without caching: %s" % (key, e)
+                    )
+            self._instances[cache_key] = instance
+        return self._instances[cache_key]
+
+
+class BoundHookMethod(object):
+    """
+    A hook method, counting its calls and the time spent in them.
+    """
+
+    def __init__(self, key, method_name, function):
+        self.key = key
+        self.method_name = method_name
+        self.count = 0
+        self.total = 0.0
+        self._function = function
+
+    def __call__(self, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._function(**kwargs)
+        finally:
+            self.count += 1
+            self.total += time.perf_counter() - start
@@ -0,0 +1,119 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Snapshots of the track items of an export.
+
+The cut math, timecodes and cut order of a shot read the same attributes of
+its track item and sequence many times, each read going through the Hiero
+API. The shot processor copies them once per track item before the tasks
+are queued, and the tasks read the copies.
+"""
+
+
+class SequenceSnapshot(object):
+    """
+    The attributes of a sequence the exported shots need.
+    """
+
+    __slots__ = ("guid", "name", "framerate", "fps", "timecode_start", "drop_frame")
+
+    def __init__(self, guid, name, framerate, fps, timecode_start, drop_frame):
+        self.guid = guid
+        self.name = name
+        # the hiero.core.TimeBase, for the timecode conversions
+        self.framerate = framerate
+        self.fps = fps
+        self.timecode_start = timecode_start
+        self.drop_frame = drop_frame
+
+    @classmethod
+    def take(cls, sequence):
+        """
+        Returns the snapshot of a ``hiero.core.Sequence``.
+        """
+        framerate = sequence.framerate()
+        return cls(
+            sequence.guid(),
+            sequence.name(),
+            framerate,
+            framerate.toFloat(),
+            sequence.timecodeStart(),
+            sequence.dropFrame(),
+        )
+
+
+class TrackItemSnapshot(object):
+    """
+    The attributes of a track item the exported shot needs.
+
+    :param sequence: The :class:`SequenceSnapshot` of the parent sequence.
+    :param int source_timecode_start: The timecode start of the source
+        clip, in frames.
+    """
+
+    __slots__ = (
+        "name",
+        "timeline_in",
+        "timeline_out",
+        "source_in",
+        "source_out",
+        "duration",
+        "tag_names",
+        "source_timecode_start",
+        "sequence",
+    )
+
+    def __init__(
+        self,
+        name,
+        timeline_in,
+        timeline_out,
+        source_in,
+        source_out,
+        duration,
+        tag_names,
+        source_timecode_start,
+        sequence,
+    ):
+        self.name = name
+        self.timeline_in = timeline_in
+        self.timeline_out = timeline_out
+        self.source_in = source_in
+        self.source_out = source_out
+        self.duration = duration
+        self.tag_names = tag_names
+        self.source_timecode_start = source_timecode_start
+        self.sequence = sequence
+
+    @classmethod
+    def take(cls, item, source_timecode_start, sequence=None):
+        """
+        Returns the snapshot of a ``hiero.core.TrackItem``.
+
+        :param item: The track item.
+        :param int source_timecode_start: The timecode start of its source
+            clip, in frames.
+        :param sequence: The :class:`SequenceSnapshot` of its sequence, taken
+            if not given.
+        """
+        if sequence is None:
+            sequence = SequenceSnapshot.take(item.parentSequence())
+        return cls(
+            item.name(),
+            item.timelineIn(),
+            item.timelineOut(),
+            item.sourceIn(),
+            item.sourceOut(),
+            item.duration(),
+            tuple(tag.name() for tag in item.tags()),
+            source_timecode_start,
+            sequence,
+        )
@@ -0,0 +1,70 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import threading
+
+import hiero.core
+
+
+class CustomKeywordCache(object):
+    """
+    Values of the custom template keywords of the shots of an export.
+
+    Hiero resolves the export paths of a task many times, and each custom
+    keyword of a path calls the resolve custom strings hook. The values are
+    cached by project, sequence and shot, filled in bulk by the shot
+    processor before the tasks are queued and cleared once the export is
+    over.
+
+    :param dict project: The project of the export.
+    """
+
+    def __init__(self, project):
+        self._project_id = project["id"] if project else None
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def key(self, task):
+        """
+        Returns the key of the shot of a task.
+        """
+        item = task._item
+        sequence = None
+        if isinstance(item, hiero.core.TrackItem):
+            sequence = item.parentSequence()
+        return (
+            self._project_id,
+            sequence.name() if sequence is not None else None,
+            item.name(),
+        )
+
+    def get(self, task, keyword):
+        """
+        Returns a ``(found, value)`` tuple for a keyword of the shot of a
+        task.
+        """
+        with self._lock:
+            values = self._values.get(self.key(task), {})
+            if keyword in values:
+                return (True, values[keyword])
+        return (False, None)
+
+    def update(self, task, values):
+        """
+        Stores keyword values of the shot of a task.
+
+        :param dict values: The values, by keyword token.
+        """
+        with self._lock:
+            self._values.setdefault(self.key(task), {}).update(values)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
@@ -0,0 +1,74 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import threading
+
+
+class SourceMediaInfo(object):
+    """
+    What the exporters need to know about the media of a source clip.
+
+    :param clip: The ``hiero.core.Clip`` the media belongs to.
+    :param csp: The colorspace module of the nozon framework.
+    """
+
+    def __init__(self, clip, csp):
+        # building the read node of a clip is expensive, it is only done
+        # here
+        self.colorspace = csp.ColorSpace().get_read_colorspace_name(clip.readNode())
+        self.format = clip.format()
+        self.framerate = clip.framerate()
+        self.timecode_start = clip.timecodeStart()
+        self.media_present = clip.isMediaPresent()
+
+
+class SourceMediaCache(object):
+    """
+    Media information of the source clips of an export, by clip guid.
+
+    Shots cut from the same source clip share their media information, so
+    it is gathered once per clip rather than once per task. The clips are
+    added the first time :meth:`get` is called for them, which the shot
+    processor does for the source clip of every exported track item while
+    taking their snapshots, before the tasks are queued. The cache is
+    cleared once the export is over.
+
+    :param app: The app, to load the colorspace module of the nozon framework
+        the first time it is needed.
+    """
+
+    def __init__(self, app):
+        self._app = app
+        self._csp = None
+        self._infos = {}
+        self._lock = threading.Lock()
+
+    def get(self, clip):
+        """
+        Returns the :class:`SourceMediaInfo` of a clip, gathering it if the
+        clip isn't cached yet.
+        """
+        guid = clip.guid()
+        with self._lock:
+            info = self._infos.get(guid)
+            if info is None:
+                if self._csp is None:
+                    fw = self._app.frameworks["tk-framework-nozon"]
+                    self._csp = fw.import_module("colorspace")
+                info = SourceMediaInfo(clip, self._csp)
+                self._infos[guid] = info
+        return info
+
+    def __len__(self):
+        return len(self._infos)
+
+    def clear(self):
+        with self._lock:
+            self._infos.clear()
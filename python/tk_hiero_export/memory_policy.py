@@ -0,0 +1,216 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Keeps the memory used by long exports bounded.
+
+Every task of an export lives until the whole export is over, so whatever
+a task holds on to adds up over the thousands of tasks of a long timeline.
+The tasks keep their thumbnails as compressed bytes, and release the heavy
+objects they hold once they are finished. The resident memory of the
+process is logged for each phase of the export, and a soft memory ceiling
+can hold back the start of the render tasks until the running ones are
+done.
+"""
+
+import gc
+import os
+import sys
+import time
+import threading
+
+from tank.platform.qt import QtCore
+
+# the per task attributes released once a task is finished, with the value
+# they are reset to
+RELEASED_ATTRIBUTES = (
+    ("_thumbnail", None),
+    ("_version_data", None),
+    ("_cut_item_data", None),
+    ("_cut_info", None),
+    ("_extra_publish_data", None),
+    ("_snapshot", None),
+)
+
+# the attributes holding the collated sequence of a collated task, and the
+# track item copies it is made of
+RELEASED_COLLATE_ATTRIBUTES = (
+    ("_sequence", None),
+    ("_collatedItemsMap", {}),
+    ("_masterTrackItemCopy", None),
+    ("_effects", []),
+    ("_annotations", []),
+)
+
+# the width thumbnails are kept at, they are uploaded at that size
+THUMBNAIL_WIDTH = 600
+
+# the seconds a task is held back at most, in case a running task never
+# reports back
+MAX_HOLD_TIME = 300.0
+
+
+def compress_thumbnail(thumb_qimage):
+    """
+    Returns a thumbnail scaled down to :data:`THUMBNAIL_WIDTH` and encoded
+    as png bytes, which take a fraction of the memory of the decoded image.
+    """
+    data = QtCore.QByteArray()
+    buffer = QtCore.QBuffer(data)
+    buffer.open(QtCore.QIODevice.WriteOnly)
+    thumb_qimage.scaledToWidth(THUMBNAIL_WIDTH, QtCore.Qt.SmoothTransformation).save(
+        buffer, "PNG"
+    )
+    buffer.close()
+    return bytes(data.data())
+
+
+def resident_memory():
+    """
+    Returns the resident memory of the process in bytes, or None if it
+    can't be measured on this platform.
+    """
+    try:
+        import psutil
+    except ImportError:
+        pass
+    else:
+        return psutil.Process().memory_info().rss
+
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm") as fh:
+                pages = int(fh.read().split()[1])
+        except (IOError, OSError, ValueError, IndexError):
+            return None
+        return pages * os.sysconf("SC_PAGE_SIZE")
+
+    return None
+
+
+def _megabytes(size):
+    if size is None:
+        return "unknown"
+    return "%.0fMB" % (size / (1024.0 * 1024.0))
+
+
+class ExportMemoryPolicy(object):
+    """
+    The memory policy of an export.
+
+    :param logger: A standard python logger.
+    :param int ceiling_mb: The soft memory ceiling, in megabytes. A task is
+        held back while the resident memory is above it and other tasks are
+        running. 0 for no ceiling.
+    :param float max_hold_time: The seconds after which a task held back
+        starts anyway.
+    """
+
+    def __init__(
+        self, logger, ceiling_mb=0, max_hold_time=MAX_HOLD_TIME, clock=time.monotonic
+    ):
+        self._logger = logger
+        self._ceiling = ceiling_mb * 1024 * 1024 if ceiling_mb else None
+        self._max_hold_time = max_hold_time
+        self._clock = clock
+        self._running = set()
+        # when the tasks held back were first held back
+        self._held_back = {}
+        self._lock = threading.Lock()
+        self._phase_peak = None
+        self.sample()
+
+    def sample(self):
+        """
+        Measures the resident memory, keeping track of the peak of the
+        current phase.
+
+        :returns: The resident memory in bytes, or None.
+        """
+        rss = resident_memory()
+        if rss is not None and (self._phase_peak is None or rss > self._phase_peak):
+            self._phase_peak = rss
+        return rss
+
+    def end_phase(self, name):
+        """
+        Logs the peak resident memory of the phase of the export which just
+        ended, and starts the next one.
+        """
+        rss = self.sample()
+        self._logger.debug(
+            "Memory of the export after %s: %s, peak %s."
+            % (name, _megabytes(rss), _megabytes(self._phase_peak))
+        )
+        self._phase_peak = rss
+
+    def admit(self, task):
+        """
+        Returns True if a task can start. A task is held back while the
+        resident memory is above the ceiling, unless no other task is
+        running, in which case waiting would not free anything, or it was
+        held back for longer than the maximum hold time.
+        """
+        with self._lock:
+            if id(task) in self._running:
+                return True
+            if self._ceiling is not None and self._running:
+                rss = self.sample()
+                if (
+                    rss is not None
+                    and rss > self._ceiling
+                    and id(task) not in self._held_back
+                ):
+                    # the released objects may be waiting for a collection,
+                    # only worth doing once per task held back
+                    gc.collect()
+                    rss = self.sample()
+                    if rss is not None and rss > self._ceiling:
+                        self._held_back[id(task)] = self._clock()
+                        self._logger.debug(
+                            "Memory above the ceiling of the export (%s), "
+                            "holding back %s until the running tasks are done."
+                            % (_megabytes(rss), task)
+                        )
+                if rss is not None and rss > self._ceiling:
+                    held = self._clock() - self._held_back[id(task)]
+                    if held < self._max_hold_time:
+                        return False
+                    self._logger.warning(
+                        "Memory still above the ceiling of the export (%s) "
+                        "after holding back %s for %ds, starting it anyway."
+                        % (_megabytes(rss), task, held)
+                    )
+            self._held_back.pop(id(task), None)
+            self._running.add(id(task))
+            return True
+
+    def task_finished(self, task):
+        """
+        Releases the heavy objects held by a task once it is finished.
+        """
+        release_task(task)
+        with self._lock:
+            self._running.discard(id(task))
+        self.sample()
+
+
+def release_task(task):
+    """
+    Resets the attributes of a finished task holding large objects, see
+    :data:`RELEASED_ATTRIBUTES`.
+    """
+    attributes = RELEASED_ATTRIBUTES
+    if getattr(task, "_collate", False):
+        attributes += RELEASED_COLLATE_ATTRIBUTES
+    for name, value in attributes:
+        if name in task.__dict__:
+            # a fresh empty container, so released tasks don't share one
+            setattr(task, name, type(value)() if value is not None else None)
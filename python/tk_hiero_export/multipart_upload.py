@@ -0,0 +1,379 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Parallel multipart upload of large files to Flow Production Tracking.
+
+The Shotgun API uploads large files to S3 one part after the other. The
+:class:`MultipartUploader` keeps the API's upload and link logic but replaces
+its multipart step for the duration of an upload: the file is split in parts
+which are sent concurrently, each part is retried on its own, and the
+progress is saved so that an upload which failed half way only sends the
+missing parts when it is retried, as long as the site still has the parts
+already sent.
+
+Nothing in here depends on Hiero or Toolkit, the Shotgun connection and the
+HTTP transport can be replaced by local stand-ins.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import mimetypes
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# S3 requires every part but the last to be at least 5MB
+DEFAULT_PART_SIZE = 20 * 1024 * 1024
+
+# size of the blocks sent to the socket, which is also the granularity of
+# the bandwidth limit
+BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """
+    Raised when a part could not be uploaded after all its retries.
+    """
+
+
+class BandwidthLimiter(object):
+    """
+    Token bucket shared by all the parts of the uploads in progress.
+
+    :param float bytes_per_second: The maximum average throughput. A value of
+        0 or None disables the limit.
+    """
+
+    def __init__(self, bytes_per_second):
+        self._rate = float(bytes_per_second or 0)
+        self._allowance = self._rate
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, size):
+        """
+        Blocks until ``size`` bytes can be sent without exceeding the limit.
+        """
+        if not self._rate:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            # allow bursts of one second at most
+            self._allowance = min(
+                self._rate, self._allowance + (now - self._last) * self._rate
+            )
+            self._last = now
+            self._allowance -= size
+            wait = -self._allowance / self._rate if self._allowance < 0 else 0
+
+        if wait:
+            time.sleep(wait)
+
+
+class UrllibTransport(object):
+    """
+    Sends parts with plain HTTP PUT requests.
+
+    :param opener: The urllib opener to use, for example one honoring the
+        proxy settings of the Shotgun connection.
+    """
+
+    def __init__(self, opener=None):
+        self._opener = opener or urllib.request.build_opener()
+
+    def put(self, url, blocks, size, content_type):
+        """
+        Uploads the blocks of a part.
+
+        :param str url: The presigned url of the part.
+        :param blocks: An iterable of bytes, the content of the part.
+        :param int size: The total size of the part.
+        :param str content_type: The mime type of the file.
+        :returns: str - the ETag of the part
+        """
+        request = urllib.request.Request(url, data=blocks, method="PUT")
+        request.add_header("Content-Type", content_type)
+        request.add_header("Content-Length", str(size))
+        response = self._opener.open(request)
+        try:
+            return response.headers.get("ETag")
+        finally:
+            response.close()
+
+
+class MultipartUploader(object):
+    """
+    Uploads files through a Shotgun connection, sending the parts of large
+    files concurrently.
+
+    :param shotgun: A ``shotgun_api3.Shotgun`` connection.
+    :param str state_dir: Folder where the progress of the uploads is saved.
+    :param int max_workers: The number of parts uploaded at once.
+    :param float max_bandwidth: Maximum average throughput in bytes per
+        second, shared by all the parts. 0 means no limit.
+    :param int part_size: The size in bytes of each part.
+    :param int max_retries: How many times a part is retried.
+    :param transport: Object with a ``put(url, blocks, size, content_type)``
+        method returning the part's ETag. Defaults to :class:`UrllibTransport`.
+    :param logger: Logger receiving the throughput stats.
+    """
+
+    def __init__(
+        self,
+        shotgun,
+        state_dir,
+        max_workers=4,
+        max_bandwidth=0,
+        part_size=DEFAULT_PART_SIZE,
+        max_retries=3,
+        transport=None,
+        logger=None,
+    ):
+        self._sg = shotgun
+        self._state_dir = state_dir
+        self._max_workers = max(1, max_workers)
+        self._limiter = BandwidthLimiter(max_bandwidth)
+        self._part_size = part_size
+        self._max_retries = max_retries
+        self._logger = logger or logging.getLogger(__name__)
+        self._sg_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+        if transport is None:
+            # use the same proxy settings as the api when possible
+            build_opener = getattr(shotgun, "_build_opener", None)
+            opener = None
+            if build_opener is not None:
+                opener = build_opener(urllib.request.HTTPHandler)
+            transport = UrllibTransport(opener)
+        self._transport = transport
+
+    def upload(self, entity_type, entity_id, path, field_name=None, **kwargs):
+        """
+        Same as ``Shotgun.upload``, with the multipart step done in parallel.
+
+        :returns: int - the id of the created Attachment
+        """
+        self._stats = {"bytes": 0, "parts": 0, "retries": 0, "resumed": 0}
+        start = time.monotonic()
+
+        # the api calls its own multipart step on the connection. shadow it
+        # on this instance while the upload is in progress.
+        self._sg._multipart_upload_file_to_storage = self._upload_parts
+        try:
+            result = self._sg.upload(
+                entity_type, entity_id, path, field_name=field_name, **kwargs
+            )
+        finally:
+            del self._sg._multipart_upload_file_to_storage
+
+        elapsed = max(time.monotonic() - start, 1e-6)
+        size = os.path.getsize(path)
+        self._logger.info(
+            "Uploaded %s: %.1f MB in %.1fs (%.1f MB/s), %d parts sent, "
+            "%d resumed, %d retries"
+            % (
+                os.path.basename(path),
+                size / (1024.0 * 1024.0),
+                elapsed,
+                size / (1024.0 * 1024.0) / elapsed,
+                self._stats["parts"],
+                self._stats["resumed"],
+                self._stats["retries"],
+            )
+        )
+        return result
+
+    def _upload_parts(self, path, upload_info):
+        """
+        Replacement of ``Shotgun._multipart_upload_file_to_storage``.
+
+        :param str path: The file to upload.
+        :param dict upload_info: The upload info returned by the api. It is
+            updated in place when an interrupted upload is resumed, so that
+            the api links the resumed upload.
+        """
+        filename = os.path.basename(path)
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        size = os.path.getsize(path)
+        part_count = max(1, (size + self._part_size - 1) // self._part_size)
+
+        state_path = self._state_path(path)
+        state = self._load_state(state_path)
+        if state and state["part_size"] == self._part_size:
+            # resume the previous upload of this file. its parts are only
+            # kept if the site still accepts them, the fresh upload info is
+            # left untouched until then.
+            resumed_info = state["upload_info"]
+            etags = dict((int(k), v) for k, v in state["etags"].items())
+            try:
+                self._send_parts(
+                    path,
+                    filename,
+                    content_type,
+                    size,
+                    part_count,
+                    resumed_info,
+                    etags,
+                    state_path,
+                )
+            except Exception as e:
+                # expired, or its parts were refused
+                self._logger.info(
+                    "Could not resume the upload of %s, starting over: %s"
+                    % (filename, e)
+                )
+            else:
+                upload_info.update(resumed_info)
+                self._remove_state(state_path)
+                return
+
+        self._send_parts(
+            path, filename, content_type, size, part_count, upload_info, {}, state_path
+        )
+        self._remove_state(state_path)
+
+    def _send_parts(
+        self,
+        path,
+        filename,
+        content_type,
+        size,
+        part_count,
+        upload_info,
+        etags,
+        state_path,
+    ):
+        """
+        Sends the parts of a file missing from ``etags`` and completes the
+        upload, saving the progress along the way.
+
+        :param dict upload_info: The upload info of the upload the parts are
+            sent to.
+        :param dict etags: The ETags of the parts already sent, by part
+            number.
+        :raises UploadError: If a part could not be sent.
+        """
+        self._stats["resumed"] = len(etags)
+        state = {
+            "part_size": self._part_size,
+            "upload_info": dict(upload_info),
+            "etags": etags,
+        }
+        state_lock = threading.Lock()
+
+        def upload_part(part_number):
+            etag = self._upload_part(
+                path, filename, upload_info, part_number, size, content_type
+            )
+            with state_lock:
+                etags[part_number] = etag
+                self._save_state(state_path, state)
+
+        missing = [p for p in range(1, part_count + 1) if p not in etags]
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            # consume the results to raise the first failure
+            list(executor.map(upload_part, missing))
+
+        with self._sg_lock:
+            self._sg._complete_multipart_upload(
+                upload_info, filename, [etags[p] for p in range(1, part_count + 1)]
+            )
+
+    def _upload_part(
+        self, path, filename, upload_info, part_number, size, content_type
+    ):
+        """
+        Uploads one part, retrying with an exponential backoff.
+        """
+        offset = (part_number - 1) * self._part_size
+        part_size = min(self._part_size, size - offset)
+
+        for attempt in range(self._max_retries + 1):
+            try:
+                # the api connection isn't thread safe
+                with self._sg_lock:
+                    url = self._sg._get_upload_part_link(
+                        upload_info, filename, part_number
+                    )
+                etag = self._transport.put(
+                    url,
+                    self._read_blocks(path, offset, part_size),
+                    part_size,
+                    content_type,
+                )
+                with self._stats_lock:
+                    self._stats["parts"] += 1
+                    self._stats["bytes"] += part_size
+                return etag
+            except Exception as e:
+                if attempt == self._max_retries:
+                    raise UploadError(
+                        "Part %d of %s failed after %d attempts: %s"
+                        % (part_number, filename, attempt + 1, e)
+                    )
+                with self._stats_lock:
+                    self._stats["retries"] += 1
+                self._logger.debug(
+                    "Retrying part %d of %s: %s" % (part_number, filename, e)
+                )
+                time.sleep(2**attempt)
+
+    def _read_blocks(self, path, offset, size):
+        """
+        Yields the content of a part in blocks, throttled by the bandwidth
+        limit.
+        """
+        with open(path, "rb") as fh:
+            fh.seek(offset)
+            remaining = size
+            while remaining:
+                block = fh.read(min(BLOCK_SIZE, remaining))
+                if not block:
+                    break
+                self._limiter.consume(len(block))
+                remaining -= len(block)
+                yield block
+
+    def _state_path(self, path):
+        """
+        Returns the path of the progress file of an upload. The key includes
+        the size and modification time so that a re-rendered file starts over.
+        """
+        stat = os.stat(path)
+        key = "%s:%d:%d" % (os.path.abspath(path), stat.st_size, int(stat.st_mtime))
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self._state_dir, "%s.json" % name)
+
+    def _load_state(self, state_path):
+        if not os.path.exists(state_path):
+            return None
+        try:
+            with open(state_path, "r") as fh:
+                return json.load(fh)
+        except (IOError, ValueError):
+            return None
+
+    def _remove_state(self, state_path):
+        if os.path.exists(state_path):
+            os.remove(state_path)
+
+    def _save_state(self, state_path, state):
+        if not os.path.exists(self._state_dir):
+            os.makedirs(self._state_dir)
+        tmp_path = "%s.tmp" % state_path
+        with open(tmp_path, "w") as fh:
+            json.dump(state, fh)
+        os.replace(tmp_path, state_path)
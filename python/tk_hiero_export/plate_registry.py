@@ -0,0 +1,287 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Content addressed registry of rendered plates.
+
+Maps everything that determines the pixels of a transcode (source media
+and its size and modification time, input colour transform, source range,
+retime, effects and the render settings of the preset) to the frames
+already written by a previous export, so identical plates can be linked
+into place instead of being rendered again.
+"""
+
+import os
+import re
+import json
+import shutil
+import hashlib
+
+from .export_fingerprint import effect_data
+
+# transcode preset properties which affect the rendered frames
+RENDER_PROPERTIES = (
+    "file_type",
+    "reformat",
+    "colourspace",
+    "channels",
+    "views",
+    "burninDataEnabled",
+    "burninData",
+    "additionalNodesEnabled",
+    "additionalNodesData",
+    "includeEffects",
+    "includeAnnotations",
+)
+
+
+def compute_plate_key(task):
+    """
+    Computes the registry key of the plate rendered by a transcode task.
+
+    :param task: A ShotgunTranscodeExporter task.
+    :return: str - a hex digest
+    """
+    item = task._item
+    properties = task._preset.properties()
+    file_type = properties.get("file_type")
+
+    try:
+        media_path = item.source().mediaSource().firstpath()
+    except Exception:
+        media_path = item.source().name()
+
+    start, end = task.inputRange()
+
+    data = {
+        "media": media_path,
+        "media_files": media_signature(item.source()),
+        "colour_transform": source_colour_transform(item.source()),
+        "range": [start, end],
+        "retime": item.playbackSpeed(),
+        "effects": [effect_data(e) for e in getattr(task, "_effects", None) or []],
+        "properties": dict((key, properties.get(key)) for key in RENDER_PROPERTIES),
+        "file_type_options": properties.get(file_type),
+    }
+
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def media_signature(clip):
+    """
+    Returns the size and modification time of the first and last files of
+    the media of a clip, so that media delivered again at the same path
+    doesn't match the plates rendered from the previous delivery.
+
+    :returns: A list of ``[size, mtime]`` pairs, None for the files which
+        can't be read.
+    """
+    try:
+        media = clip.mediaSource()
+        fileinfos = media.fileinfos()
+    except Exception:
+        return None
+
+    if fileinfos:
+        info = fileinfos[0]
+        paths = [
+            frame_path(info.filename(), info.startFrame()),
+            frame_path(info.filename(), info.endFrame()),
+        ]
+    else:
+        paths = [media.firstpath()]
+
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except (OSError, TypeError):
+            signature.append(None)
+        else:
+            signature.append([stat.st_size, int(stat.st_mtime)])
+    return signature
+
+
+def source_colour_transform(clip):
+    """
+    Returns the input colour transform of a clip.
+    """
+    try:
+        return clip.sourceMediaColourTransform()
+    except AttributeError:
+        pass
+    try:
+        return clip.readNode().knob("colorspace").value()
+    except Exception:
+        return None
+
+
+def frame_path(path, frame):
+    """
+    Expands the frame token of a path, either in the #### or %04d style.
+
+    :param str path: The path, possibly containing a frame token.
+    :param int frame: The frame number.
+    :return: str - the path to the frame
+    """
+    match = re.search(r"#+", path)
+    if match:
+        padded = str(frame).zfill(len(match.group(0)))
+        return path[: match.start()] + padded + path[match.end() :]
+
+    match = re.search(r"%(0\d+)?d", path)
+    if match:
+        return path[: match.start()] + (match.group(0) % frame) + path[match.end() :]
+
+    return path
+
+
+def is_frame_sequence(path):
+    """
+    Returns True if the path contains a frame token.
+    """
+    return frame_path(path, 0) != path
+
+
+class PlateRegistry(object):
+    """
+    Keeps track of the plates rendered by previous exports.
+
+    The registry is a json file in the app's cache location mapping a plate
+    key to the path and frame range of the rendered frames.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._plates = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as fh:
+                    self._plates = json.load(fh)
+            except (IOError, ValueError):
+                self._plates = {}
+
+    def find(self, key, frame_count):
+        """
+        Returns the registered plate for the key if all of its frames are
+        still on disk.
+
+        :param str key: The plate key.
+        :param int frame_count: The number of frames the new plate needs.
+        :return: dict with ``path``, ``first`` and ``last`` keys, or None.
+        """
+        plate = self._plates.get(key)
+        if plate is None:
+            return None
+
+        if plate["last"] - plate["first"] + 1 != frame_count:
+            return None
+
+        for frame in range(plate["first"], plate["last"] + 1):
+            if not os.path.exists(frame_path(plate["path"], frame)):
+                # the frames were removed or moved since, forget about them
+                del self._plates[key]
+                self.save()
+                return None
+
+        return plate
+
+    def register(self, key, path, first, last):
+        """
+        Registers the frames of a rendered plate, forgetting the plates
+        registered at the same path before, whose frames were overwritten.
+        """
+        self._forget_path(path)
+        self._plates[key] = {"path": path, "first": first, "last": last}
+        self.save()
+
+    def release(self, path, first, last):
+        """
+        Prepares a path for a render: the plates registered at the path are
+        forgotten, and the frames hard linked to other plates are removed,
+        so that the render doesn't overwrite the frames of the other plates
+        through the links.
+        """
+        if self._forget_path(path):
+            self.save()
+        for frame in range(first, last + 1):
+            frame_file = frame_path(path, frame)
+            try:
+                if os.stat(frame_file).st_nlink > 1:
+                    os.remove(frame_file)
+            except OSError:
+                pass
+
+    def _forget_path(self, path):
+        """
+        Forgets the plates registered at a path.
+
+        :returns: True if any was.
+        """
+        path = os.path.normpath(path)
+        stale = [
+            key
+            for (key, plate) in self._plates.items()
+            if os.path.normpath(plate["path"]) == path
+        ]
+        for key in stale:
+            del self._plates[key]
+        return bool(stale)
+
+    def link(self, plate, path, first):
+        """
+        Links the frames of a registered plate to a new path.
+
+        Frames are hard linked where possible, and copied when the new path is
+        on a different file system.
+
+        :param dict plate: A plate returned by :meth:`find`.
+        :param str path: The path of the new plate.
+        :param int first: The first frame of the new plate.
+        """
+        if os.path.normpath(plate["path"]) != os.path.normpath(path):
+            # the plate registered at the new path, if any, is overwritten
+            if self._forget_path(path):
+                self.save()
+
+        for index in range(plate["last"] - plate["first"] + 1):
+            src = frame_path(plate["path"], plate["first"] + index)
+            dst = frame_path(path, first + index)
+
+            if os.path.normpath(src) == os.path.normpath(dst):
+                continue
+
+            folder = os.path.dirname(dst)
+            if not os.path.exists(folder):
+                os.makedirs(folder)
+
+            if os.path.exists(dst):
+                os.remove(dst)
+
+            try:
+                os.link(src, dst)
+            except OSError:
+                # different file system, or hard links not supported
+                shutil.copy2(src, dst)
+
+    def save(self):
+        """
+        Writes the registry to disk.
+        """
+        folder = os.path.dirname(self._path)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        tmp_path = "%s.tmp" % self._path
+        with open(tmp_path, "w") as fh:
+            json.dump(self._plates, fh, indent=2, sort_keys=True)
+        os.replace(tmp_path, self._path)
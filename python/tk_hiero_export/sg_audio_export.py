@@ -20,7 +20,10 @@ import sgtk
 from sgtk.platform.qt import QtGui, QtCore
 
 from .base import ShotgunHieroObjectBase
+from .tracing import traced
 from .collating_exporter import CollatingExporter, CollatedShotPreset
+from .export_journal import PUBLISH_REGISTERED
+from .memory_policy import compress_thumbnail
 
 from hiero import core
 from hiero.core import *
@@ -97,8 +100,12 @@ class ShotgunAudioExporter(
         except AttributeError:
             return FnAudioExportTask.AudioExportTask.sequenceName(self)
 
+    @traced()
     def startTask(self):
         """Run Task"""
+        if self._is_skipped_export():
+            return
+
         if self._resolved_export_path is None:
             self._resolved_export_path = self.resolvedExportPath()
             self._tk_version = self._formatTkVersionString(self.versionString())
@@ -156,7 +163,7 @@ class ShotgunAudioExporter(
         ##########################
         source = self._item.source()
         try:
-            self._thumbnail = source.thumbnail(source.posterFrame())
+            self._thumbnail = compress_thumbnail(source.thumbnail(source.posterFrame()))
         except RuntimeError:
             # Nuke 16.0 issues a RuntimeError when trying to get the thumbnail
             # RuntimeError: Layer does not exist
@@ -164,15 +171,15 @@ class ShotgunAudioExporter(
 
         return FnAudioExportTask.AudioExportTask.startTask(self)
 
+    @traced()
     def taskStep(self):
         """
         Overridden method to allow proper timings for audio export
         """
-        item = self._item
-        if item.guid() in self._collatedItemsMap:
-            item = self._collatedItemsMap[item.guid()]
+        if self._is_skipped_export():
+            return False
 
-        return self._baseTaskStep(item)
+        return self._baseTaskStep(self._audioItem())
 
     def _baseTaskStep(self, item):
         """
@@ -196,68 +203,20 @@ class ShotgunAudioExporter(
                     item.writeAudioToFile(self._audioFile, start, end)
 
                 elif isinstance(item, TrackItem):
-                    handles = self._cutHandles if self._cutHandles is not None else 0
-                    start, end = (
-                        (item.timelineIn() - handles),
-                        (item.timelineOut() + handles) + 1,
-                    )
-
-                    # Check Nuke version
-                    nuke_version = (
-                        nuke.NUKE_VERSION_MAJOR,
-                        nuke.NUKE_VERSION_MINOR,
-                        nuke.NUKE_VERSION_RELEASE,
-                    )
-
-                    if nuke_version[0] > 12 or (
-                        nuke_version[0] == 12 and nuke_version[1] > 0
+                    start, end = self._audioRange(item)
+
+                    # bounce the shot down from the sequence mix when
+                    # possible rather than mixing the timeline again
+                    write_args = self._audioWriteArgs()
+                    audio_cache = getattr(self.app, "audio_cache", None)
+                    if audio_cache is None or not audio_cache.write_slice(
+                        self._sequence, self._audioFile, start, end, write_args
                     ):
-                        # The following values need to be passed as additional arguments to the writeAudioToFile method
-                        # in nuke versions >= 12.1:
-                        # numChannels[number(int)], sampleRate[Hz], bitDepth[bits], bitRate[kbp/s]
-                        bitDepth_str = self._initDict["preset"]._properties["bitDepth"]
-                        bitRate_str = self._initDict["preset"]._properties["bitRate"]
-                        bitDepth = [
-                            int(s) for s in bitDepth_str.split() if s.isdigit()
-                        ][0]
-                        bitRate = [int(s) for s in bitRate_str.split() if s.isdigit()][
-                            0
-                        ]
-                        numChannels_str = self._initDict["preset"]._properties[
-                            "numChannels"
-                        ]
-                        sampleRate_str = self._initDict["preset"]._properties[
-                            "sampleRate"
-                        ]
-                        sampleRate = [
-                            int(s) for s in sampleRate_str.split() if s.isdigit()
-                        ][0]
-
-                        # numChannels parameter must be passed as an integer
-                        if numChannels_str == "mono":
-                            numChannels = 1
-                        elif numChannels_str == "stereo":
-                            numChannels = 2
-                        elif numChannels_str == "5.1 (L R C LFE Ls Rs)":
-                            numChannels = 6
-                        else:
-                            numChannels = 8
-
                         # If trackitem write out just the audio within the cut
                         self._sequence.writeAudioToFile(
-                            self._audioFile,
-                            start,
-                            end,
-                            numChannels,
-                            sampleRate,
-                            bitDepth,
-                            bitRate,
+                            self._audioFile, start, end, *write_args
                         )
 
-                    else:
-                        # If trackitem write out just the audio within the cut
-                        self._sequence.writeAudioToFile(self._audioFile, start, end)
-
         elif isinstance(item, Clip):
             # If item is clip, we're writing out the clip audio not the whole sequence
             if item.mediaSource().hasAudio():
@@ -273,24 +232,95 @@ class ShotgunAudioExporter(
 
         return False
 
-    def finishTask(self):
-        """Finish Task"""
-        # run base class implementation
-        FnAudioExportTask.AudioExportTask.finishTask(self)
+    def _audioItem(self):
+        """
+        Returns the item whose audio is written, taking collating into account.
+        """
+        item = self._item
+        if item.guid() in self._collatedItemsMap:
+            item = self._collatedItemsMap[item.guid()]
+        return item
 
-        if self._do_publish:
-            self._publish()
+    def _audioRange(self, item):
+        """
+        Returns the start and end frames of the sequence audio written for a
+        track item, handles included.
+        """
+        handles = self._cutHandles if self._cutHandles is not None else 0
+        return (
+            (item.timelineIn() - handles),
+            (item.timelineOut() + handles) + 1,
+        )
 
-        # Log usage metrics
-        try:
-            self.app.log_metric("Audio Export", log_version=True)
-        except:
-            # ingore any errors. ex: metrics logging not supported
-            pass
+    def _audioWriteArgs(self):
+        """
+        Returns the extra arguments passed to writeAudioToFile for the audio
+        settings of the preset.
+        """
+        # Check Nuke version
+        nuke_version = (
+            nuke.NUKE_VERSION_MAJOR,
+            nuke.NUKE_VERSION_MINOR,
+            nuke.NUKE_VERSION_RELEASE,
+        )
+
+        if not (
+            nuke_version[0] > 12 or (nuke_version[0] == 12 and nuke_version[1] > 0)
+        ):
+            return ()
+
+        # The following values need to be passed as additional arguments to
+        # the writeAudioToFile method in nuke versions >= 12.1:
+        # numChannels[number(int)], sampleRate[Hz], bitDepth[bits], bitRate[kbp/s]
+        bitDepth_str = self._initDict["preset"]._properties["bitDepth"]
+        bitRate_str = self._initDict["preset"]._properties["bitRate"]
+        bitDepth = [int(s) for s in bitDepth_str.split() if s.isdigit()][0]
+        bitRate = [int(s) for s in bitRate_str.split() if s.isdigit()][0]
+        numChannels_str = self._initDict["preset"]._properties["numChannels"]
+        sampleRate_str = self._initDict["preset"]._properties["sampleRate"]
+        sampleRate = [int(s) for s in sampleRate_str.split() if s.isdigit()][0]
+
+        # numChannels parameter must be passed as an integer
+        if numChannels_str == "mono":
+            numChannels = 1
+        elif numChannels_str == "stereo":
+            numChannels = 2
+        elif numChannels_str == "5.1 (L R C LFE Ls Rs)":
+            numChannels = 6
+        else:
+            numChannels = 8
+
+        return (numChannels, sampleRate, bitDepth, bitRate)
+
+    @traced()
+    def finishTask(self):
+        """Finish Task"""
+        if self._is_skipped_export():
+            return
+
+        with self._finishing_task():
+            # run base class implementation
+            FnAudioExportTask.AudioExportTask.finishTask(self)
+
+            # unless the export being resumed published the audio already
+            if self._do_publish and not self._journaled(PUBLISH_REGISTERED)[0]:
+                pub_data = self._publish()
+                self._journal(
+                    PUBLISH_REGISTERED, {"type": pub_data["type"], "id": pub_data["id"]}
+                )
+
+            # Log usage metrics
+            try:
+                self.app.log_metric("Audio Export", log_version=True)
+            except:
+                # ingore any errors. ex: metrics logging not supported
+                pass
 
     def _publish(self):
         """
         Publish task output.
+
+        :returns: The publish entity.
         """
         ctx = self.app.tank.context_from_entity("Shot", self._sg_shot["id"])
         published_file_type = self.app.get_setting(
@@ -327,6 +357,8 @@ class ShotgunAudioExporter(
         # upload thumbnail for publish
         self._upload_thumbnail_to_sg(pub_data, self._thumbnail)
 
+        return pub_data
+
 
 class ShotgunAudioPreset(
     ShotgunHieroObjectBase, CollatedShotPreset, FnAudioExportTask.AudioExportPreset
@@ -0,0 +1,461 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Keeps the exports going when the Flow Production Tracking site is busy.
+
+The API calls of the exports go through a :class:`SGCallGuard`, which
+
+- spaces them out with a token bucket, whose rate is halved every time the
+  site throttles a call and slowly raised back once calls go through;
+- retries the calls which are safe to repeat, with a jittered exponential
+  backoff, when the site can't be reached or is overloaded. Reads and
+  updates are retried as they are, a create is only retried once a lookup
+  of the entities created since the export started made sure it didn't
+  create the entity;
+- stops sending calls for a while, with a circuit breaker, after several
+  failures in a row, rather than piling calls on a site which is down.
+
+Nothing in here depends on Hiero or Toolkit.
+"""
+
+import time
+import random
+import threading
+
+from .sg_write_queue import is_connection_error
+
+# the api methods going through the guard, everything else is forwarded
+# untouched
+GUARDED_METHODS = (
+    "find",
+    "find_one",
+    "summarize",
+    "text_search",
+    "schema_read",
+    "schema_entity_read",
+    "schema_field_read",
+    "create",
+    "update",
+    "delete",
+    "revive",
+    "batch",
+    "upload",
+    "upload_thumbnail",
+    "upload_filmstrip_thumbnail",
+)
+
+# the methods giving the same result when repeated
+RETRIED_METHODS = (
+    "find",
+    "find_one",
+    "summarize",
+    "text_search",
+    "schema_read",
+    "schema_entity_read",
+    "schema_field_read",
+    "update",
+    "upload_thumbnail",
+    "upload_filmstrip_thumbnail",
+)
+
+# the fields looked up to find out whether a create which failed went
+# through, only used for the entities with a code. The lookup is limited to
+# the entities with a higher id than the last one before the export created
+# any, the Cuts and Versions of previous exports having the same code.
+IDENTITY_FIELDS = (
+    "code",
+    "project",
+    "entity",
+    "sg_sequence",
+    "cut",
+    "shot",
+    "version",
+    "revision_number",
+    "version_number",
+)
+
+# the status codes of a site throttling its clients
+THROTTLING_STATUS_CODES = (429, 503)
+
+# without a maximum rate, the calls per second once the site throttled a
+# call, and the rate the limit is lifted at
+THROTTLED_RATE = 10.0
+RELEASED_RATE = 50.0
+
+
+class SGSiteUnavailableError(ConnectionError):
+    """
+    Raised when a call gave up waiting for the site to come back, the
+    circuit breaker still being open.
+    """
+
+
+def is_throttling_error(error):
+    """
+    Returns True if a call was refused because the site is overloaded.
+    """
+    return getattr(error, "errcode", None) in THROTTLING_STATUS_CODES
+
+
+class AdaptiveRateLimiter(object):
+    """
+    Token bucket spacing out the api calls, shared by all the threads of the
+    exports.
+
+    The rate is halved every time the site throttles a call, down to
+    ``min_rate``, and raised back a little for every call which goes
+    through. Without a maximum rate, the calls aren't limited until the site
+    throttles one, and the limit is lifted again once the rate is back to
+    :data:`RELEASED_RATE`.
+
+    :param float max_rate: The maximum number of calls per second, 0 or None
+        for no maximum.
+    :param float min_rate: The rate the throttling can't go below.
+    """
+
+    def __init__(
+        self, max_rate=None, min_rate=1.0, clock=time.monotonic, sleep=time.sleep
+    ):
+        self._max_rate = float(max_rate or 0)
+        self._min_rate = min(float(min_rate), self._max_rate or min_rate)
+        self._rate = self._max_rate or None
+        self._allowance = self._rate or 0
+        self._clock = clock
+        self._sleep = sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        """
+        The current number of calls per second, None if not limited.
+        """
+        return self._rate
+
+    def acquire(self):
+        """
+        Blocks until a call can be made without exceeding the rate.
+
+        :returns: The number of seconds waited.
+        """
+        with self._lock:
+            if self._rate is None:
+                return 0
+            now = self._clock()
+            # allow bursts of one second at most
+            self._allowance = min(
+                self._rate, self._allowance + (now - self._last) * self._rate
+            )
+            self._last = now
+            self._allowance -= 1
+            wait = -self._allowance / self._rate if self._allowance < 0 else 0
+
+        if wait:
+            self._sleep(wait)
+        return wait
+
+    def throttled(self):
+        """
+        Halves the rate, the site throttled a call.
+        """
+        with self._lock:
+            if self._rate is None:
+                (self._rate, self._allowance) = (THROTTLED_RATE, 0)
+                self._last = self._clock()
+            else:
+                self._rate = max(self._min_rate, self._rate / 2.0)
+                self._allowance = min(self._allowance, 0)
+
+    def succeeded(self):
+        """
+        Raises the rate back towards the maximum, a call went through.
+        """
+        with self._lock:
+            if self._rate is None:
+                return
+            if self._max_rate:
+                self._rate = min(self._max_rate, self._rate + self._max_rate / 100.0)
+            else:
+                self._rate += THROTTLED_RATE / 100.0
+                if self._rate >= RELEASED_RATE:
+                    self._rate = None
+
+
+class CircuitBreaker(object):
+    """
+    Stops the calls to the site for ``cool_off`` seconds after ``threshold``
+    failures in a row. Once the cool off is over, a single call is let
+    through to probe the site: the breaker closes if it succeeds and opens
+    again if it fails.
+
+    :param int threshold: The number of failures in a row opening the
+        breaker.
+    :param float cool_off: The seconds the breaker stays open.
+    """
+
+    def __init__(self, threshold=5, cool_off=30.0, clock=time.monotonic):
+        self._threshold = threshold
+        self._cool_off = cool_off
+        self._clock = clock
+        self._failures = 0
+        self._opened = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self._opened is not None
+
+    @property
+    def is_probing(self):
+        return self._probing
+
+    def wait_time(self):
+        """
+        Returns how many seconds to wait before making a call, 0 if it can be
+        made right away.
+        """
+        with self._lock:
+            if self._opened is None:
+                return 0
+            remaining = self._opened + self._cool_off - self._clock()
+            if remaining > 0:
+                return remaining
+            if self._probing:
+                # the probe hasn't come back yet
+                return min(self._cool_off, 1.0)
+            self._probing = True
+            return 0
+
+    def succeeded(self):
+        with self._lock:
+            self._failures = 0
+            self._opened = None
+            self._probing = False
+
+    def failed(self):
+        """
+        Records a failure.
+
+        :returns: True if the failure opened the breaker.
+        """
+        with self._lock:
+            self._failures += 1
+            if self._probing or (
+                self._opened is None and self._failures >= self._threshold
+            ):
+                self._opened = self._clock()
+                self._probing = False
+                return True
+            return False
+
+
+class SGCallGuard(object):
+    """
+    Rate limits, retries and circuit breaks the api calls made through the
+    connections it wraps.
+
+    :param logger: A standard python logger.
+    :param float max_rate: The maximum number of calls per second, 0 for no
+        limit until the site throttles a call.
+    :param int retries: How many times a call is retried. 0 disables the
+        retries and the circuit breaker.
+    :param float cool_off: The seconds the circuit breaker stays open.
+    :param float base_delay: The delay of the first retry, before jitter.
+    :param float max_delay: The longest delay between two retries.
+    """
+
+    def __init__(
+        self,
+        logger,
+        max_rate=0,
+        retries=5,
+        cool_off=30.0,
+        base_delay=0.5,
+        max_delay=30.0,
+        clock=time.monotonic,
+        sleep=time.sleep,
+        jitter=random.random,
+    ):
+        self._logger = logger
+        self._retries = retries
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._sleep = sleep
+        self._jitter = jitter
+        self.limiter = AdaptiveRateLimiter(max_rate, clock=clock, sleep=sleep)
+        self.breaker = CircuitBreaker(cool_off=cool_off, clock=clock)
+        self.retried = 0
+        self._lock = threading.Lock()
+        self._last_ids = {}
+
+    def wrap(self, shotgun):
+        """
+        Returns a proxy of the connection guarding the calls made through it.
+        """
+        return _GuardedConnection(self, shotgun)
+
+    def start_export(self):
+        """
+        Called when an export starts, the entities its creates may have
+        created are the ones created from then on.
+        """
+        with self._lock:
+            self._last_ids = {}
+
+    def call(self, shotgun, method, args, kwargs):
+        """
+        Makes a call through the guard. Called by the connection proxies.
+        """
+        attempt = 0
+        last_id = None
+        if method == "create" and self._retries and self._is_retry_safe(method, args):
+            # the entities created by the attempts come after this one
+            last_id = self._last_id(shotgun, args[0])
+        while True:
+            attempt = self._wait_for_site(method, attempt)
+            self.limiter.acquire()
+            try:
+                result = getattr(shotgun, method)(*args, **kwargs)
+            except Exception as e:
+                if not (is_connection_error(e) or is_throttling_error(e)):
+                    # the site answered, it is up
+                    self.breaker.succeeded()
+                    raise
+                if self._retries and self.breaker.failed():
+                    self._logger.warning(
+                        "Flow Production Tracking is not responding, pausing "
+                        "the calls of the export for a while: %s" % e
+                    )
+                if is_throttling_error(e):
+                    self.limiter.throttled()
+                if attempt >= self._retries or not self._is_retry_safe(method, args):
+                    raise
+
+                delay = self._jitter() * min(
+                    self._max_delay, self._base_delay * 2**attempt
+                )
+                self._logger.debug(
+                    "Retrying %s in %.1fs (attempt %d of %d): %s"
+                    % (method, delay, attempt + 1, self._retries, e)
+                )
+                self.retried += 1
+                attempt += 1
+                self._sleep(delay)
+
+                if method == "create" and not is_throttling_error(e):
+                    # the create may have gone through before the error
+                    created = self._find_created(shotgun, last_id, *args, **kwargs)
+                    if created is not None:
+                        return created
+                continue
+
+            self.breaker.succeeded()
+            self.limiter.succeeded()
+            return result
+
+    def _wait_for_site(self, method, attempt):
+        """
+        Waits for the circuit breaker to let a call through, every cool off
+        waited counting as an attempt.
+
+        :returns: The attempts made so far.
+        """
+        if not self._retries:
+            return attempt
+        while True:
+            wait = self.breaker.wait_time()
+            if not wait:
+                return attempt
+            if not self.breaker.is_probing:
+                if attempt >= self._retries:
+                    raise SGSiteUnavailableError(
+                        "Gave up on %s, Flow Production Tracking is not "
+                        "responding." % method
+                    )
+                attempt += 1
+            self._sleep(wait)
+
+    def _is_retry_safe(self, method, args):
+        """
+        Returns True if a call which failed can be made again.
+        """
+        if method in RETRIED_METHODS:
+            return True
+        if method == "create":
+            # only the creates which can be looked up
+            data = args[1] if len(args) > 1 else {}
+            return "code" in data
+        if method == "batch":
+            return all(request["request_type"] == "update" for request in args[0])
+        return False
+
+    def _last_id(self, shotgun, entity_type):
+        """
+        Returns the highest id of the entities of a type before the first
+        create of the export, 0 if there were none. The site hands out
+        increasing ids, so this doesn't depend on the clocks of the site and
+        of this machine agreeing.
+        """
+        with self._lock:
+            if entity_type in self._last_ids:
+                return self._last_ids[entity_type]
+        last = self.call(
+            shotgun,
+            "find_one",
+            (entity_type, [], ["id"]),
+            {"order": [{"field_name": "id", "direction": "desc"}]},
+        )
+        with self._lock:
+            return self._last_ids.setdefault(entity_type, last["id"] if last else 0)
+
+    def _find_created(self, shotgun, last_id, entity_type, data, return_fields=None):
+        """
+        Returns the entity a create which failed may have created, or None.
+
+        :param int last_id: The highest id of the entities of the type before
+            the first create of the export.
+        """
+        filters = [
+            [field, "is", data[field]] for field in IDENTITY_FIELDS if field in data
+        ]
+        filters.append(["id", "greater_than", last_id])
+        fields = list(data.keys()) + list(return_fields or [])
+        return self.call(shotgun, "find_one", (entity_type, filters, fields), {})
+
+
+class _GuardedConnection(object):
+    """
+    Proxy of a connection which guards the calls of :data:`GUARDED_METHODS`
+    and forwards everything else untouched, attribute assignments included.
+    """
+
+    def __init__(self, guard, shotgun):
+        object.__setattr__(self, "_guard", guard)
+        object.__setattr__(self, "_shotgun", shotgun)
+
+    def __setattr__(self, name, value):
+        setattr(self._shotgun, name, value)
+
+    def __delattr__(self, name):
+        delattr(self._shotgun, name)
+
+    def __getattr__(self, name):
+        attr = getattr(self._shotgun, name)
+        if name not in GUARDED_METHODS:
+            return attr
+
+        (guard, shotgun) = (self._guard, self._shotgun)
+
+        def guarded(*args, **kwargs):
+            return guard.call(shotgun, name, args, kwargs)
+
+        return guarded
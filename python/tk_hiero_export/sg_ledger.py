@@ -0,0 +1,259 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Ledger of the Flow Production Tracking API calls made during an export.
+
+Every call is recorded with its entity type, latency, payload size and the
+module and hook it was made from, so that repeated per shot queries stand
+out in the summary. The writes queued by the ``queue_sg_writes`` setting are
+recorded when they are queued, their latency is the time taken to queue them.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import collections
+
+# the api methods recorded by the ledger
+RECORDED_METHODS = (
+    "find",
+    "find_one",
+    "create",
+    "update",
+    "delete",
+    "batch",
+    "upload",
+    "upload_thumbnail",
+    "schema_field_read",
+)
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class SGCallLedger(object):
+    """
+    Records the API calls made through the connections it wraps.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.shots = 0
+        self._lock = threading.Lock()
+
+    def wrap(self, shotgun):
+        """
+        Returns a proxy of the connection recording the calls made through it.
+        """
+        return _RecordingConnection(self, shotgun)
+
+    def record(self, method, args, kwargs, latency, error=None):
+        """
+        Records a call. Called by the connection proxies.
+        """
+        (module, hook) = _caller()
+        call = {
+            "method": method,
+            "entity_type": _entity_type(method, args, kwargs),
+            "latency": latency,
+            "payload": _payload_size(method, args, kwargs),
+            "module": module,
+            "hook": hook,
+        }
+        if error is not None:
+            call["error"] = error
+        with self._lock:
+            self.calls.append(call)
+
+    def summary(self):
+        """
+        Returns the calls grouped by module, hook, method and entity type.
+
+        :returns: A list of dictionaries with the ``module``, ``hook``,
+            ``method``, ``entity_type``, ``count``, ``total`` and ``payload``
+            keys, the most expensive first.
+        """
+        groups = collections.OrderedDict()
+        with self._lock:
+            calls = list(self.calls)
+
+        for call in calls:
+            key = (call["module"], call["hook"], call["method"], call["entity_type"])
+            group = groups.setdefault(
+                key,
+                {
+                    "module": call["module"],
+                    "hook": call["hook"],
+                    "method": call["method"],
+                    "entity_type": call["entity_type"],
+                    "count": 0,
+                    "total": 0.0,
+                    "payload": 0,
+                },
+            )
+            group["count"] += 1
+            group["total"] += call["latency"]
+            group["payload"] += call["payload"]
+
+        return sorted(groups.values(), key=lambda group: -group["total"])
+
+    def format_summary(self):
+        """
+        Returns the summary as a text table.
+        """
+        rows = [
+            (
+                "Module",
+                "Hook",
+                "Method",
+                "Entity",
+                "Calls",
+                "Total ms",
+                "Mean ms",
+                "Bytes",
+            )
+        ]
+        for group in self.summary():
+            rows.append(
+                (
+                    group["module"] or "-",
+                    group["hook"] or "-",
+                    group["method"],
+                    group["entity_type"] or "-",
+                    str(group["count"]),
+                    "%.1f" % (group["total"] * 1000.0),
+                    "%.1f" % (group["total"] * 1000.0 / group["count"]),
+                    str(group["payload"]),
+                )
+            )
+
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = [
+            "  ".join(cell.ljust(width) for (cell, width) in zip(row, widths))
+            for row in rows
+        ]
+        lines.insert(1, "  ".join("-" * width for width in widths))
+
+        # calls may still be recorded by other threads
+        with self._lock:
+            calls = list(self.calls)
+        lines.append("")
+        lines.append(
+            "%d calls, %.1f s, %s calls per shot"
+            % (
+                len(calls),
+                sum(call["latency"] for call in calls),
+                "%.1f" % (float(len(calls)) / self.shots) if self.shots else "n/a",
+            )
+        )
+        return "\n".join(lines)
+
+    def dump(self, path):
+        """
+        Writes every recorded call and the summary to a json file.
+        """
+        folder = os.path.dirname(path)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        with self._lock:
+            calls = list(self.calls)
+        with open(path, "w") as fh:
+            json.dump(
+                {"shots": self.shots, "calls": calls, "summary": self.summary()},
+                fh,
+                indent=2,
+            )
+
+
+class _RecordingConnection(object):
+    """
+    Proxy of a connection which records the calls of :data:`RECORDED_METHODS`
+    and forwards everything else untouched, attribute assignments included.
+    """
+
+    def __init__(self, ledger, shotgun):
+        object.__setattr__(self, "_ledger", ledger)
+        object.__setattr__(self, "_shotgun", shotgun)
+
+    def __setattr__(self, name, value):
+        setattr(self._shotgun, name, value)
+
+    def __delattr__(self, name):
+        delattr(self._shotgun, name)
+
+    def __getattr__(self, name):
+        attr = getattr(self._shotgun, name)
+        if name not in RECORDED_METHODS:
+            return attr
+
+        ledger = self._ledger
+
+        def recorded(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = attr(*args, **kwargs)
+            except Exception as e:
+                ledger.record(name, args, kwargs, time.perf_counter() - start, str(e))
+                raise
+            ledger.record(name, args, kwargs, time.perf_counter() - start)
+            return result
+
+        return recorded
+
+
+def _entity_type(method, args, kwargs):
+    """
+    Returns the entity type a call is about. Batches list the entity types
+    of their requests.
+    """
+    if method == "batch":
+        requests = args[0] if args else kwargs.get("requests", [])
+        return ",".join(sorted(set(r.get("entity_type", "?") for r in requests)))
+    if args:
+        return args[0]
+    return kwargs.get("entity_type")
+
+
+def _payload_size(method, args, kwargs):
+    """
+    Returns the size in bytes of what a call sends.
+    """
+    if method in ("upload", "upload_thumbnail"):
+        path = args[2] if len(args) > 2 else kwargs.get("path")
+        try:
+            return os.path.getsize(path)
+        except (OSError, TypeError):
+            return 0
+    return len(json.dumps([args, kwargs], default=str))
+
+
+def _caller():
+    """
+    Returns the module of this package and the hook the current call comes
+    from.
+    """
+    module = None
+    hook = None
+    frame = sys._getframe(3)
+    while frame is not None and (module is None or hook is None):
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if module is None and os.path.dirname(filename) == _PACKAGE_DIR:
+            module = os.path.splitext(os.path.basename(filename))[0]
+        if hook is None:
+            instance = frame.f_locals.get("self")
+            if instance is not None and any(
+                cls.__name__ == "Hook" for cls in type(instance).__mro__
+            ):
+                hook = type(instance).__name__
+        frame = frame.f_back
+    return (module, hook)
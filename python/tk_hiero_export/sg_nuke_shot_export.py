@@ -22,6 +22,9 @@ import sgtk
 from sgtk.platform.qt import QtGui, QtCore
 
 from .base import ShotgunHieroObjectBase
+from .tracing import traced
+from .export_journal import PUBLISH_REGISTERED
+from .memory_policy import compress_thumbnail
 from . import HieroGetExtraPublishData
 
 
@@ -144,10 +147,14 @@ class ShotgunNukeShotExporter(
             return self._item.parentSequence().name()
         return FnNukeShotExporter.NukeShotExporter.sequenceName(self)
 
+    @traced()
     def taskStep(self):
         """
         Run Task
         """
+        if self._is_skipped_export():
+            return False
+
         if self._resolved_export_path is None:
             self._resolved_export_path = self.resolvedExportPath()
             self._tk_version_number = self._formatTkVersionString(self.versionString())
@@ -159,7 +166,7 @@ class ShotgunNukeShotExporter(
 
         source = self._item.source()
         try:
-            self._thumbnail = source.thumbnail(source.posterFrame())
+            self._thumbnail = compress_thumbnail(source.thumbnail(source.posterFrame()))
         except RuntimeError:
             # Nuke 16.0 issues a RuntimeError when trying to get the thumbnail
             # RuntimeError: Layer does not exist
@@ -167,8 +174,12 @@ class ShotgunNukeShotExporter(
 
         return FnNukeShotExporter.NukeShotExporter.taskStep(self)
 
+    @traced()
     def startTask(self):
         """Run Task"""
+        if self._is_skipped_export():
+            return
+
         # call the publish data hook to allow for publish customization while _item is valid (unlike finishTask)
         self._extra_publish_data = self.app.execute_hook(
             "hook_get_extra_publish_data",
@@ -178,81 +189,98 @@ class ShotgunNukeShotExporter(
 
         return FnNukeShotExporter.NukeShotExporter.startTask(self)
 
+    @traced()
     def finishTask(self):
         """
         Finish Task
         """
-        # run base class implementation
-        FnNukeShotExporter.NukeShotExporter.finishTask(self)
-        # Don't create PublishedFiles for non-hero collated items
-        if self._collate and not self._hero:
+        if self._is_skipped_export():
             return
 
-        # register publish
-        # get context we're publishing to
-        ctx = self.app.tank.context_from_path(self._resolved_export_path)
-        published_file_type = self.app.get_setting("nuke_script_published_file_type")
-
-        args = {
-            "tk": self.app.tank,
-            "context": ctx,
-            "path": self._resolved_export_path,
-            "name": os.path.basename(self._resolved_export_path),
-            "version_number": int(self._tk_version_number),
-            "published_file_type": published_file_type,
-        }
-
-        # see if we get a task to use
-        if (ctx.entity is not None) and (ctx.entity.get("type", "") == "Shot"):
-            try:
-                task_filter = self.app.get_setting("default_task_filter", "[]")
-                task_filter = ast.literal_eval(task_filter)
-                task_filter.append(["entity", "is", ctx.entity])
-                tasks = self.app.shotgun.find("Task", task_filter)
-                if len(tasks) == 1:
-                    args["task"] = tasks[0]
-            except ValueError:
-                # continue without task
-                self.app.log_error("Invalid value for 'default_task_filter'")
-
-        publish_entity_type = sgtk.util.get_published_file_entity_type(self.app.sgtk)
-
-        self.app.log_debug(
-            "Register publish in Flow Production Tracking: %s" % str(args)
-        )
-        sg_publish = sgtk.util.register_publish(**args)
-        if self._extra_publish_data is not None:
-            self.app.log_debug(
-                "Updating PTR %s %s"
-                % (publish_entity_type, str(self._extra_publish_data))
+        with self._finishing_task():
+            # run base class implementation
+            FnNukeShotExporter.NukeShotExporter.finishTask(self)
+            # Don't create PublishedFiles for non-hero collated items
+            if self._collate and not self._hero:
+                return
+
+            # nor for the scripts published by the export being resumed
+            if self._journaled(PUBLISH_REGISTERED)[0]:
+                return
+
+            # register publish
+            # get context we're publishing to
+            ctx = self.app.tank.context_from_path(self._resolved_export_path)
+            published_file_type = self.app.get_setting(
+                "nuke_script_published_file_type"
             )
-            self.app.shotgun.update(
-                sg_publish["type"], sg_publish["id"], self._extra_publish_data
+
+            args = {
+                "tk": self.app.tank,
+                "context": ctx,
+                "path": self._resolved_export_path,
+                "name": os.path.basename(self._resolved_export_path),
+                "version_number": int(self._tk_version_number),
+                "published_file_type": published_file_type,
+            }
+
+            # see if we get a task to use
+            if (ctx.entity is not None) and (ctx.entity.get("type", "") == "Shot"):
+                try:
+                    task_filter = self.app.get_setting("default_task_filter", "[]")
+                    task_filter = ast.literal_eval(task_filter)
+                    task_filter.append(["entity", "is", ctx.entity])
+                    tasks = self.app.shotgun.find("Task", task_filter)
+                    if len(tasks) == 1:
+                        args["task"] = tasks[0]
+                except ValueError:
+                    # continue without task
+                    self.app.log_error("Invalid value for 'default_task_filter'")
+
+            publish_entity_type = sgtk.util.get_published_file_entity_type(
+                self.app.sgtk
             )
 
-        # call the publish data hook to allow for publish customization.
-        extra_publish_data = self.app.execute_hook(
-            "hook_get_extra_publish_data",
-            task=self,
-            base_class=HieroGetExtraPublishData,
-        )
-        if extra_publish_data is not None:
             self.app.log_debug(
-                "Updating PTR %s %s" % (publish_entity_type, str(extra_publish_data))
+                "Register publish in Flow Production Tracking: %s" % str(args)
             )
-            self.app.shotgun.update(
-                sg_publish["type"], sg_publish["id"], extra_publish_data
+            sg_publish = sgtk.util.register_publish(**args)
+            if self._extra_publish_data is not None:
+                self.app.log_debug(
+                    "Updating PTR %s %s"
+                    % (publish_entity_type, str(self._extra_publish_data))
+                )
+                self.app.shotgun.update(
+                    sg_publish["type"], sg_publish["id"], self._extra_publish_data
+                )
+
+            # call the publish data hook to allow for publish customization.
+            extra_publish_data = self.app.execute_hook(
+                "hook_get_extra_publish_data",
+                task=self,
+                base_class=HieroGetExtraPublishData,
             )
+            if extra_publish_data is not None:
+                self.app.log_debug(
+                    "Updating PTR %s %s"
+                    % (publish_entity_type, str(extra_publish_data))
+                )
+                self.app.shotgun.update(
+                    sg_publish["type"], sg_publish["id"], extra_publish_data
+                )
 
-        # upload thumbnail for sequence
-        self._upload_thumbnail_to_sg(sg_publish, self._thumbnail)
+            # upload thumbnail for sequence
+            self._upload_thumbnail_to_sg(sg_publish, self._thumbnail)
+            self._journal(
+                PUBLISH_REGISTERED, {"type": sg_publish["type"], "id": sg_publish["id"]}
+            )
 
-        # Log usage metrics
-        try:
-            self.app.log_metric("Shot Export", log_version=True)
-        except:
-            # ingore any errors. ex: metrics logging not supported
-            pass
+            # Log usage metrics
+            try:
+                self.app.log_metric("Shot Export", log_version=True)
+            except:
+                # ingore any errors. ex: metrics logging not supported
+                pass
 
     def isExportingItem(self, item):
         """
@@ -8,7 +8,11 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
+import os
+import time
 import itertools
+import collections
+from concurrent.futures import ThreadPoolExecutor
 
 import sgtk
 from sgtk.platform.qt import QtGui
@@ -17,6 +21,7 @@ import hiero.core
 from hiero.core import FnExporterBase
 
 from hiero.exporters import FnShotProcessor
+from hiero.ui.FnUIProperty import UIPropertyFactory
 
 # For Hiero versions prior to 9.0 the ShotProcessor class
 # contained both the execution and UI logic. That was split
@@ -36,8 +41,23 @@ from .base import ShotgunHieroObjectBase
 from .version_creator import ShotgunTranscodeExporter
 from .shot_updater import ShotgunShotUpdaterPreset
 from .shot_updater import ShotgunShotUpdater
+from .sg_audio_export import ShotgunAudioExporter
 from .collating_exporter import CollatedShotPreset
 from .collating_exporter_ui import CollatingExporterUI
+from .export_fingerprint import ExportFingerprintStore, compute_fingerprint, item_key
+from .plate_registry import PlateRegistry
+from .export_session import ExportSession
+from .audio_cache import SequenceAudioCache
+from .tracing import ChromeTracer, NULL_TRACER, traced
+from .sg_ledger import SGCallLedger
+from .hook_dispatcher import HookDispatcher
+from .keyword_cache import CustomKeywordCache
+from .media_cache import SourceMediaCache
+from .export_journal import ExportJournal, CUT_CREATED, task_key
+from .sg_write_queue import SGWriteQueue, SGWriteFlusher
+from .memory_policy import ExportMemoryPolicy
+from .item_snapshot import SequenceSnapshot, TrackItemSnapshot
+from .timecode import frames_to_timecodes
 
 from . import (
     HieroPreExport,
@@ -134,6 +154,8 @@ class ShotgunShotProcessorUI(
             cut_type_layout = self._build_cut_type_layout(properties)
             shotgun_layout.addLayout(cut_type_layout)
 
+        shotgun_layout.addLayout(self._build_incremental_export_layout(properties))
+
         shotgun_layout.addStretch()
 
         # add default settings from baseclass below
@@ -172,8 +194,9 @@ class ShotgunShotProcessorUI(
         # ---- construct the widget
 
         # populate the list of cut types and default from the site schema
-        schema = self.app.shotgun.schema_field_read("Cut", "sg_cut_type")
-        cut_types = schema["sg_cut_type"]["properties"]["valid_values"]["value"]
+        cut_types = self._get_ui_lookup(
+            "cut_types", lambda: self._get_schema_valid_values("Cut", "sg_cut_type")
+        )
 
         # make sure we have an empty item at the top
         cut_types.insert(0, "")
@@ -212,43 +235,104 @@ class ShotgunShotProcessorUI(
 
         return cut_type_layout
 
+    def _build_incremental_export_layout(self, properties):
+        """
+        Returns a layout with the options to skip unchanged shots and to
+        resume an interrupted export.
+
+        :param properties: A dict containing the 'skipUnchangedShots' and
+            'resumeExport' presets
+        :return: QtGui.QLayout - for the incremental export widget
+        """
+        layout = QtGui.QFormLayout()
+
+        tooltip = (
+            "Skip the shots whose source, timing, handles, retime, tags, effects "
+            "and export settings are unchanged since their last successful "
+            "export. Uncheck to force a full export."
+        )
+        key = "skipUnchangedShots"
+        value = False
+        label = "Skip Unchanged Shots:"
+        self._skipUnchangedProperty = UIPropertyFactory.create(
+            type(value),
+            key=key,
+            value=value,
+            dictionary=properties,
+            label=label,
+            tooltip=tooltip,
+        )
+        layout.addRow(label, self._skipUnchangedProperty)
+
+        tooltip = (
+            "Skip the steps, like shot updates, renders, publishes and "
+            "uploads, already done by the last export of these shots. Check "
+            "to finish an export which was interrupted."
+        )
+        key = "resumeExport"
+        label = "Resume Interrupted Export:"
+        self._resumeExportProperty = UIPropertyFactory.create(
+            type(value),
+            key=key,
+            value=value,
+            dictionary=properties,
+            label=label,
+            tooltip=tooltip,
+        )
+        layout.addRow(label, self._resumeExportProperty)
+
+        return layout
+
     def _build_tag_selector_widget(self, items, properties):
         """
         Returns a QT widget which contains the tag.
-        """
-        fields = ["code"]
-        filter = [["entity_type", "is", "Shot"]]
-        templates = [
-            t["code"]
-            for t in self.app.shotgun.find("TaskTemplate", filter, fields=fields)
-        ]
 
-        schema = self.app.shotgun.schema_field_read("Shot", "sg_status_list")
-        statuses = schema["sg_status_list"]["properties"]["valid_values"]["value"]
+        The table is a view on a :class:`TagMappingModel`, its combo boxes are
+        only created while a cell is edited and its rows are populated as the
+        view scrolls.
+        """
+        # only imported once the dialog is shown, to keep the app startup fast
+        from .tag_mapping_model import TagMappingModel, TagMappingDelegate
+
+        templates = self._get_ui_lookup(
+            "templates",
+            lambda: [
+                t["code"]
+                for t in self.app.shotgun.find(
+                    "TaskTemplate", [["entity_type", "is", "Shot"]], fields=["code"]
+                )
+            ],
+        )
+        statuses = self._get_ui_lookup(
+            "statuses", lambda: self._get_schema_valid_values("Shot", "sg_status_list")
+        )
 
         values = [statuses, templates]
         labels = ["PTR Shot Status", "PTR Task Template for Shots"]
         keys = ["sg_status_hiero_tags", "task_template_map"]
 
-        # build a map of tag value pairs from the properties
-        propertyDicts = [dict(properties[key]) for key in keys]
-        propertyTags = list(set(itertools.chain(*[d.keys() for d in propertyDicts])))
-        map = {}
-        for tag in propertyTags:
-            map[tag] = [d.get(tag, None) for d in propertyDicts]
-
-        # add in blank entries for the current tags
-        tags = self._get_tags(items)
-        for tag in tags:
-            map.setdefault(tag.name(), [None] * len(keys))
+        # the tags of the current items, and the ones already mapped in the
+        # properties
+        tagIcons = dict((tag.name(), tag.icon()) for tag in self._get_tags(items))
+        propertyTags = set(
+            itertools.chain(*[dict(properties[key]).keys() for key in keys])
+        )
+        if not propertyTags.issubset(tagIcons):
+            allTagIcons = self._get_all_tag_icons()
+            for name in propertyTags:
+                if name not in tagIcons and name in allTagIcons:
+                    tagIcons[name] = allTagIcons[name]
 
         # keep a known order
-        names = sorted(map.keys())
+        tags = [(name, QtGui.QIcon(tagIcons[name])) for name in sorted(tagIcons.keys())]
 
         # setup the table
-        tagTable = QtGui.QTableWidget(len(names), len(labels) + 1)
+        tagTable = QtGui.QTableView()
+        model = TagMappingModel(tags, labels, keys, values, properties, tagTable)
+        tagTable.setModel(model)
+        tagTable.setItemDelegate(TagMappingDelegate(tagTable))
+        tagTable.setEditTriggers(QtGui.QAbstractItemView.AllEditTriggers)
         tagTable.setMinimumHeight(150)
-        tagTable.setHorizontalHeaderLabels(["Hiero Tags"] + labels)
         tagTable.setAlternatingRowColors(True)
         tagTable.setSelectionMode(QtGui.QAbstractItemView.SelectionMode.NoSelection)
         tagTable.setShowGrid(False)
@@ -256,72 +340,53 @@ class ShotgunShotProcessorUI(
         tagTable.horizontalHeader().setStretchLastSection(True)
         tagTable.setSizePolicy(QtGui.QSizePolicy.Expanding, QtGui.QSizePolicy.Preferred)
 
-        # on change rebuild the properties
-        def changed(index):
-            for row, name in enumerate(names):
-                for col, key in enumerate(keys):
-                    combo = tagTable.cellWidget(row, col + 1)
-
-                    # if no tag mapped to a name
-                    if combo is None:
-                        continue
-
-                    # otherwise grab the text and keep it in the properties
-                    select = combo.currentText()
-                    propertyDicts[col][name] = select and str(select) or None
-                    properties[key] = [
-                        (k, v) for (k, v) in propertyDicts[col].items() if v
-                    ]
-
-        # and build the table
-        tagsByName = self._get_all_tags_by_name()
-        for row, name in enumerate(names):
-            tag = tagsByName.get(name, None)
-            if tag is None:
-                continue
-
-            # build item for the tag
-            item = QtGui.QTableWidgetItem(name)
-            item.setIcon(QtGui.QIcon(tag.icon()))
-            tagTable.setItem(row, 0, item)
-
-            # build combo boxes for each set of values
-            for col, vals in enumerate(values):
-                combo = QtGui.QComboBox()
-                combo.addItem(None)
-                for i, value in enumerate(vals):
-                    combo.addItem(value)
-                    # see if the current item is the one in the properties
-                    if map[name][col] == value:
-                        combo.setCurrentIndex(i + 1)
-                combo.currentIndexChanged[int].connect(changed)
-                # adjust sizes to avoid clipping or scrolling
-                width = combo.minimumSizeHint().width()
-                combo.setMinimumWidth(width)
-                combo.setSizeAdjustPolicy(
-                    QtGui.QComboBox.SizeAdjustPolicy.AdjustToContents
-                )
-                tagTable.setCellWidget(row, col + 1, combo)
-
-        tagTable.resizeRowsToContents()
-        tagTable.resizeColumnsToContents()
+        # size the columns from their longest value rather than from the
+        # editors, which don't exist yet, to avoid clipping or scrolling
+        metrics = tagTable.fontMetrics()
+        columns = [[name for (name, icon) in tags]] + values
+        for col, (label, texts) in enumerate(zip(["Hiero Tags"] + labels, columns)):
+            width = max([metrics.boundingRect(t).width() for t in [label] + texts])
+            tagTable.setColumnWidth(col, width + 40)
 
         width = sum([tagTable.columnWidth(i) for i in range(len(keys) + 1)]) + 60
         tagTable.setMinimumWidth(width)
 
         return tagTable
 
-    def _get_all_tags_by_name(self):
+    def _get_ui_lookup(self, key, load):
+        """
+        Returns a list the export dialog shows, loading it the first time it
+        is needed. The lists are kept by the app until its context changes.
+
+        :param key: The name of the list, or a tuple starting with it.
+        :param load: A callable returning the list.
+        """
+        cache = self.app.ui_lookup_cache
+        if key not in cache:
+            cache[key] = load()
+        return list(cache[key])
+
+    def _get_all_tag_icons(self):
+        """
+        Returns the icon paths of all the tags, by tag name. The tags belong
+        to their project, so only their names and icons are kept, and they
+        are looked up again once other projects are open.
+        """
+        projects = tuple(sorted(project.path() for project in hiero.core.projects()))
+        return dict(self._get_ui_lookup(("tags", projects), self._find_all_tags))
+
+    def _find_all_tags(self):
         """
-        Returns all tags by name
+        Returns the (name, icon path) pairs of the tag presets and of the
+        tags of all the open projects.
         """
-        tagsByName = {}
+        tagIcons = {}
         projects = [hiero.core.project("Tag Presets")] + list(hiero.core.projects())
         for project in projects:
-            tagsByName.update(
-                dict([(tag.name(), tag) for tag in hiero.core.findProjectTags(project)])
+            tagIcons.update(
+                (tag.name(), tag.icon()) for tag in hiero.core.findProjectTags(project)
             )
-        return tagsByName
+        return list(tagIcons.items())
 
     def _get_tags(self, items):
         tags = FnExporterBase.tagsFromSelection(items, includeChildren=True)
@@ -408,10 +473,46 @@ class ShotgunShotProcessor(ShotgunHieroObjectBase, FnShotProcessor.ShotProcessor
         # tag app as first shot
         self.app.shot_count = 0
 
-        # need to temporarily monkey patch the internal hiero check so that our
-        # preview quicktime is generated. See the notes in the method being
-        # called for more info.
-        self._override_frame_server_check()
+        # schema values and task templates looked up during this export
+        self.app.sg_lookup_cache = {}
+
+        # values of the custom template keywords of the exported shots
+        self.app.keyword_cache = CustomKeywordCache(self.app.context.project)
+
+        # colorspace, format and timecode of the source clips of the shots
+        self.app.media_cache = SourceMediaCache(self.app)
+
+        # record timing spans for this export, if requested
+        if self.app.get_setting("trace_exports"):
+            self.app.tracer = ChromeTracer()
+        else:
+            self.app.tracer = NULL_TRACER
+
+        # record the api calls of this export, if requested
+        if self.app.get_setting("sg_call_ledger"):
+            self.app.sg_ledger = SGCallLedger()
+        else:
+            self.app.sg_ledger = None
+
+        # reuse the hook instances from one shot to the next, if requested
+        if self.app.get_setting("cache_hook_instances"):
+            self.app.hook_dispatcher = HookDispatcher(
+                self.app, self.app._execute_hook_method_uncached
+            )
+        else:
+            self.app.hook_dispatcher = None
+
+        # release what the tasks hold on to as soon as they are done, and
+        # hold back the renders when the memory is above the ceiling
+        self.app.memory_policy = ExportMemoryPolicy(
+            self.app.logger, self.app.get_setting("export_memory_ceiling")
+        )
+
+        # send the updates and uploads of this export from the background,
+        # if requested
+        self.app.sg_write_queue = None
+        if self.app.get_setting("queue_sg_writes"):
+            self._startWriteQueue()
 
         # startProcessing()'s signature changed in NukeStudio/Hiero 10.5v1.
         if self.app.get_nuke_version_tuple() >= (10, 5, 1):
@@ -419,19 +520,51 @@ class ShotgunShotProcessor(ShotgunHieroObjectBase, FnShotProcessor.ShotProcessor
         else:
             FnShotProcessor.ShotProcessor.startProcessing(self, exportItems)
 
-        # restore the monkey patched hiero method
-        self._restore_frame_server_check()
+        self.app.memory_policy.end_phase("preprocessing")
 
         # get rid of our placeholder
         exportTemplate.pop(0)
         self._exportTemplate.restore(exportTemplate)
 
+    @traced("processor")
     def processTaskPreQueue(self):
         """Process the tasks just before they're queued up for execution."""
 
         # do the normal pre processing as defined in the base class
         FnShotProcessor.ShotProcessor.processTaskPreQueue(self)
 
+        # the creates retried from now on only look for the entities created
+        # by this export
+        self.app.sg_call_guard.start_export()
+
+        # copy the attributes of the track items the tasks read, once
+        self._snapshotTrackItems()
+
+        # skip the task groups of track items that haven't changed since the
+        # last successful export, if requested.
+        skipped_groups = self._skipUnchangedTaskGroups()
+
+        # resolve the custom keywords of all the exported shots at once,
+        # before their paths are resolved
+        self._fillKeywordCache(skipped_groups)
+
+        self._startExportSession(skipped_groups)
+
+        # journal the steps of the export, or skip the ones journaled by the
+        # export it resumes
+        self._startExportJournal(skipped_groups)
+
+        # the tasks report back to the session when they are done, if none
+        # were registered the export is already over
+        self.app.export_session.start()
+
+        # let the transcode tasks reuse identical plates rendered previously
+        self.app.plate_registry = None
+        if self.app.get_setting("reuse_rendered_plates"):
+            self.app.plate_registry = PlateRegistry(
+                os.path.join(self.app.cache_location, "plate_registry.json")
+            )
+
         # if set, only exporting the cut portion of the source clip. If false,
         # the export will be the full clip
         cut_length = self._preset.properties()["cutLength"]
@@ -444,6 +577,9 @@ class ShotgunShotProcessor(ShotgunHieroObjectBase, FnShotProcessor.ShotProcessor
         # iterate over the tasks groups to be executed
         for taskGroup in self._submission.children():
 
+            if taskGroup in skipped_groups:
+                continue
+
             # placeholders for the tasks we want to pre-process
             (shot_updater_task, transcode_task) = (None, None)
 
@@ -476,17 +612,37 @@ class ShotgunShotProcessor(ShotgunHieroObjectBase, FnShotProcessor.ShotProcessor
                 # transcode_task may be None.
                 cut_related_tasks.append((shot_updater_task, transcode_task))
 
-        # sort the tasks based on their position in the timeline. this gives
-        # us the cut order.
-        cut_related_tasks.sort(key=lambda tasks: tasks[0]._item.timelineIn())
+        # compute the cut information of all the shots at once, the updater
+        # tasks and the cut preprocessing below read it
+        ShotgunShotUpdater.compute_cut_item_data(
+            [
+                task
+                for taskGroup in self._submission.children()
+                if taskGroup not in skipped_groups
+                for task in taskGroup.children()
+                if isinstance(task, ShotgunShotUpdater)
+            ]
+        )
+
+        # group the tasks by sequence, each sequence gets its own Cut.
+        cuts = collections.OrderedDict()
+        for tasks in cut_related_tasks:
+            sequence = tasks[0]._item_snapshot().sequence
+            cuts.setdefault(sequence.guid, []).append(tasks)
 
-        # go ahead and populate the shot updater tasks with the cut order. this
-        # is used to set the cut order on the Shot as it is created/updated.
-        for i in range(0, len(cut_related_tasks)):
-            (shot_updater_task, transcode_task) = cut_related_tasks[i]
+        for sequence_tasks in cuts.values():
+            # sort the tasks based on their position in the timeline. this
+            # gives us the cut order.
+            sequence_tasks.sort(key=lambda tasks: tasks[0]._item_snapshot().timeline_in)
 
-            # Cut order is 1-based
-            shot_updater_task._cut_order = i + 1
+            # go ahead and populate the shot updater tasks with the cut order.
+            # this is used to set the cut order on the Shot as it is
+            # created/updated.
+            for i in range(0, len(sequence_tasks)):
+                (shot_updater_task, transcode_task) = sequence_tasks[i]
+
+                # Cut order is 1-based
+                shot_updater_task._cut_order = i + 1
 
         # if you're wondering why we looped over the tasks above only to bail
         # out here if cuts support isn't available for the site, it's to
@@ -521,6 +677,19 @@ class ShotgunShotProcessor(ShotgunHieroObjectBase, FnShotProcessor.ShotProcessor
         if not allow_cut_updates:
             return
 
+        # a Cut revision built from a subset of the shots would not describe
+        # the edit, so leave the previous revision in place.
+        if skipped_groups:
+            self.app.log_info(
+                "Some shots were skipped because they are unchanged since the "
+                "last export. Not creating a new Cut in Flow Production "
+                "Tracking. Disable 'Skip Unchanged Shots' to export a full Cut."
+            )
+            return
+
+        if not cut_related_tasks:
+            return
+
         # collate complicates cut support for hiero. For now duck out at this
         # point with a log msg. The user should be aware of this from the
         # message in the collating preset UI.
@@ -534,15 +703,109 @@ class ShotgunShotProcessor(ShotgunHieroObjectBase, FnShotProcessor.ShotProcessor
 
         # ---- at this point, we have the cut related tasks in order.
 
+        if not self.app.engine.has_ui:
+            self._processCuts(list(cuts.values()))
+            return
+
         self.app.engine.show_busy("Preprocessing Sequence", "Creating Cut in PTR ...")
 
         # wrap in a try/catch to make sure we can clear the popup at the end
         try:
             # pre-process the cut data for the tasks about to execute
-            self._processCut(cut_related_tasks)
+            self._processCuts(list(cuts.values()))
         finally:
             self.app.engine.clear_busy()
 
+    def _snapshotTrackItems(self):
+        """
+        Takes a snapshot of each track item of the export, and of their
+        sequences, and hands it to the tasks of the track item. The tasks
+        read the snapshot rather than going through the Hiero API each time.
+        """
+        sequences = {}
+        snapshots = {}
+        for taskGroup in self._submission.children():
+            for task in taskGroup.children():
+                item = getattr(task, "_item", None)
+                if not isinstance(item, hiero.core.TrackItem):
+                    continue
+                snapshot = snapshots.get(item.guid())
+                if snapshot is None:
+                    sequence = item.parentSequence()
+                    sequence_snapshot = sequences.get(sequence.guid())
+                    if sequence_snapshot is None:
+                        sequence_snapshot = SequenceSnapshot.take(sequence)
+                        sequences[sequence.guid()] = sequence_snapshot
+                    # this also caches the media of the source clip for
+                    # the tasks
+                    snapshot = TrackItemSnapshot.take(
+                        item,
+                        self.app.media_cache.get(item.source()).timecode_start,
+                        sequence_snapshot,
+                    )
+                    snapshots[item.guid()] = snapshot
+                task._snapshot = snapshot
+
+    def _fillKeywordCache(self, skipped_groups):
+        """
+        Fills the cache of custom keyword values of the export with the
+        values of every exported shot, using the resolve_keywords method of
+        the resolve custom strings hook. Hooks without it, and the shots it
+        couldn't resolve, resolve each keyword when a path needs it.
+
+        :param skipped_groups: The task groups which won't be exported.
+        """
+        keywords = [
+            "{%s}" % ctf["keyword"]
+            for ctf in self.app.get_setting("custom_template_fields")
+        ]
+        if not keywords:
+            return
+
+        # a task for each shot
+        cache = self.app.keyword_cache
+        tasks = {}
+        for taskGroup in self._submission.children():
+            if taskGroup in skipped_groups:
+                continue
+            for task in taskGroup.children():
+                if isinstance(task._item, hiero.core.TrackItem):
+                    tasks.setdefault(cache.key(task), task)
+                    break
+        tasks = list(tasks.values())
+        if not tasks:
+            return
+
+        try:
+            values = self.app.execute_hook_method(
+                "hook_resolve_custom_strings",
+                "resolve_keywords",
+                tasks=tasks,
+                keywords=keywords,
+                base_class=HieroResolveCustomStrings,
+            )
+        except TankHookMethodDoesNotExistError:
+            self.app.log_debug(
+                "The resolve custom strings hook can't resolve keywords in "
+                "bulk, resolving them one at a time."
+            )
+            return
+        except Exception as e:
+            self.app.log_warning(
+                "Could not resolve the custom keywords of the shots in bulk, "
+                "resolving them one at a time: %s" % e
+            )
+            return
+
+        for task, task_values in zip(tasks, values or []):
+            try:
+                cache.update(task, task_values or {})
+            except Exception as e:
+                # this shot's keywords are resolved when its paths need them
+                self.app.log_debug(
+                    "Ignoring the keyword values of %s: %s" % (task._item.name(), e)
+                )
+
     def _getCollateProperties(self):
         """
         Returns tuple with values for collateTracks collateShotNames settings.
@@ -555,6 +818,260 @@ class ShotgunShotProcessor(ShotgunHieroObjectBase, FnShotProcessor.ShotProcessor
 
         return (collateTracks, collateShotNames)
 
+    def _startExportSession(self, skipped_groups):
+        """
+        Registers the tasks about to run with a new export session, and sets
+        up the per export caches it cleans up once they are all finished.
+
+        :param skipped_groups: The task groups which won't be exported.
+        """
+        session = ExportSession(self.app)
+        batch_job = getattr(self.app, "batch_job", None)
+        audio_cache = SequenceAudioCache()
+        shots = 0
+
+        for taskGroup in self._submission.children():
+            if taskGroup in skipped_groups:
+                continue
+            shots += 1
+            for task in taskGroup.children():
+                # only our tasks report back when they are done
+                if isinstance(task, ShotgunHieroObjectBase):
+                    session.register(task)
+                    if batch_job is not None:
+                        batch_job.expect(task)
+
+                # the audio of the shots is sliced out of a single bounce
+                # down of their sequence
+                if isinstance(task, ShotgunAudioExporter):
+                    item = task._audioItem()
+                    if isinstance(item, hiero.core.TrackItem):
+                        (start, end) = task._audioRange(item)
+                        audio_cache.add_range(task._sequence, start, end)
+
+        self.app.export_session = session
+        self.app.audio_cache = audio_cache
+        session.add_finalizer(audio_cache.clear)
+        session.add_finalizer(self.app.keyword_cache.clear)
+        session.add_finalizer(self.app.media_cache.clear)
+        memory_policy = self.app.memory_policy
+        session.add_finalizer(lambda: memory_policy.end_phase("the tasks"))
+
+        if self.app.tracer.enabled:
+            trace_path = os.path.join(
+                self.app.export_state_location,
+                "traces",
+                "export_%s.json" % time.strftime("%Y%m%d_%H%M%S"),
+            )
+            session.add_finalizer(lambda: self._writeTrace(trace_path))
+
+        if self.app.sg_ledger is not None:
+            self.app.sg_ledger.shots = shots
+            ledger_path = os.path.join(
+                self.app.export_state_location,
+                "ledgers",
+                "export_%s.json" % time.strftime("%Y%m%d_%H%M%S"),
+            )
+            session.add_finalizer(lambda: self._reportLedger(ledger_path))
+
+        if self.app.hook_dispatcher is not None:
+            session.add_finalizer(self._reportHookStats)
+
+        if self.app.sg_write_queue is not None:
+            session.add_finalizer(self._finishWriteQueue)
+
+    def _startWriteQueue(self):
+        """
+        Routes the writes of the export through the write queue, starting
+        the thread sending them unless the one of the previous export is
+        still running.
+        """
+        flusher = self.app.sg_write_flusher
+        if flusher is None or not flusher.resume():
+            queue = SGWriteQueue(
+                os.path.join(self.app.export_state_location, "sg_write_queue.db")
+            )
+            pending = queue.pending_count()
+            if pending:
+                self.app.log_info(
+                    "Sending %d Flow Production Tracking write(s) left over by "
+                    "a previous export." % pending
+                )
+            # the connection of the thread sending the writes is its own
+            flusher = SGWriteFlusher(queue, self._connectWriteFlusher, self.app.logger)
+            flusher.start()
+            self.app.sg_write_flusher = flusher
+        self.app.sg_write_queue = flusher.queue
+
+    def _connectWriteFlusher(self):
+        """
+        Returns the connection the queued writes are sent with, sharing the
+        rate limit of the other calls of the exports.
+        """
+        return self.app.sg_call_guard.wrap(self.app.sgtk.shotgun)
+
+    def _finishWriteQueue(self):
+        """
+        Stops queuing writes once the export is over, and lets the thread
+        sending them end once they are all sent.
+        """
+        self.app.sg_write_queue = None
+        flusher = self.app.sg_write_flusher
+        pending = flusher.queue.pending_count()
+        if pending:
+            self.app.log_info(
+                "%d Flow Production Tracking write(s) of the export are being "
+                "sent in the background." % pending
+            )
+        flusher.finish()
+
+    def _startExportJournal(self, skipped_groups):
+        """
+        Starts the journal of the steps completed by the export. When
+        resuming an interrupted export, the steps of its journal are loaded
+        and the entities they created are looked up in Flow Production
+        Tracking to make sure they still exist.
+
+        :param skipped_groups: The task groups which won't be exported.
+        """
+        self.app.export_journal = None
+        if not self.app.get_setting("journal_exports"):
+            return
+
+        properties = self._preset.properties().get("shotgunShotCreateProperties", {})
+        journal = ExportJournal(
+            os.path.join(self.app.export_state_location, "export_journal.jsonl")
+        )
+
+        if properties.get("resumeExport", False):
+            steps = journal.resume()
+            stale = journal.reconcile(self.app.shotgun)
+            self.app.log_info(
+                "Resuming the interrupted export, skipping %d step(s) already "
+                "done." % (steps - stale)
+            )
+            if stale:
+                self.app.log_info(
+                    "%d step(s) will be done again, their entities no longer "
+                    "exist in Flow Production Tracking." % stale
+                )
+        else:
+            journal.start(
+                [
+                    task_key(task)
+                    for taskGroup in self._submission.children()
+                    if taskGroup not in skipped_groups
+                    for task in taskGroup.children()
+                    if isinstance(task, ShotgunHieroObjectBase)
+                    and isinstance(getattr(task, "_item", None), hiero.core.TrackItem)
+                ]
+            )
+
+        self.app.export_journal = journal
+        self.app.export_session.add_finalizer(self._closeExportJournal)
+
+    def _closeExportJournal(self):
+        """
+        Closes the journal of the export, letting the user know when the
+        export can be resumed.
+        """
+        if self.app.export_journal.close():
+            self.app.log_info(
+                "Some tasks of the export failed. Check 'Resume Interrupted "
+                "Export' and export the same shots again to only redo the "
+                "steps which weren't completed."
+            )
+        self.app.export_journal = None
+
+    def _writeTrace(self, path):
+        """
+        Writes the timing spans of the export to a Chrome trace file.
+        """
+        self.app.tracer.write(path)
+        self.app.log_info("Export trace written to %s" % path)
+        # release the spans, the next export starts its own trace
+        self.app.tracer = NULL_TRACER
+
+    def _reportLedger(self, path):
+        """
+        Logs the summary of the api calls made by the export, and dumps them
+        to a json file if requested.
+        """
+        ledger = self.app.sg_ledger
+        self.app.log_info(
+            "Flow Production Tracking calls of the export:\n%s"
+            % ledger.format_summary()
+        )
+        if self.app.get_setting("sg_call_ledger_dump"):
+            ledger.dump(path)
+            self.app.log_info("Call ledger written to %s" % path)
+        self.app.sg_ledger = None
+
+    def _reportHookStats(self):
+        """
+        Logs the hook calls of the export and releases the hook instances.
+        """
+        self.app.log_debug(
+            "Hook calls of the export:\n%s" % self.app.hook_dispatcher.format_stats()
+        )
+        self.app.hook_dispatcher = None
+
+    def _skipUnchangedTaskGroups(self):
+        """
+        Fingerprints the track item of every task group and marks the tasks of
+        the groups which are unchanged since the last successful export as
+        skipped.
+
+        The fingerprints of the exported groups are recorded once all their
+        tasks have finished successfully. Fingerprints are always recorded,
+        so a forced full export primes the next incremental one.
+
+        :return: A list of the skipped task groups.
+        """
+        properties = self._preset.properties().get("shotgunShotCreateProperties", {})
+        skip_unchanged = properties.get("skipUnchangedShots", False)
+
+        store = ExportFingerprintStore(
+            os.path.join(self.app.cache_location, "export_fingerprints.json")
+        )
+        self.app.fingerprint_store = store
+
+        skipped_groups = []
+        for taskGroup in self._submission.children():
+            tasks = [
+                task
+                for task in taskGroup.children()
+                if isinstance(getattr(task, "_item", None), hiero.core.TrackItem)
+            ]
+            if not tasks:
+                continue
+
+            key = item_key(tasks[0]._item)
+            fingerprint = compute_fingerprint(tasks)
+
+            if skip_unchanged and store.is_unchanged(key, fingerprint):
+                self.app.log_debug("Skipping unchanged shot %s" % (key,))
+                for task in taskGroup.children():
+                    task._skip_export = True
+                    task._nothingToDo = True
+                skipped_groups.append(taskGroup)
+                continue
+
+            # only our tasks report back when they are done
+            store.track(
+                key,
+                fingerprint,
+                [task for task in tasks if isinstance(task, ShotgunHieroObjectBase)],
+            )
+
+        if skipped_groups:
+            self.app.log_info(
+                "Skipping %d shot(s) unchanged since the last export."
+                % len(skipped_groups)
+            )
+
+        return skipped_groups
+
     def _getCutData(self, hiero_sequence):
         """
         Returns a dict of cut data for the supplied hiero sequence.
@@ -589,129 +1106,105 @@ class ShotgunShotProcessor(ShotgunHieroObjectBase, FnShotProcessor.ShotProcessor
             )
             pass
 
-        # determine which revision number of the cut to create. look for an
-        # existing Cut with the sequence name with the same parent.
-        sg = self.app.shotgun
-        prev_cut = sg.find_one(
-            "Cut",
-            [["code", "is", hiero_sequence.name()], ["entity", "is", parent_entity]],
-            ["revision_number"],
-            [{"field_name": "revision_number", "direction": "desc"}],
-        )
-
-        if prev_cut is None:
-            # no matching Cut, start out at version 1
-            next_revision_number = 1
-        else:
-            # match! use the next revision number
-            next_revision_number = prev_cut["revision_number"] + 1
-
-        self._app.log_debug(
-            "The cut revision number will be %s." % (next_revision_number,)
-        )
-
         # retrieve the cut type from the processor presets
         properties = self._preset.properties().get("shotgunShotCreateProperties", {})
         cut_type = properties.get("sg_cut_type", "")
 
         # the bulk of the cut data. the rest will be populated as the individual
-        # shots are processed in the cut
+        # shots are processed in the cut, and the revision number when the
+        # cut is created, see _getCutRevisionNumber
         return {
             "project": self.app.context.project,
             "entity": parent_entity,
             "code": hiero_sequence.name(),
             "sg_cut_type": cut_type,
             "description": "",
-            "revision_number": next_revision_number,
             "fps": hiero_sequence.framerate().toFloat(),
         }
 
-    def _override_frame_server_check(self):
+    def _getCutRevisionNumber(self, cut_data):
         """
-        This method temporarily monkey patches the hiero method that checks
-        whether or not the frame server is running.
+        Returns the revision number of the Cut about to be created, the one
+        after the revision of the last Cut with the same name and parent.
 
-        We monkey patch this to allow our preview quicktimes created in the
-        transcode task to continue to be uploaded when doing individual frame
-        exports. In previous versions of Hiero, the .nk script was always
-        executed as a LocalNukeRenderTask. As of Hiero 10, a new task type is
-        used for frame exports called FrameServerRenderTask. This task type
-        renders frames in an individual frame context within Nuke and therefore
-        our quicktime write node never runs. Thus no quicktime upload for the
-        PTR Version and no thumbnail.
-
-        By overriding this method and forcing a value of ``False``, we trick
-        the Hiero shot processor internals into thinking that there is no frame
-        server running and cause it to use the fallback LocalNukeRenderTask
-        which does what we need.
-
-        This fix is a work around and given time we might consider a better
-        solution. That might include separating the preview quicktime
-        generation into a separate .nk script and transcode task.
+        :param dict cut_data: The data of the Cut, see :meth:`_getCutData`.
         """
+        prev_cut = self.app.shotgun.find_one(
+            "Cut",
+            [["code", "is", cut_data["code"]], ["entity", "is", cut_data["entity"]]],
+            ["revision_number"],
+            [{"field_name": "revision_number", "direction": "desc"}],
+        )
 
-        try:
-            # import the module containing the method to override
-            import hiero.ui.nuke_bridge.FnNsFrameServer
-
-            # keep a handle on the real method
-            self._real_frame_server_check = (
-                hiero.ui.nuke_bridge.FnNsFrameServer.isServerRunning
-            )
+        if prev_cut is None:
+            # no matching Cut, start out at version 1
+            next_revision_number = 1
+        else:
+            # match! use the next revision number
+            next_revision_number = prev_cut["revision_number"] + 1
 
-            # override the real method to always return False. i.e. The frame
-            # server is not running.
-            hiero.ui.nuke_bridge.FnNsFrameServer.isServerRunning = lambda t=1: False
-        except Exception as e:
-            # log a debug message in case something happens.
-            self._app.log_debug(
-                "Unable to override the frame server check. If exporting individual "
-                "frames, this may prevent the upload of a quicktime to PTR."
-            )
+        self._app.log_debug(
+            "The cut revision number will be %s." % (next_revision_number,)
+        )
+        return next_revision_number
 
-    def _restore_frame_server_check(self):
+    def _processCuts(self, cuts):
         """
-        Restoring the original method monkey patched in the method above.
+        Creates the Cut of each exported sequence.
 
-        See the notes there for more details.
+        The data of the Cuts is gathered first, from the main thread, as it
+        goes through the Hiero API and the get_shot hook. The Cuts of
+        different sequences are independent, so they are then created
+        concurrently, up to the number of threads set in the ``cut_threads``
+        setting.
+
+        :param cuts: A list with the sorted cut related tasks of each
+            sequence, see :meth:`_processCut`.
         """
 
-        try:
-            import hiero.ui.nuke_bridge.FnNsFrameServer
+        # make sure the data cache is ready. this code may create entities in
+        # PTR and they'll be stored here for reuse.
+        if not hasattr(self.app, "preprocess_data"):
+            self.app.preprocess_data = {}
 
-            real_fs_check = self._real_frame_server_check
+        cuts = [self._processCut(cut_related_tasks) for cut_related_tasks in cuts]
 
-            # restore the real method
-            hiero.ui.nuke_bridge.FnNsFrameServer.isServerRunning = real_fs_check
-        except Exception as e:
-            # unable to restore. likely associated with a failure to monkey
-            # patch. no need to log another message.
-            pass
+        threads = min(self.app.get_setting("cut_threads"), len(cuts))
+        if threads <= 1:
+            for sequence_name, cut_data, cut_item_data_list in cuts:
+                self._createCut(sequence_name, cut_data, cut_item_data_list)
+            return
 
+        self.app.log_debug(
+            "Creating the Cuts of %d sequences, %d at a time." % (len(cuts), threads)
+        )
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            # consume the results to raise the first failure
+            list(executor.map(lambda cut: self._createCut(*cut), cuts))
+
+    @traced("processor")
     def _processCut(self, cut_related_tasks):
-        """Collect data and create the Cut and CutItem entries for the tasks.
+        """Collect the data of the Cut and CutItem entries for the tasks.
 
-        We need to pre-create the Cut entity so that the CutItems can be
-        parented to it.
+        The Cut is created by :meth:`_createCut`, before the tasks run, so
+        that the CutItems can be parented to it.
 
         :param cut_related_tasks: A sorted list of tuples of the form:
-            (shot_updater_task, transcode_task)
+            (shot_updater_task, transcode_task), for the shots of a single
+            sequence.
+        :returns: A ``(sequence name, cut data, cut item data list)`` tuple.
         """
 
-        # make sure the data cache is ready. this code may create entities in
-        # PTR and they'll be stored here for reuse.
-        if not hasattr(self.app, "preprocess_data"):
-            self.app.preprocess_data = {}
-
         # get the hiero sequence from the first updater task's item. this would
         # be the first item in the first tuple of the list of cut related tasks.
         hiero_sequence = cut_related_tasks[0][0]._item.sequence()
+        sequence_snapshot = cut_related_tasks[0][0]._item_snapshot().sequence
 
         # the sequence fps, used to calculate timecodes for cut items
-        fps = hiero_sequence.framerate().toFloat()
+        fps = sequence_snapshot.fps
 
         # get whether sequence timecode is displayed in drop frame format
-        drop_frame = hiero_sequence.dropFrame()
+        drop_frame = sequence_snapshot.drop_frame
 
         # go ahead populate the bulk of the cut data. the first and last
         # cut items will populate the cut's in/out points.
@@ -723,16 +1216,30 @@ class ShotgunShotProcessor(ShotgunHieroObjectBase, FnShotProcessor.ShotProcessor
         # list of cut item data
         cut_item_data_list = []
 
+        # this retrieves the basic cut information from the updater tasks.
+        # cut item in/out, cut item duration, edit in/out.
+        basic_cut_item_data = [
+            shot_updater_task.get_cut_item_data()
+            for (shot_updater_task, transcode_task) in cut_related_tasks
+        ]
+
+        # translate some of the cut item data into timecodes that will also
+        # be populated in the cut items, for the whole cut at once
+        timecode_fields = ["cut_item_in", "cut_item_out", "edit_in", "edit_out"]
+        timecodes = frames_to_timecodes(
+            [data[field] for data in basic_cut_item_data for field in timecode_fields],
+            fps,
+            drop_frame,
+        )
+
         # process the tasks in order
-        for shot_updater_task, transcode_task in cut_related_tasks:
+        for index, (shot_updater_task, transcode_task) in enumerate(cut_related_tasks):
 
             # cut order was populated by the calling method to update the
             # Shot entity's cut info
             cut_order = shot_updater_task._cut_order
 
-            # this retrieves the basic cut information from the updater task.
-            # cut item in/out, cut item duration, edit in/out.
-            cut_item_data = shot_updater_task.get_cut_item_data()
+            cut_item_data = basic_cut_item_data[index]
 
             # clean out the unnecessary fields used by the shot updater
             for field in ["edit_duration", "head_in", "tail_out", "working_duration"]:
@@ -741,16 +1248,12 @@ class ShotgunShotProcessor(ShotgunHieroObjectBase, FnShotProcessor.ShotProcessor
             # add the length of this item to the full cut duration
             cut_duration += cut_item_data["cut_item_duration"]
 
-            # translate some of the cut item data into timecodes that will also
-            # be populated in the cut item
-            tc_cut_item_in = self._timecode(
-                cut_item_data["cut_item_in"], fps, drop_frame
-            )
-            tc_cut_item_out = self._timecode(
-                cut_item_data["cut_item_out"], fps, drop_frame
-            )
-            tc_edit_in = self._timecode(cut_item_data["edit_in"], fps, drop_frame)
-            tc_edit_out = self._timecode(cut_item_data["edit_out"], fps, drop_frame)
+            (
+                tc_cut_item_in,
+                tc_cut_item_out,
+                tc_edit_in,
+                tc_edit_out,
+            ) = timecodes[index * 4 : index * 4 + 4]
 
             # get the shot so that we have all we need for the cut item.
             # this may create the shot if it doesn't exist already
@@ -807,32 +1310,44 @@ class ShotgunShotProcessor(ShotgunHieroObjectBase, FnShotProcessor.ShotProcessor
         # all tasks processed, add the duration to the cut data
         cut_data["duration"] = cut_duration
 
-        # create the cut to get the id.
-        sg = self.app.shotgun
-        cut = sg.create("Cut", cut_data)
-        self._app.log_debug("Created Cut in Flow Production Tracking: %s" % (cut,))
-        self._app.log_info(
-            "Created Cut '%s' in Flow Production Tracking!" % (cut["code"],)
-        )
-
-        # make sure the cut item data dicts are updated with the cut info
-        for cut_item_data in cut_item_data_list:
-            cut_item_data["cut"] = {"id": cut["id"], "type": "Cut"}
-
-    def _timecode(self, frame, fps, drop_frame=False):
-        """Convenience wrapper to convert a given frame and fps to a timecode.
+        return (sequence_snapshot.name, cut_data, cut_item_data_list)
 
-        :param frame: Frame number
-        :param fps: Frames per seconds (float)
-        :return: timecode string
+    @traced("processor")
+    def _createCut(self, sequence_name, cut_data, cut_item_data_list):
         """
+        Creates a Cut, and links the data of its CutItems to it. Only makes
+        Flow Production Tracking calls, so it can run from any thread.
 
-        if drop_frame:
-            display_type = hiero.core.Timecode.kDisplayDropFrameTimecode
+        :param str sequence_name: The name of the sequence of the Cut.
+        :param dict cut_data: The data of the Cut, see :meth:`_processCut`.
+        :param list cut_item_data_list: The data of its CutItems.
+        """
+        # create the cut to get the id, unless the export being resumed
+        # created it already
+        journal = getattr(self.app, "export_journal", None)
+        journal_key = "%s|Cut" % (sequence_name,)
+        (done, cut) = (False, None)
+        if journal is not None:
+            (done, cut) = journal.get(journal_key, CUT_CREATED)
+
+        if done:
+            self._app.log_info("Reusing the Cut of the interrupted export: %s" % (cut,))
         else:
-            display_type = hiero.core.Timecode.kDisplayTimecode
+            cut_data["revision_number"] = self._getCutRevisionNumber(cut_data)
+            sg = self.app.shotgun
+            cut = sg.create("Cut", cut_data)
+            self._app.log_debug("Created Cut in Flow Production Tracking: %s" % (cut,))
+            self._app.log_info(
+                "Created Cut '%s' in Flow Production Tracking!" % (cut["code"],)
+            )
+            if journal is not None:
+                journal.record(
+                    journal_key, CUT_CREATED, {"type": "Cut", "id": cut["id"]}
+                )
 
-        return hiero.core.Timecode.timeToString(frame, fps, display_type)
+        # make sure the cut item data dicts are updated with the cut info
+        for cut_item_data in cut_item_data_list:
+            cut_item_data["cut"] = {"id": cut["id"], "type": "Cut"}
 
 
 class ShotgunShotProcessorPreset(
@@ -877,6 +1392,12 @@ class ShotgunShotProcessorPreset(
         # holds the cut type to use when creating Cut entires in PTR
         default_properties["sg_cut_type"] = ""
 
+        # skip the shots that are unchanged since the last successful export
+        default_properties["skipUnchangedShots"] = False
+
+        # skip the steps done by the last export, if it was interrupted
+        default_properties["resumeExport"] = False
+
         # Handle custom properties from the customize_export_ui hook.
         custom_properties = (
             self._get_custom_properties("get_shot_processor_ui_properties") or []
@@ -914,14 +1435,30 @@ class ShotgunShotProcessorPreset(
             resolver.addResolver(
                 "{%s}" % ctf["keyword"],
                 ctf["description"],
-                lambda keyword, task: self.app.execute_hook(
-                    "hook_resolve_custom_strings",
-                    keyword=keyword,
-                    task=task,
-                    base_class=HieroResolveCustomStrings,
-                ),
+                lambda keyword, task: self._resolveCustomString(keyword, task),
             )
 
+    def _resolveCustomString(self, keyword, task):
+        """
+        Returns the value of a custom keyword for a task, from the cache of
+        the export or else from the resolve custom strings hook.
+        """
+        cache = getattr(self.app, "keyword_cache", None)
+        if cache is not None:
+            (found, value) = cache.get(task, keyword)
+            if found:
+                return value
+
+        value = self.app.execute_hook(
+            "hook_resolve_custom_strings",
+            keyword=keyword,
+            task=task,
+            base_class=HieroResolveCustomStrings,
+        )
+        if cache is not None:
+            cache.update(task, {keyword: value})
+        return value
+
     def isValid(self):
         """
         This method was introduced into the base class in NukeStudio/Hiero
@@ -0,0 +1,473 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Write-ahead queue of the Flow Production Tracking writes of the exports.
+
+The writes nothing else waits for, like entity updates and uploads, are
+stored in a SQLite database in the app's cache location and sent by a
+background thread, so the exporters don't wait for the site, and don't fail
+when it is briefly unreachable. The writes are sent in the order they were
+queued, the ones the site could not be reached for are retried until it
+comes back, and the ones left over by a crash are sent by the next export.
+
+Nothing in here depends on Hiero or Toolkit.
+"""
+
+import os
+import json
+import time
+import ssl
+import shutil
+import socket
+import sqlite3
+import hashlib
+import threading
+import uuid
+import http.client
+import urllib.error
+
+# the api methods which go through the queue
+QUEUED_METHODS = ("update", "delete", "upload", "upload_thumbnail")
+
+# the methods whose third argument is the path of a file to upload
+UPLOAD_METHODS = ("upload", "upload_thumbnail")
+
+
+def is_connection_error(error):
+    """
+    Returns True if an api call failed because the site couldn't be reached,
+    rather than because the site refused the call.
+    """
+    if isinstance(
+        error,
+        (
+            ConnectionError,
+            TimeoutError,
+            socket.gaierror,
+            ssl.SSLError,
+            urllib.error.URLError,
+            http.client.HTTPException,
+        ),
+    ):
+        return True
+    # raised by the api for 5xx responses
+    return type(error).__name__ == "ProtocolError"
+
+
+class SGWriteQueue(object):
+    """
+    The writes waiting to be sent to the site, stored in a SQLite database.
+
+    Queuing a write identical to the last one waiting for the same entity
+    does nothing, so an export which is replayed doesn't send the same
+    writes twice, while a value written back after another one still is.
+    A write can also be given an idempotency key, queuing a write whose key
+    is already waiting then does nothing.
+
+    :param str path: The path of the database.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._spool = "%s.files" % os.path.splitext(path)[0]
+        self._lock = threading.Lock()
+        self._queued = threading.Condition(self._lock)
+
+        folder = os.path.dirname(path)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        # the writes are queued by the exporters and sent by the flusher
+        # thread, always under the lock
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS writes ("
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " key TEXT UNIQUE,"
+            " target TEXT,"
+            " digest TEXT,"
+            " method TEXT,"
+            " args TEXT,"
+            " kwargs TEXT,"
+            " spooled TEXT,"
+            " status TEXT DEFAULT 'pending',"
+            " attempts INTEGER DEFAULT 0,"
+            " error TEXT,"
+            " queued REAL)"
+        )
+        # the databases left over by earlier versions of the app don't
+        # identify the targets of their writes
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(writes)")]
+        for column in ("target", "digest"):
+            if column not in columns:
+                self._db.execute("ALTER TABLE writes ADD COLUMN %s TEXT" % column)
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS writes_target ON writes (target, seq)"
+        )
+        self._db.commit()
+
+    def wrap(self, shotgun):
+        """
+        Returns a :class:`QueuedShotgun` queuing the writes of a connection.
+        """
+        return QueuedShotgun(shotgun, self)
+
+    def put(self, method, args, kwargs=None, key=None):
+        """
+        Queues a write.
+
+        The files uploaded by the write are linked, or copied, to a spool
+        folder first, so the caller is free to remove them.
+
+        :param str method: The name of the api method.
+        :param tuple args: The positional arguments of the call.
+        :param dict kwargs: The keyword arguments of the call.
+        :param str key: The idempotency key of the write, if any.
+        :returns: True if the write was queued, False if an identical one was
+            already waiting.
+        """
+        args = list(args)
+        kwargs = kwargs or {}
+        (target, digest) = self._identify(method, args, kwargs)
+        spool_name = key or uuid.uuid4().hex
+
+        with self._lock:
+            if self._is_waiting(key, target, digest):
+                return False
+
+        spooled = None
+        if method in UPLOAD_METHODS:
+            spooled = self._spool_file(spool_name, args[2])
+            args[2] = spooled
+
+        with self._lock:
+            # the same write may have been queued while spooling
+            if self._is_waiting(key, target, digest):
+                self._remove_spooled({"spooled": spooled})
+                return False
+            self._db.execute(
+                "INSERT INTO writes"
+                " (key, target, digest, method, args, kwargs, spooled, queued)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    target,
+                    digest,
+                    method,
+                    json.dumps(args, default=str),
+                    json.dumps(kwargs, default=str),
+                    spooled,
+                    time.time(),
+                ),
+            )
+            self._db.commit()
+            self._queued.notify_all()
+            return True
+
+    def next(self):
+        """
+        Returns the oldest write waiting, as a dict, or None.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT seq, key, method, args, kwargs, spooled, attempts FROM writes"
+                " WHERE status = 'pending' ORDER BY seq LIMIT 1"
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "seq": row[0],
+            "key": row[1],
+            "method": row[2],
+            "args": json.loads(row[3]),
+            "kwargs": json.loads(row[4]),
+            "spooled": row[5],
+            "attempts": row[6],
+        }
+
+    def wait(self, timeout):
+        """
+        Waits until a write is queued, or the timeout expires.
+        """
+        with self._lock:
+            self._queued.wait(timeout)
+
+    def notify(self):
+        """
+        Wakes up the threads waiting for a write, see :meth:`wait`.
+        """
+        with self._lock:
+            self._queued.notify_all()
+
+    def done(self, write):
+        """
+        Removes a write which was sent, along with its spooled file.
+        """
+        with self._lock:
+            self._db.execute("DELETE FROM writes WHERE seq = ?", (write["seq"],))
+            self._db.commit()
+        self._remove_spooled(write)
+
+    def retry(self, write, error):
+        """
+        Records a failed attempt of a write, which stays first in line.
+        """
+        with self._lock:
+            self._db.execute(
+                "UPDATE writes SET attempts = attempts + 1, error = ? WHERE seq = ?",
+                (str(error), write["seq"]),
+            )
+            self._db.commit()
+
+    def fail(self, write, error):
+        """
+        Sets aside a write the site refused, so the next ones can be sent.
+        """
+        with self._lock:
+            self._db.execute(
+                "UPDATE writes SET status = 'failed', key = NULL,"
+                " attempts = attempts + 1, error = ? WHERE seq = ?",
+                (str(error), write["seq"]),
+            )
+            self._db.commit()
+        self._remove_spooled(write)
+
+    def pending_count(self):
+        """
+        Returns the number of writes waiting to be sent.
+        """
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM writes WHERE status = 'pending'"
+            ).fetchone()[0]
+
+    def failed(self):
+        """
+        Returns the ``(method, args, error)`` tuples of the writes the site
+        refused.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT method, args, error FROM writes WHERE status = 'failed'"
+                " ORDER BY seq"
+            ).fetchall()
+        return [(method, json.loads(args), error) for (method, args, error) in rows]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _identify(self, method, args, kwargs):
+        """
+        Returns the entity, or entity field, a write is for and a digest of
+        its content. The digest of an upload covers the size and modification
+        time of the file, a file written again is uploaded again.
+        """
+        target = json.dumps([method] + args[:2], default=str)
+        content = [args, kwargs]
+        if method in UPLOAD_METHODS:
+            target = json.dumps([method] + args[:2] + args[3:4], default=str)
+            if os.path.exists(args[2]):
+                stat = os.stat(args[2])
+                content.append([stat.st_size, stat.st_mtime])
+        digest = hashlib.sha1(
+            json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        return (target, digest)
+
+    def _is_waiting(self, key, target, digest):
+        """
+        Returns True if the write with the given key, or the last one for
+        the same target, is waiting with the same content.
+        """
+        if key is not None:
+            return (
+                self._db.execute(
+                    "SELECT 1 FROM writes WHERE key = ?", (key,)
+                ).fetchone()
+                is not None
+            )
+        last = self._db.execute(
+            "SELECT digest FROM writes WHERE target = ? AND status = 'pending'"
+            " ORDER BY seq DESC LIMIT 1",
+            (target,),
+        ).fetchone()
+        return last is not None and last[0] == digest
+
+    def _spool_file(self, name, path):
+        if not os.path.exists(self._spool):
+            os.makedirs(self._spool)
+        spooled = os.path.join(self._spool, "%s%s" % (name, os.path.splitext(path)[1]))
+        if os.path.exists(spooled):
+            os.remove(spooled)
+        try:
+            os.link(path, spooled)
+        except OSError:
+            # no hard links across file systems
+            shutil.copy2(path, spooled)
+        return spooled
+
+    def _remove_spooled(self, write):
+        if write["spooled"] and os.path.exists(write["spooled"]):
+            os.remove(write["spooled"])
+
+
+class QueuedShotgun(object):
+    """
+    Stands in for a connection, queuing the writes listed in
+    :data:`QUEUED_METHODS` and passing every other call through.
+
+    :param shotgun: The connection.
+    :param queue: The :class:`SGWriteQueue`.
+    """
+
+    def __init__(self, shotgun, queue):
+        self._sg = shotgun
+        self._queue = queue
+
+    def __getattr__(self, name):
+        return getattr(self._sg, name)
+
+    def update(self, entity_type, entity_id, data, **kwargs):
+        self._queue.put("update", (entity_type, entity_id, data), kwargs)
+        # what the api returns, minus the fields the site computes
+        result = dict(data)
+        result.update({"type": entity_type, "id": entity_id})
+        return result
+
+    def delete(self, entity_type, entity_id):
+        self._queue.put("delete", (entity_type, entity_id))
+        return True
+
+    def upload(self, entity_type, entity_id, path, field_name=None, **kwargs):
+        self._queue.put("upload", (entity_type, entity_id, path, field_name), kwargs)
+        return None
+
+    def upload_thumbnail(self, entity_type, entity_id, path, **kwargs):
+        self._queue.put("upload_thumbnail", (entity_type, entity_id, path), kwargs)
+        return None
+
+
+class SGWriteFlusher(object):
+    """
+    Sends the writes of a :class:`SGWriteQueue` from a background thread.
+
+    The writes are sent one at a time, in the order they were queued. When
+    the site can't be reached, the write is retried with an increasing delay
+    and the ones behind it wait, so the writes to an entity are never
+    reordered. A write the site refuses is set aside and logged.
+
+    :param queue: The :class:`SGWriteQueue`.
+    :param connect: A callable returning the connection to send the writes
+        through. It is called from the flusher thread.
+    :param logger: A standard python logger.
+    :param float retry_delay: The delay before the first retry, in seconds.
+    :param float max_retry_delay: The longest delay between two retries.
+    """
+
+    def __init__(self, queue, connect, logger, retry_delay=1.0, max_retry_delay=60.0):
+        self._queue = queue
+        self._connect = connect
+        self._logger = logger
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+        self._stop = threading.Event()
+        self._draining = False
+        self._ended = False
+        self._state_lock = threading.Lock()
+        self._thread = None
+        self.sent = 0
+
+    @property
+    def queue(self):
+        return self._queue
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="sg-write-flusher", daemon=True
+        )
+        self._thread.start()
+
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def finish(self):
+        """
+        Lets the thread end once the queue is empty.
+        """
+        with self._state_lock:
+            self._draining = True
+        self._queue.notify()
+
+    def resume(self):
+        """
+        Keeps the thread running after the queue is empty, for a new export.
+
+        :returns: False if the thread already ended, in which case a new
+            flusher is needed.
+        """
+        with self._state_lock:
+            self._draining = False
+            return self.is_alive() and not self._ended
+
+    def join(self, timeout=None):
+        """
+        Waits for the thread to end, see :meth:`finish`.
+
+        :returns: True if the thread ended.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return not self.is_alive()
+
+    def stop(self):
+        """
+        Stops the thread after the write being sent, if any. The writes left
+        are sent by the next flusher.
+        """
+        self._stop.set()
+        self._queue.notify()
+
+    def _run(self):
+        shotgun = self._connect()
+        delay = self._retry_delay
+        while not self._stop.is_set():
+            write = self._queue.next()
+            if write is None:
+                with self._state_lock:
+                    if self._draining:
+                        self._ended = True
+                        break
+                self._queue.wait(0.5)
+                continue
+
+            try:
+                getattr(shotgun, write["method"])(*write["args"], **write["kwargs"])
+            except Exception as e:
+                if is_connection_error(e):
+                    self._queue.retry(write, e)
+                    self._logger.debug(
+                        "Unable to reach Flow Production Tracking, retrying in "
+                        "%.1fs: %s" % (delay, e)
+                    )
+                    self._stop.wait(delay)
+                    delay = min(delay * 2, self._max_retry_delay)
+                    continue
+                self._queue.fail(write, e)
+                self._logger.error(
+                    "Flow Production Tracking refused %s%r: %s"
+                    % (write["method"], tuple(write["args"]), e)
+                )
+            else:
+                self._queue.done(write)
+                self.sent += 1
+            delay = self._retry_delay
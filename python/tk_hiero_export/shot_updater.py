@@ -14,7 +14,11 @@ import nuke
 from hiero.exporters import FnShotExporter
 
 from .base import ShotgunHieroObjectBase
+from .tracing import traced
 from .collating_exporter import CollatingExporter
+from .export_journal import SHOT_UPDATED, CUT_ITEM_CREATED
+from .timecode import frame_to_timecode, frames_to_timecodes
+from .cut_math import INPUT_COLUMNS, compute_cut_math, cut_math_rows
 
 from . import (
     HieroGetShot,
@@ -36,117 +40,82 @@ class ShotgunShotUpdater(
         FnShotExporter.ShotTask.__init__(self, initDict)
         CollatingExporter.__init__(self)
         self._cut_order = None
+        self._cut_info = None
 
-        fw = self.app.frameworks['tk-framework-nozon']
-        self.csp = fw.import_module("colorspace")
+    @classmethod
+    def compute_cut_item_data(cls, tasks):
+        """
+        Computes the cut information of a list of shot updater tasks at once,
+        and caches it on each task for :meth:`get_cut_item_data`.
+
+        :param list tasks: The :class:`ShotgunShotUpdater` tasks.
+        """
+        columns = dict((name, []) for name in INPUT_COLUMNS)
+        for task in tasks:
+            for name, value in task._cut_math_inputs().items():
+                columns[name].append(value)
+
+        for task, cut_info in zip(tasks, cut_math_rows(compute_cut_math(columns))):
+            if cut_info["cut_item_duration"] != cut_info["edit_duration"]:
+                task.app.log_warning(
+                    "It looks like the shot %s has a retime applied. PTR cuts do "
+                    "not support retimes." % (task.clipName(),)
+                )
+            task._cut_info = cut_info
 
     def get_cut_item_data(self):
         """
         Return some computed values for use when creating cut items.
 
-        The values correspond to the exported version created on disk.
+        The values correspond to the exported version created on disk. They
+        are computed once, by the shot processor for all the shots of the
+        export or by the task itself otherwise.
         """
+        if self._cut_info is None:
+            self.compute_cut_item_data([self])
+        return dict(self._cut_info)
 
-        (head_in, tail_out) = self.collatedOutputRange(clampToSource=False) # these values are not correct for negative retimed shots, I'm overriding these, see below
-
-        handles = self._cutHandles if self._cutHandles is not None else 0
-        in_handle = handles
-        out_handle = handles
-
-        # get the frame offset specified in the export options
-        startFrame = self._startFrame or 0
-
-        # these are the source in/out frames. we'll use them to determine if we
-        # have enough frames to account for the handles. versions of
-        # hiero/nukestudio handle missing handles differently
-        source_in = int(self._item.sourceIn())
-        source_out = int(self._item.sourceOut())
-
-        if self._has_nuke_backend() and source_in < in_handle:
-            # newer versions of the hiero/nukestudio. no black frames will be
-            # written to disk for the head when not enough source for the in
-            # handle. the in/out should be correct. but the start handle is
-            # limited by the in value. the source in point is within the
-            # specified handles.
-            in_handle = source_in
-
-            # NOTE: even new versions of hiero/nukestudio will write black
-            # frames for insuffient tail handles. so we don't need to account
-            # for that case here.
-
-        # "cut_length" is a boolean set on the updater by the shot processor.
-        # it signifies whether the transcode task will write the cut length
-        # to disk (True) or if it will write the full source to disk (False)
-        if self.is_cut_length_export():
-            cut_in = head_in + in_handle
-            cut_out = tail_out - out_handle
-        else:
-            # cut_in = source_in + self._item.source().sourceIn()
-            # cut_out = source_out + self._item.source().sourceIn()
-            cut_in = source_in
-            cut_out = source_out
-
-            # account for any custom start frame
-            cut_in += startFrame
-            cut_out += startFrame
-
-        '''
-        Donat : overriding cut info because I get incorrect results for negative retimed shots
-        In the case of a cut lenght export with hanldes and a custom start frame 
-        '''
-        if self._startFrame and self._cutHandles and self.is_cut_length_export():
-            head_in = startFrame
-            cut_in = startFrame + in_handle
-            cut_out = cut_in + self._item.duration() - 1
-            tail_out = cut_out + out_handle
-            self.app.log_debug('Donat : overriding cut info with values : '
-                            'head_in=%s, cut_in=%s, cut_out=%s, tail_out=%s' % (head_in, cut_in, cut_out, tail_out))
-
-
-
-        # get the edit in/out points from the timeline
-        edit_in = self._item.timelineIn()
-        edit_out = self._item.timelineOut()
-
-        # account for custom start code in the hiero timeline
-        seq = self._item.sequence()
-        edit_in += seq.timecodeStart()
-        edit_out += seq.timecodeStart()
-
-        cut_duration = cut_out - cut_in + 1
-        edit_duration = edit_out - edit_in + 1
-
-        if cut_duration != edit_duration:
-            self.app.log_warning(
-                "It looks like the shot %s has a retime applied. PTR cuts do "
-                "not support retimes." % (self.clipName(),)
-            )
-
-        working_duration = tail_out - head_in + 1
+    def _cut_math_inputs(self):
+        """
+        Returns the values of the cut math columns for the shot of this task,
+        see :mod:`cut_math`.
+        """
+        # these values are not correct for negative retimed shots, they are
+        # overridden by the cut math
+        (head_in, tail_out) = self.collatedOutputRange(clampToSource=False)
 
+        snapshot = self._item_snapshot()
         if not self._has_nuke_backend() and self.isCollated():
-            # undo the offset that is automatically added when collating.
-            # this is only required in older versions of hiero
-            head_in -= self.HEAD_ROOM_OFFSET
-            tail_out -= self.HEAD_ROOM_OFFSET
+            # the offset automatically added when collating. this is only
+            # required in older versions of hiero
+            head_room_offset = self.HEAD_ROOM_OFFSET
+        else:
+            head_room_offset = 0
 
-        # return the computed cut information
         return {
-            "cut_item_in": cut_in,
-            "cut_item_out": cut_out,
-            "cut_item_duration": cut_duration,
-            "edit_in": edit_in,
-            "edit_out": edit_out,
-            "edit_duration": edit_duration,
             "head_in": head_in,
             "tail_out": tail_out,
-            "working_duration": working_duration,
+            "source_in": snapshot.source_in,
+            "source_out": snapshot.source_out,
+            "duration": snapshot.duration,
+            "timeline_in": snapshot.timeline_in,
+            "timeline_out": snapshot.timeline_out,
+            "timecode_start": snapshot.sequence.timecode_start,
+            "handles": self._cutHandles if self._cutHandles is not None else 0,
+            "start_frame": self._startFrame or 0,
+            "cut_length": bool(self.is_cut_length_export()),
+            # versions of hiero/nukestudio handle missing handles differently
+            "clamp_in_handle": self._has_nuke_backend(),
+            "head_room_offset": head_room_offset,
         }
 
+    @traced()
     def finishTask(self):
-        FnShotExporter.ShotTask.finishTask(self)
-        CollatingExporter.finishTask(self)
+        with self._finishing_task():
+            FnShotExporter.ShotTask.finishTask(self)
+            CollatingExporter.finishTask(self)
 
+    @traced()
     def taskStep(self):
         """
         Execution payload.
@@ -155,7 +124,10 @@ class ShotgunShotUpdater(
         if self.isCollated() and not self.isHero():
             return False
 
-        
+        # nothing to do for shots skipped by the shot processor
+        if self._is_skipped_export():
+            return False
+
         # execute base class
         FnShotExporter.ShotTask.taskStep(self)
 
@@ -179,7 +151,7 @@ class ShotgunShotUpdater(
 
 
         # Donat : only update the shot info on SG if the item has the correct tag defined in the settings of the app
-        tags_names_list = [ tag.name() for tag in self._item.tags() ]
+        tags_names_list = self._item_snapshot().tag_names
         shot_update_tag = self.app.get_setting("shot_update_tag")
         if not shot_update_tag in tags_names_list:
 
@@ -290,9 +262,13 @@ class ShotgunShotUpdater(
         sg_shot["sg_working_duration"] = working_duration
 
         # Donat : add source cut in timecode and frame start
-        sg_shot["sg_source_start_timecode"] = self.get_source_in_timecode(self._item)
+        sg_shot["sg_source_start_timecode"] = self.get_source_in_timecode(
+            self._item_snapshot()
+        )
         sg_shot["sg_source_start_frame"] = cut_in
-        rec_in_timecode, rec_out_timecode = self.get_record_timecodes(self._item)
+        rec_in_timecode, rec_out_timecode = self.get_record_timecodes(
+            self._item_snapshot()
+        )
         sg_shot["sg_record_in_timecode"] = rec_in_timecode
         sg_shot["sg_record_out_timecode"] = rec_out_timecode
 
@@ -313,8 +289,7 @@ class ShotgunShotUpdater(
             self.app.log_debug("The 'tk-hiero-tags' app is not running. Will not send tags to SG")
 
         # Determine the camera colorspace, starting by getting the colorspace of the hiero track item
-        read_node = self._item.source().readNode()
-        camera_colorspace = self.csp.ColorSpace().get_read_colorspace_name(read_node)
+        camera_colorspace = self._get_source_media(self._item.source()).colorspace
 
         # Shotlook app
         shotlook_app = self.app.engine.apps.get("tk-nukestudio-shotlook")
@@ -333,7 +308,9 @@ class ShotgunShotUpdater(
                     self.app.log_debug("Exported CDL file on disk")
 
         # fetch valid values configured on the sg_camera_colorspace
-        valid_shotgun_colorspaces = self.app.shotgun.schema_field_read('Shot', 'sg_camera_colorspace')['sg_camera_colorspace']['properties']['valid_values']['value']
+        valid_shotgun_colorspaces = self._get_schema_valid_values(
+            "Shot", "sg_camera_colorspace"
+        )
         if camera_colorspace in valid_shotgun_colorspaces:
             sg_shot["sg_camera_colorspace"] = camera_colorspace
         else:
@@ -343,9 +320,9 @@ class ShotgunShotUpdater(
         # get status from the hiero tags
         status = None
         status_map = dict(self._preset.properties()["sg_status_hiero_tags"])
-        for tag in self._item.tags():
-            if tag.name() in status_map:
-                status = status_map[tag.name()]
+        for tag_name in self._item_snapshot().tag_names:
+            if tag_name in status_map:
+                status = status_map[tag_name]
                 break
         if status:
             sg_shot["sg_status_list"] = status
@@ -353,42 +330,34 @@ class ShotgunShotUpdater(
         # get task template from the tags
         template = None
         template_map = dict(self._preset.properties()["task_template_map"])
-        for tag in self._item.tags():
-            if tag.name() in template_map:
-                template = self.app.tank.shotgun.find_one(
-                    "TaskTemplate",
-                    [
-                        ["entity_type", "is", shot_type],
-                        ["code", "is", template_map[tag.name()]],
-                    ],
-                )
+        for tag_name in self._item_snapshot().tag_names:
+            if tag_name in template_map:
+                template = self._find_task_template(shot_type, template_map[tag_name])
                 break
 
         # if there are no associated, assign default template...
         if template is None:
             default_template = self.app.get_setting("default_task_template")
             if default_template:
-                template = self.app.tank.shotgun.find_one(
-                    "TaskTemplate",
-                    [
-                        ["entity_type", "is", shot_type],
-                        ["code", "is", default_template],
-                    ],
-                )
+                template = self._find_task_template(shot_type, default_template)
 
         if template is not None:
             sg_shot["task_template"] = template
 
-        # commit the changes and update the thumbnail
-        self.app.execute_hook_method(
-            "hook_update_shot",
-            "update_shotgun_shot_entity",
-            entity_type=shot_type,
-            entity_id=shot_id,
-            entity_data=sg_shot,
-            preset_properties=self._preset.properties(),
-            base_class=HieroUpdateShot,
-        )
+        # commit the changes and update the thumbnail, unless the export
+        # being resumed did already
+        (shot_updated, _) = self._journaled(SHOT_UPDATED)
+        if not shot_updated:
+            self.app.execute_hook_method(
+                "hook_update_shot",
+                "update_shotgun_shot_entity",
+                entity_type=shot_type,
+                entity_id=shot_id,
+                entity_data=sg_shot,
+                preset_properties=self._preset.properties(),
+                base_class=HieroUpdateShot,
+            )
+            self._journal(SHOT_UPDATED, {"type": shot_type, "id": shot_id})
 
         # create the directory structure
         self.app.execute_hook_method(
@@ -409,7 +378,15 @@ class ShotgunShotUpdater(
         # create the CutItem with the data populated by the shot processor
         cut = None
 
-        if hasattr(self, "_cut_item_data"):
+        (cut_item_created, cut_item) = self._journaled(CUT_ITEM_CREATED)
+        if (
+            cut_item_created
+            and hasattr(self, "_cut_item_data")
+            and cut_item["cut"]["id"] == self._cut_item_data["cut"]["id"]
+        ):
+            # created by the export being resumed, in the same Cut
+            self._cut_item_data.update(cut_item)
+        elif hasattr(self, "_cut_item_data"):
             cut_item_data = self._cut_item_data
             cut_item = self.app.execute_hook_method(
                 "hook_update_cuts",
@@ -426,6 +403,14 @@ class ShotgunShotUpdater(
                 self._cut_item_data.update(cut_item)
 
                 cut = cut_item["cut"]
+                self._journal(
+                    CUT_ITEM_CREATED,
+                    {
+                        "type": "CutItem",
+                        "id": cut_item["id"],
+                        "cut": {"type": "Cut", "id": cut["id"]},
+                    },
+                )
 
         # see if this task has been designated to update the Cut thumbnail
         if cut and hasattr(self, "_create_cut_thumbnail"):
@@ -453,36 +438,43 @@ class ShotgunShotUpdater(
         """
         return hasattr(self, "_cut_length") and self._cut_length
 
-    def get_source_in_timecode(self, trackItem):
+    def get_source_in_timecode(self, snapshot):
         """
         Gets the clips source timecode for the first visible frame
         WARNING : This is not correct when a TimeWarp soft effect is applied on the clip
         (NukeStudio's spreadsheet view is also not correct in that case)
+
+        :param snapshot: The :class:`TrackItemSnapshot` of the track item.
         """
 
-        fps = trackItem.parent().parent().framerate()
-        clip = trackItem.source()
-        clipstartTimeCode = int(round(clip.timecodeStart()))
-        timeCodeOffset = int(round(trackItem.sourceIn()))
-        source_in_timecode = hiero.core.Timecode.timeToString(clipstartTimeCode+timeCodeOffset, fps, hiero.core.Timecode.kDisplayTimecode)
+        fps = snapshot.sequence.framerate
+        clipstartTimeCode = int(round(snapshot.source_timecode_start))
+        timeCodeOffset = int(round(snapshot.source_in))
+        source_in_timecode = frame_to_timecode(clipstartTimeCode + timeCodeOffset, fps)
 
         return source_in_timecode
 
 
-    def get_record_timecodes(self, trackItem):
+    def get_record_timecodes(self, snapshot):
         """
         Gets the clips record in and record out timecode
+
+        :param snapshot: The :class:`TrackItemSnapshot` of the track item.
         """
 
-        timeline = trackItem.parentSequence()
-        timeline_fps = timeline.framerate()
-        timeline_frame_start = timeline.timecodeStart()
+        timeline_fps = snapshot.sequence.framerate
+        timeline_frame_start = snapshot.sequence.timecode_start
 
-        clip_timeline_in = trackItem.timelineIn()
-        clip_timeline_out = trackItem.timelineOut()
+        clip_timeline_in = snapshot.timeline_in
+        clip_timeline_out = snapshot.timeline_out
 
-        rec_in_timecode = hiero.core.Timecode.timeToString((clip_timeline_in + timeline_frame_start), timeline_fps, hiero.core.Timecode.kDisplayTimecode)
-        rec_out_timecode = hiero.core.Timecode.timeToString((clip_timeline_out + timeline_frame_start + 1), timeline_fps, hiero.core.Timecode.kDisplayTimecode)
+        (rec_in_timecode, rec_out_timecode) = frames_to_timecodes(
+            [
+                clip_timeline_in + timeline_frame_start,
+                clip_timeline_out + timeline_frame_start + 1,
+            ],
+            timeline_fps,
+        )
 
 
         return (rec_in_timecode, rec_out_timecode)
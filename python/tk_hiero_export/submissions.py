@@ -0,0 +1,33 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+from hiero.exporters.FnSubmission import Submission
+
+from .base import ShotgunHieroObjectBase
+
+
+class ShotgunDeadlineSubmission(ShotgunHieroObjectBase, Submission):
+    """
+    The Deadline submission registered with Nuke Studio.
+
+    The Deadline submission pulls in the whole Qt namespace, so its module is
+    only imported when an export is submitted to Deadline: creating an
+    instance of this class imports it and returns a
+    :class:`ShotgunDeadlineRenderSubmission`, which derives from it.
+    """
+
+    kNukeRender = "deadline_submission"
+
+    def __new__(cls, *args, **kwargs):
+        if cls is ShotgunDeadlineSubmission:
+            from .deadline_submission import ShotgunDeadlineRenderSubmission
+
+            cls = ShotgunDeadlineRenderSubmission
+        return super(ShotgunDeadlineSubmission, cls).__new__(cls)
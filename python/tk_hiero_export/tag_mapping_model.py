@@ -0,0 +1,143 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+from sgtk.platform.qt import QtGui, QtCore
+
+
+class TagMappingModel(QtCore.QAbstractTableModel):
+    """
+    Table model mapping Hiero tags to values of the shot processor
+    properties, one column per property.
+
+    The rows are handed to the view a batch at a time as it scrolls, and the
+    mapping is written back to the properties as soon as a value is edited.
+    """
+
+    # number of rows handed to the view at a time
+    BATCH_SIZE = 100
+
+    def __init__(self, tags, labels, keys, values, properties, parent=None):
+        """
+        :param list tags: The (name, icon) pairs of the tags, one per row.
+        :param list labels: The header labels of the property columns.
+        :param list keys: The property keys, one per column.
+        :param list values: The list of valid values, one per column.
+        :param dict properties: The properties the mapping is kept in, as
+            lists of (tag name, value) pairs.
+        """
+        QtCore.QAbstractTableModel.__init__(self, parent)
+        self._tags = tags
+        self._labels = ["Hiero Tags"] + list(labels)
+        self._keys = keys
+        self._values = values
+        self._properties = properties
+        self._mappings = [dict(properties[key]) for key in keys]
+        self._row_count = 0
+
+    def values(self, column):
+        """
+        Returns the valid values of a property column.
+        """
+        return self._values[column - 1]
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._labels)
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._row_count < len(self._tags)
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.BATCH_SIZE, len(self._tags) - self._row_count)
+        if count <= 0:
+            return
+        self.beginInsertRows(
+            QtCore.QModelIndex(), self._row_count, self._row_count + count - 1
+        )
+        self._row_count += count
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self._labels[section]
+        return None
+
+    def flags(self, index):
+        flags = QtCore.Qt.ItemIsEnabled
+        if index.column() > 0:
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        (name, icon) = self._tags[index.row()]
+        column = index.column()
+        if column == 0:
+            if role == QtCore.Qt.DisplayRole:
+                return name
+            if role == QtCore.Qt.DecorationRole:
+                return icon
+            return None
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return self._mappings[column - 1].get(name) or ""
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if role != QtCore.Qt.EditRole or index.column() == 0:
+            return False
+        (name, icon) = self._tags[index.row()]
+        column = index.column() - 1
+        mapping = self._mappings[column]
+        mapping[name] = value and str(value) or None
+        self._properties[self._keys[column]] = [
+            (k, v) for (k, v) in mapping.items() if v
+        ]
+        self.dataChanged.emit(index, index)
+        return True
+
+
+class TagMappingDelegate(QtGui.QStyledItemDelegate):
+    """
+    Edits the property columns of a :class:`TagMappingModel` with a combo box
+    of their valid values. The combo box only exists while a cell is edited.
+    """
+
+    def createEditor(self, parent, option, index):
+        combo = QtGui.QComboBox(parent)
+        combo.addItem("")
+        combo.addItems(index.model().values(index.column()))
+        # commit as soon as a value is picked rather than on focus out
+        combo.activated[int].connect(lambda _: self._commit(combo))
+        return combo
+
+    def setEditorData(self, editor, index):
+        value = index.model().data(index, QtCore.Qt.EditRole)
+        editor.setCurrentIndex(max(editor.findText(value), 0))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), QtCore.Qt.EditRole)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
+
+    def _commit(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor, QtGui.QAbstractItemDelegate.NoHint)
@@ -0,0 +1,97 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Conversion of frame numbers to SMPTE timecodes, a whole list at a time.
+
+The conversion gives the same strings as ``hiero.core.Timecode.timeToString``
+with the ``kDisplayTimecode`` and ``kDisplayDropFrameTimecode`` display
+types, without a round trip through the Hiero API for every frame. The
+divisions only depend on the frame rate, so they are worked out once per
+call rather than once per frame.
+
+Nothing in here depends on Hiero.
+"""
+
+# the two digit fields, by value
+_DIGITS = ["%02d" % i for i in range(100)]
+
+
+def _nominal_fps(fps):
+    """
+    Returns the whole number of frames counted per second of timecode, for
+    a ``hiero.core.TimeBase`` or a float.
+    """
+    if hasattr(fps, "toFloat"):
+        fps = fps.toFloat()
+    return int(round(fps))
+
+
+def frames_to_timecodes(frames, fps, drop_frame=False):
+    """
+    Converts frame numbers to timecodes.
+
+    Drop frame timecodes are only used for the 29.97 and 59.94 frame rates,
+    as done by Hiero, the timecodes of the other frame rates are always non
+    drop frame.
+
+    :param frames: An iterable of frame numbers.
+    :param fps: The frame rate, a ``hiero.core.TimeBase`` or a float.
+    :param bool drop_frame: Whether to give drop frame timecodes.
+    :returns: A list of timecode strings, in the order of the frames.
+    """
+    nominal = _nominal_fps(fps)
+    if nominal <= 0:
+        raise ValueError("Invalid frame rate: %s" % (fps,))
+    frames = [int(frame) for frame in frames]
+
+    separator = ":"
+    if drop_frame and nominal in (30, 60):
+        # two (or four) frame numbers are dropped every minute, except
+        # every tenth minute
+        separator = ";"
+        drop = nominal // 15
+        per_ten_minutes = nominal * 600 - drop * 9
+        per_minute = nominal * 60 - drop
+        counted = []
+        for frame in frames:
+            (tens, rest) = divmod(frame, per_ten_minutes)
+            frame += drop * 9 * tens
+            if rest > drop:
+                frame += drop * ((rest - drop) // per_minute)
+            counted.append(frame)
+        frames = counted
+
+    digits = _DIGITS
+    per_hour = nominal * 3600
+    per_minute = nominal * 60
+    timecodes = []
+    for frame in frames:
+        (hours, frame) = divmod(frame, per_hour)
+        (minutes, frame) = divmod(frame, per_minute)
+        (seconds, frame) = divmod(frame, nominal)
+        timecodes.append(
+            "%s:%s:%s%s%s"
+            % (
+                digits[hours % 24],
+                digits[minutes],
+                digits[seconds],
+                separator,
+                digits[frame] if frame < 100 else str(frame),
+            )
+        )
+    return timecodes
+
+
+def frame_to_timecode(frame, fps, drop_frame=False):
+    """
+    Converts a frame number to a timecode, see :func:`frames_to_timecodes`.
+    """
+    return frames_to_timecodes([frame], fps, drop_frame)[0]
@@ -0,0 +1,133 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Timing spans of an export, written in the Chrome trace event format.
+
+The resulting file can be opened in chrome://tracing or https://ui.perfetto.dev
+to see where the wall time of an export goes.
+"""
+
+import os
+import json
+import time
+import functools
+import threading
+import contextlib
+
+
+class ChromeTracer(object):
+    """
+    Records complete ("X") trace events.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self._events = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def span(self, name, category="export", **args):
+        """
+        Context manager recording the time spent in its block.
+
+        :param str name: The name of the span.
+        :param str category: The category of the span, used for filtering in
+            the trace viewer.
+        :param args: Extra values shown with the span.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": self._pid,
+                "tid": threading.current_thread().ident,
+            }
+            if args:
+                event["args"] = args
+            with self._lock:
+                self._events.append(event)
+
+    def write(self, path):
+        """
+        Writes the recorded events to a trace file.
+        """
+        folder = os.path.dirname(path)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        with self._lock:
+            events = list(self._events)
+        with open(path, "w") as fh:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fh)
+
+
+class NullTracer(object):
+    """
+    Tracer used when tracing is disabled. Records nothing.
+    """
+
+    enabled = False
+
+    def span(self, name, category="export", **args):
+        return _NULL_SPAN
+
+    def write(self, path):
+        pass
+
+
+_NULL_SPAN = contextlib.nullcontext()
+
+NULL_TRACER = NullTracer()
+
+
+def traced(category="task"):
+    """
+    Decorator recording a span around a method of one of our Hiero objects,
+    named after the class and the method.
+
+    The tracer is looked up on the app, so the check is a single attribute
+    lookup when tracing is disabled.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            tracer = getattr(self.app, "tracer", NULL_TRACER)
+            if not tracer.enabled:
+                return method(self, *args, **kwargs)
+
+            name = "%s.%s" % (self.__class__.__name__, method.__name__)
+            with tracer.span(name, category, item=_item_name(self)):
+                return method(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _item_name(obj):
+    """
+    Returns the name of the item a task is exporting, if any.
+    """
+    try:
+        return obj._item.name()
+    except Exception:
+        return None
@@ -13,7 +13,9 @@ import ast
 import sys
 import shutil
 import tempfile
+import time
 import inspect
+import subprocess
 
 from hiero.exporters import FnExternalRender
 from hiero.exporters import FnTranscodeExporter
@@ -21,7 +23,6 @@ from hiero.exporters import FnTranscodeExporterUI
 
 import hiero
 from hiero import core
-from hiero.core import *
 import hiero.core.nuke as nuke
 
 import tank
@@ -29,7 +30,18 @@ import sgtk.util
 from sgtk.platform.qt import QtGui, QtCore
 
 from .base import ShotgunHieroObjectBase
+from .tracing import traced
 from .collating_exporter import CollatingExporter, CollatedShotPreset
+from .plate_registry import compute_plate_key, frame_path, is_frame_sequence
+from .export_journal import (
+    RENDER_DONE,
+    PUBLISH_REGISTERED,
+    VERSION_CREATED,
+    UPLOAD_DONE,
+)
+from .memory_policy import compress_thumbnail
+
+from tank.errors import TankHookMethodDoesNotExistError
 
 from . import (
     HieroGetQuicktimeSettings,
@@ -40,6 +52,23 @@ from . import (
 )
 
 
+def _nuke_executable():
+    """
+    Returns the path of the Nuke executable the review movies are rendered
+    with, or None if it can't be found.
+    """
+    try:
+        return hiero.core.nukeExecutable()
+    except AttributeError:
+        pass
+    try:
+        import nuke as nuke_module
+
+        return nuke_module.EXE_PATH
+    except (ImportError, AttributeError):
+        return None
+
+
 class ShotgunTranscodeExporterUI(ShotgunHieroObjectBase, FnTranscodeExporterUI.TranscodeExporterUI):
     """
     Custom Preferences UI for the shotgun transcoder
@@ -123,10 +152,6 @@ class ShotgunTranscodeExporter(
     Create Transcode object and send to Shotgun
     """
 
-    # This is an arbitrarily named label we will use as a SetNode id,
-    # which can then be later used to connect a PushNode to
-    _write_set_node_label = "SG_Write_Attachment"
-
     def __init__(self, initDict):
         """Constructor"""
         FnTranscodeExporter.TranscodeExporter.__init__(self, initDict)
@@ -137,26 +162,23 @@ class ShotgunTranscodeExporter(
         self._thumbnail = None
         self._quicktime_path = None
         self._temp_quicktime = None
-
-    def addWriteNodeToScript(self, script, rootNode, framerate):
-        """
-        Override the default addWriteNodeToScript functionality so that we can add a SetNode before
-        the default writenodes get added to the script. The SetNode will allow us to later push our mov writenode
-        to this point so that it get parented correctly.
-        """
-        self.app.log_debug("Adding SetNode before base write node gets added")
-        # Add the SetNode before the write nodes are added.
-        set_command = nuke.SetNode(self._write_set_node_label, 0)
-        script.addNode(set_command)
-
-        super(ShotgunTranscodeExporter, self).addWriteNodeToScript(
-            script, rootNode, framerate
-        )
-
+        self._preview_started = False
+        self._preview_process = None
+        self._preview_start_time = None
+        self._plate_key = None
+        self._plate_range = None
+        self._plate_reused = False
+        self._start_held_back = False
+
+    @traced()
     def buildScript(self):
         """
-        Override the default buildScript functionality to also output a temp movie
-        file if needed for uploading to Shotgun
+        Override the default buildScript functionality to make sure movie
+        outputs have an encoder set.
+
+        The review movie uploaded to Shotgun is not part of this script, it is
+        rendered from the plate's frames by a separate Nuke process once the
+        plate is done. See :meth:`_start_preview_render`.
         """
 
         # This is a bit of a hack to account for some changes to the
@@ -175,31 +197,40 @@ class ShotgunTranscodeExporter(
         FnTranscodeExporter.TranscodeExporter.buildScript(self)
         self.app.log_debug("Transcode base script built")
 
-        # If we are not creating a version then we do not need the extra node
+    def _prepare_preview_movie(self):
+        """
+        Decides where the review movie uploaded to the Version comes from.
+
+        Movie outputs are uploaded as is. For other outputs a temporary movie
+        is rendered from the plate's frames once they are written.
+        """
+        self._quicktime_path = None
+        self._temp_quicktime = None
+
+        # If we are not creating a version then we do not need a movie
         if not self._preset.properties()["create_version"]:
             return
 
-        if file_type in ["mov", "ffmpeg"]:
+        if self._preset.properties()["file_type"] in ["mov", "ffmpeg"]:
             # already outputting a mov file, use that for upload
-            self._quicktime_path = self.resolvedExportPath()
+            self._quicktime_path = self._resolved_export_path
             self._temp_quicktime = False
             return
 
         self._quicktime_path = os.path.join(tempfile.mkdtemp(), "preview.mov")
         self._temp_quicktime = True
-        nodeName = "PTR Screening Room Media"
 
-        framerate = None
-        if self._sequence:
-            framerate = self._sequence.framerate()
-        if self._clip.framerate().isValid():
-            framerate = self._clip.framerate()
+    def _create_preview_write_node(self, framerate):
+        """
+        Creates the write node of the review movie, using the settings of the
+        get_quicktime_settings hook.
+        """
+        nodeName = "PTR Screening Room Media"
 
         preset = FnTranscodeExporter.TranscodePreset(
             "Qt Write", self._preset.properties()
         )
 
-        # insert the write node to generate the quicktime
         file_type, properties = self.app.execute_hook(
             "hook_get_quicktime_settings",
             for_shotgun=True,
@@ -243,14 +274,146 @@ class ShotgunTranscodeExporter(
                 framerate=framerate,
                 project=self._project,
             )
-        mov_write_node = FnExternalRender.createWriteNode(**kwargs)
+        return FnExternalRender.createWriteNode(**kwargs)
+
+    @traced("render")
+    def _start_preview_render(self):
+        """
+        Starts rendering the review movie from the plate's frames.
+
+        The movie is rendered by its own script in a separate Nuke process
+        rather than by an extra write node in the plate's script. This lets
+        Hiero render the plate on the frame server, which only executes the
+        plate's write node.
+
+        :returns: The subprocess.Popen of the render, or None if there is no
+            movie to render.
+        """
+        if not self._temp_quicktime or self.error():
+            return None
+
+        if self._submission.kNukeRender == "deadline_submission":
+            # the plate is rendered on the farm, its frames don't exist yet
+            return None
+
+        executable = _nuke_executable()
+        if executable is None:
+            self.app.log_warning(
+                "Unable to find the Nuke executable, skipping the review movie."
+            )
+            return None
 
-        # We create a push node and connect it to the set node we created just before the base write node was created
-        # This means that our write node will parent to the same node the base write node gets parented to.
-        push_command = nuke.PushNode(self._write_set_node_label)
-        self._script.addNode(push_command)
+        (first, last) = self.outputRange()
+        if not os.path.exists(frame_path(self._resolved_export_path, first)):
+            self.app.log_warning(
+                "No frames found at %s, skipping the review movie."
+                % self._resolved_export_path
+            )
+            return None
+
+        framerate = None
+        if self._sequence:
+            framerate = self._sequence.framerate()
+        if self._clip.framerate().isValid():
+            framerate = self._clip.framerate()
+
+        script = nuke.ScriptWriter()
+        script.addNode(nuke.RootNode(first, last, framerate))
+
+        read_node = nuke.ReadNode(
+            self._resolved_export_path.replace(os.path.sep, "/"),
+            firstFrame=first,
+            lastFrame=last,
+        )
+        # read the frames back in the colourspace they were written in
+        colourspace = self._preset.properties().get("colourspace")
+        if colourspace and colourspace != "default":
+            read_node.setKnob("colorspace", colourspace)
+        script.addNode(read_node)
+
+        # scale the review movie down, there is no point encoding and
+        # uploading it at the plate's resolution
+        max_width = self._get_review_settings().get("max_width")
+        if max_width:
+            script.addNode(
+                nuke.Node(
+                    "Reformat",
+                    type="scale",
+                    scale="{{min(1, %d / input.width)}}" % max_width,
+                    filter="Lanczos4",
+                )
+            )
+
+        script.addNode(self._create_preview_write_node(framerate))
+
+        preview_dir = os.path.dirname(self._quicktime_path)
+        script_path = os.path.join(preview_dir, "preview.nk")
+        script.writeToDisk(script_path)
+
+        args = [executable, "-x", "-F", "%d-%d" % (first, last), script_path]
+        self.app.log_debug("Rendering review movie: %s" % " ".join(args))
+        self._preview_start_time = time.time()
+        with open(os.path.join(preview_dir, "preview.log"), "w") as log_file:
+            return subprocess.Popen(args, stdout=log_file, stderr=subprocess.STDOUT)
+
+    def _finish_preview_render(self):
+        """
+        Checks the outcome of the review movie render. A failed render only
+        means the Version gets no uploaded movie.
+        """
+        process = self._preview_process
+        if process is None:
+            return
+
+        if process.wait() != 0:
+            log_path = os.path.join(
+                os.path.dirname(self._quicktime_path), "preview.log"
+            )
+            with open(log_path, "r") as log_file:
+                output = log_file.read()
+            self.app.log_warning(
+                "Unable to render the review movie for %s:\n%s"
+                % (self._resolved_export_path, output[-2000:])
+            )
+            if os.path.exists(self._quicktime_path):
+                os.remove(self._quicktime_path)
+            return
+
+        self.app.log_info(
+            "Encoded review movie for %s in %.1fs, %.1f MB"
+            % (
+                self._resolved_export_path,
+                time.time() - self._preview_start_time,
+                os.path.getsize(self._quicktime_path) / (1024.0 * 1024.0),
+            )
+        )
+
+    def _get_review_settings(self):
+        """
+        Returns the review movie settings of the get_quicktime_settings hook.
+        No base class is given, so that hooks overridden before the method
+        existed don't inherit the default maximum width.
+        """
+        try:
+            return self.app.execute_hook_method(
+                "hook_get_quicktime_settings",
+                "get_review_settings",
+            )
+        except TankHookMethodDoesNotExistError:
+            # the hook was overridden before this method existed, keep the
+            # plate's resolution
+            self.app.log_debug(
+                "The method 'get_review_settings' could not be found in the "
+                "'hook_get_quicktime_settings' hook, the review movie will "
+                "not be reformatted."
+            )
+            return {}
 
-        self._script.addNode(mov_write_node)
+    def forcedAbort(self):
+        """Stop the review movie render along with the plate's"""
+        if self._preview_process is not None and self._preview_process.poll() is None:
+            self._preview_process.kill()
+        FnTranscodeExporter.TranscodeExporter.forcedAbort(self)
 
     def sequenceName(self):
         """override default sequenceName() to handle collated shots"""
@@ -280,8 +443,19 @@ class ShotgunTranscodeExporter(
 
         return result
 
+    @traced()
     def startTask(self):
         """Run Task"""
+        if self._is_skipped_export():
+            return
+
+        # wait for the running tasks to free some memory, the task is
+        # started from taskStep once it is admitted
+        if not self._memory_admitted():
+            self._start_held_back = True
+            return
+        self._start_held_back = False
+
         if self._resolved_export_path is None:
             self._resolved_export_path = self.resolvedExportPath()
             self._tk_version = self._formatTkVersionString(self.versionString())
@@ -296,6 +470,13 @@ class ShotgunTranscodeExporter(
         tmpl = tk.template_from_path(self.resolvedExportPath())
         if not tmpl:
             self.app.log_debug("The path:%s cannot be translated to a ShotGrid template. Please check that the export preset path is correct." % self.resolvedExportPath())
+            if not self.app.engine.has_ui:
+                # no one to tell in terminal mode, fail the task instead
+                self.setError(
+                    "The path %s cannot be translated to a ShotGrid template."
+                    % self.resolvedExportPath()
+                )
+                return
             dialog = QtGui.QMessageBox.warning( hiero.ui.mainWindow(),
                 "ShotGrid error",
                 "The path:\n\n%s\n\ncannot be translated to a ShotGrid template.\nPlease check that the export preset path is correct." % self.resolvedExportPath())
@@ -399,131 +580,316 @@ class ShotgunTranscodeExporter(
         # anything to work with, which will result in the same result
         # as if the thumbnail failed to upload.
         try:
-            self._thumbnail = source.thumbnail(self._item.sourceIn())
+            self._thumbnail = compress_thumbnail(
+                source.thumbnail(self._item_snapshot().source_in)
+            )
         except Exception:
             pass
 
+        self._prepare_preview_movie()
+
+        # keep the frames rendered by the export being resumed
+        if self._reuse_journaled_render():
+            return
+
+        # link the frames of an identical plate rendered by a previous export
+        # rather than rendering them again
+        if self._reuse_registered_plate():
+            return
+
         return FnTranscodeExporter.TranscodeExporter.startTask(self)
 
-    def finishTask(self):
-        """Finish Task"""
-        # run base class implementation
-        FnTranscodeExporter.TranscodeExporter.finishTask(self)
+    @traced("upload")
+    def _upload_quicktime(self, version):
+        """
+        Uploads the review movie to the Version, sending the parts of large
+        movies in parallel, unless the writes of the export are queued.
+        """
+        threads = self.app.get_setting("upload_threads")
+        # queued uploads are sent in the background already
+        if threads <= 1 or self.app.sg_write_queue is not None:
+            self.app.shotgun.upload(
+                "Version", version["id"], self._quicktime_path, "sg_uploaded_movie"
+            )
+            return
+
+        # the uploader and its thread pool are only loaded when needed
+        from .multipart_upload import MultipartUploader
+
+        uploader = MultipartUploader(
+            self.app.shotgun,
+            os.path.join(self.app.cache_location, "uploads"),
+            max_workers=threads,
+            max_bandwidth=self.app.get_setting("upload_bandwidth_limit") * 1024 * 1024,
+            logger=self.app.logger,
+        )
+        uploader.upload(
+            "Version", version["id"], self._quicktime_path, "sg_uploaded_movie"
+        )
+
+    def _plate_frame_range(self):
+        """
+        Returns the first and last frame written by this task. Single file
+        outputs, like movies, are considered to be a single frame.
+        """
+        if not is_frame_sequence(self._resolved_export_path):
+            return (0, 0)
+        return self.outputRange()
+
+    def _reuse_registered_plate(self):
+        """
+        Looks up the plate registry for frames matching the ones this task is
+        about to render, and links them in place if found.
+
+        :returns: True if a registered plate was reused, False otherwise.
+        """
+        registry = getattr(self.app, "plate_registry", None)
+        if registry is None or self.isCollated():
+            return False
 
         if self._submission.kNukeRender == "deadline_submission":
-            self.app.log_debug('This Shotgun Transcode task has been sent to deadline, skipping publish and version')
-            # Log usage metrics
-            try:
-                self.app.log_metric("Transcode & Publish", log_version=True)
-            except:
-                # ingore any errors. ex: metrics logging not supported
-                pass
-            return
+            # frames rendered on the farm are not registered
+            return False
+
+        # computed while the item is still valid, the rendered frames are
+        # registered under this key in finishTask
+        self._plate_key = compute_plate_key(self)
+        self._plate_range = self._plate_frame_range()
+        (first, last) = self._plate_range
+        plate = registry.find(self._plate_key, last - first + 1)
+        if plate is None:
+            registry.release(self._resolved_export_path, first, last)
+            return False
+
+        try:
+            registry.link(plate, self._resolved_export_path, first)
+        except Exception as e:
+            self.app.log_warning(
+                "Unable to reuse the plate %s, rendering it instead: %s"
+                % (plate["path"], e)
+            )
+            return False
 
+        self.app.log_info(
+            "Reused identical plate %s for %s"
+            % (plate["path"], self._resolved_export_path)
+        )
+        self._plate_reused = True
 
-        # create publish
-        ################
-        # by using entity instead of export path to get context, this ensures
-        # collated plates get linked to the hero shot
-        ctx = self.app.tank.context_from_entity("Shot", self._sg_shot["id"])
-        published_file_type = self.app.get_setting("plate_published_file_type")
+        # the review movie of an image sequence still has to be rendered
+        self._nothingToDo = not self._temp_quicktime
 
-        args = {
-            "tk": self.app.tank,
-            "context": ctx,
-            "path": self._resolved_export_path,
-            "name": os.path.basename(self._resolved_export_path),
-            "version_number": int(self._tk_version),
-            "published_file_type": published_file_type,
-        }
+        return True
 
-        if self._sg_task is not None:
-            args["task"] = self._sg_task
+    def _reuse_journaled_render(self):
+        """
+        Skips the render of the plate if the export being resumed completed
+        it and its frames are still on disk, and the render of the review
+        movie if it was uploaded already.
 
-        published_file_entity_type = sgtk.util.get_published_file_entity_type(
-            self.app.sgtk
+        :returns: True if the plate isn't rendered again, False otherwise.
+        """
+        (uploaded, _) = self._journaled(UPLOAD_DONE)
+        if uploaded:
+            self._quicktime_path = None
+            self._temp_quicktime = None
+
+        (rendered, _) = self._journaled(RENDER_DONE)
+        if not rendered:
+            return False
+
+        (first, last) = self._plate_frame_range()
+        if not os.path.exists(frame_path(self._resolved_export_path, first)):
+            return False
+
+        self.app.log_info(
+            "Keeping %s, rendered by the interrupted export."
+            % self._resolved_export_path
         )
+        self._plate_reused = True
 
-        # register publish
-        self.app.log_debug("Register publish in shotgun: %s" % str(args))
-        pub_data = tank.util.register_publish(**args)
-        if self._extra_publish_data is not None:
-            self.app.log_debug(
-                "Updating PTR %s %s"
-                % (published_file_entity_type, str(self._extra_publish_data))
-            )
-            self.app.shotgun.update(
-                pub_data["type"], pub_data["id"], self._extra_publish_data
-            )
+        # the review movie of an image sequence may still have to be rendered
+        self._nothingToDo = not self._temp_quicktime
 
-        # upload thumbnail for publish
-        if self._thumbnail:
-            self._upload_thumbnail_to_sg(pub_data, self._thumbnail)
-        else:
-            self.app.log_debug(
-                "There was no thumbnail available for %s %s"
-                % (published_file_entity_type, str(self._extra_publish_data))
-            )
+        return True
 
-        # create version
-        ################
-        vers = None
-        if self._preset.properties()["create_version"]:
-            if published_file_entity_type == "PublishedFile":
-                self._version_data["published_files"] = [pub_data]
-            else:  # == "TankPublishedFile
-                self._version_data["tank_published_file"] = pub_data
+    @traced()
+    def taskStep(self):
+        """Run Task"""
+        if self._is_skipped_export():
+            return False
 
-            self.app.log_debug("Creating PTR Version %s" % str(self._version_data))
-            vers = self.app.shotgun.create("Version", self._version_data)
+        if self._start_held_back:
+            if self._memory_admitted():
+                self.startTask()
+            return True
 
-            if os.path.exists(self._quicktime_path):
+        # render the plate first
+        if not self._plate_reused and not self._preview_started:
+            if FnTranscodeExporter.TranscodeExporter.taskStep(self):
+                return True
+
+        # then the review movie from its frames
+        if not self._preview_started:
+            self._preview_started = True
+            self._preview_process = self._start_preview_render()
+
+        if self._preview_process is None:
+            return False
+        return self._preview_process.poll() is None
+
+    @traced()
+    def finishTask(self):
+        """Finish Task"""
+        if self._is_skipped_export():
+            return
+
+        with self._finishing_task():
+            # run base class implementation, unless nothing was rendered
+            if not self._plate_reused:
+                FnTranscodeExporter.TranscodeExporter.finishTask(self)
+            self._finish_preview_render()
+
+            if self._submission.kNukeRender == "deadline_submission":
                 self.app.log_debug(
-                    "Uploading quicktime to Flow Production Tracking... (%s)"
-                    % self._quicktime_path
+                    "This Shotgun Transcode task has been sent to deadline, "
+                    "skipping publish and version"
                 )
-                self.app.shotgun.upload(
-                    "Version", vers["id"], self._quicktime_path, "sg_uploaded_movie"
+                # Log usage metrics
+                try:
+                    self.app.log_metric("Transcode & Publish", log_version=True)
+                except:
+                    # ingore any errors. ex: metrics logging not supported
+                    pass
+                return
+
+
+            # register the rendered frames so that later exports can reuse them
+            registry = getattr(self.app, "plate_registry", None)
+            if self._plate_key and not self._plate_reused and not self.error():
+                (first, last) = self._plate_range
+                registry.register(
+                    self._plate_key, self._resolved_export_path, first, last
                 )
-                if self._temp_quicktime:
-                    shutil.rmtree(os.path.dirname(self._quicktime_path))
-
-        # Post creation hook
-        ####################
-        if vers:
-            self.app.execute_hook(
-                "hook_post_version_creation",
-                version_data=vers,
-                base_class=HieroPostVersionCreation,
-            )
 
-        # Update the cut item if possible
-        #################################
-        if vers and hasattr(self, "_cut_item_data"):
+            if not self.error() and not self._journaled(RENDER_DONE)[0]:
+                self._journal(RENDER_DONE)
+
+            # create publish
+            ################
+            # by using entity instead of export path to get context, this ensures
+            # collated plates get linked to the hero shot
+            ctx = self.app.tank.context_from_entity("Shot", self._sg_shot["id"])
+            published_file_type = self.app.get_setting("plate_published_file_type")
+
+            args = {
+                "tk": self.app.tank,
+                "context": ctx,
+                "path": self._resolved_export_path,
+                "name": os.path.basename(self._resolved_export_path),
+                "version_number": int(self._tk_version),
+                "published_file_type": published_file_type,
+            }
 
-            # a version was created and we have a cut item to update.
+            if self._sg_task is not None:
+                args["task"] = self._sg_task
 
-            # just make sure the cut item data has an id which should imply that
-            # it was created in the db.
-            if "id" in self._cut_item_data:
-                cut_item_id = self._cut_item_data["id"]
+            published_file_entity_type = sgtk.util.get_published_file_entity_type(
+                self.app.sgtk
+            )
 
-                # update the Cut item with the newly uploaded version
-                self.app.shotgun.update("CutItem", cut_item_id, {"version": vers})
-                self.app.log_debug("Attached version to cut item.")
+            # register publish, unless the export being resumed did already
+            (published, pub_data) = self._journaled(PUBLISH_REGISTERED)
+            if not published:
+                self.app.log_debug("Register publish in shotgun: %s" % str(args))
+                pub_data = tank.util.register_publish(**args)
+                if self._extra_publish_data is not None:
+                    self.app.log_debug(
+                        "Updating PTR %s %s"
+                        % (published_file_entity_type, str(self._extra_publish_data))
+                    )
+                    self.app.shotgun.update(
+                        pub_data["type"], pub_data["id"], self._extra_publish_data
+                    )
 
-                # upload a thumbnail for the cut item as well
+                # upload thumbnail for publish
                 if self._thumbnail:
-                    self._upload_thumbnail_to_sg(
-                        {"type": "CutItem", "id": cut_item_id}, self._thumbnail
+                    self._upload_thumbnail_to_sg(pub_data, self._thumbnail)
+                else:
+                    self.app.log_debug(
+                        "There was no thumbnail available for %s %s"
+                        % (published_file_entity_type, str(self._extra_publish_data))
                     )
+                self._journal(
+                    PUBLISH_REGISTERED, {"type": pub_data["type"], "id": pub_data["id"]}
+                )
 
-        # Log usage metrics
-        try:
-            self.app.log_metric("Transcode & Publish", log_version=True)
-        except:
-            # ingore any errors. ex: metrics logging not supported
-            pass
+            # create version
+            ################
+            vers = None
+            version_created = False
+            if self._preset.properties()["create_version"]:
+                if published_file_entity_type == "PublishedFile":
+                    self._version_data["published_files"] = [pub_data]
+                else:  # == "TankPublishedFile
+                    self._version_data["tank_published_file"] = pub_data
+
+                (version_created, vers) = self._journaled(VERSION_CREATED)
+                if not version_created:
+                    self.app.log_debug(
+                        "Creating PTR Version %s" % str(self._version_data)
+                    )
+                    vers = self.app.shotgun.create("Version", self._version_data)
+                    self._journal(
+                        VERSION_CREATED, {"type": "Version", "id": vers["id"]}
+                    )
+
+                if self._quicktime_path and os.path.exists(self._quicktime_path):
+                    self.app.log_debug(
+                        "Uploading quicktime to Flow Production Tracking... (%s)"
+                        % self._quicktime_path
+                    )
+                    self._upload_quicktime(vers)
+                    self._journal(UPLOAD_DONE, {"type": "Version", "id": vers["id"]})
+                    if self._temp_quicktime:
+                        shutil.rmtree(os.path.dirname(self._quicktime_path))
+
+            # Post creation hook, only run once for a Version
+            ####################
+            if vers and not version_created:
+                self.app.execute_hook(
+                    "hook_post_version_creation",
+                    version_data=vers,
+                    base_class=HieroPostVersionCreation,
+                )
+
+            # Update the cut item if possible
+            #################################
+            if vers and hasattr(self, "_cut_item_data"):
+
+                # a version was created and we have a cut item to update.
+
+                # just make sure the cut item data has an id which should imply that
+                # it was created in the db.
+                if "id" in self._cut_item_data:
+                    cut_item_id = self._cut_item_data["id"]
+
+                    # update the Cut item with the newly uploaded version
+                    self.app.shotgun.update("CutItem", cut_item_id, {"version": vers})
+                    self.app.log_debug("Attached version to cut item.")
+
+                    # upload a thumbnail for the cut item as well
+                    if self._thumbnail:
+                        self._upload_thumbnail_to_sg(
+                            {"type": "CutItem", "id": cut_item_id}, self._thumbnail
+                        )
+
+            # Log usage metrics
+            try:
+                self.app.log_metric("Transcode & Publish", log_version=True)
+            except:
+                # ingore any errors. ex: metrics logging not supported
+                pass
 
 
 class ShotgunTranscodePreset(
@@ -0,0 +1,80 @@
+# Copyright (c) 2013 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Exports Hiero projects without the Nuke Studio interface.
+
+Run it with Nuke Studio in terminal mode::
+
+    NukeStudio -t hiero_batch_export.py --project-id 123 \\
+        --preset "Plates and Nuke scripts" --sequence reel_1 --sequence reel_2 \\
+        --summary /tmp/reels.json /projects/show.hrox
+
+The toolkit engine is started for the given Flow Production Tracking
+project unless the script runs in an environment where it already is. The
+script user set in the ``SHOTGUN_SITE``, ``SHOTGUN_SCRIPT_NAME`` and
+``SHOTGUN_SCRIPT_KEY`` environment variables is used if they are set, the
+user logged in otherwise.
+
+The other arguments are those of ``tk_hiero_export.batch_export``. The exit
+code is 0 if every sequence was exported.
+"""
+
+import os
+import sys
+import argparse
+
+import sgtk
+
+
+def start_engine(project_id):
+    """
+    Returns the running toolkit engine, starting it for the project if
+    needed.
+    """
+    engine = sgtk.platform.current_engine()
+    if engine is not None:
+        return engine
+    if project_id is None:
+        raise sgtk.TankError("No toolkit engine running, --project-id is needed.")
+
+    authenticator = sgtk.authentication.ShotgunAuthenticator()
+    if os.environ.get("SHOTGUN_SCRIPT_NAME"):
+        user = authenticator.create_script_user(
+            api_script=os.environ["SHOTGUN_SCRIPT_NAME"],
+            api_key=os.environ["SHOTGUN_SCRIPT_KEY"],
+            host=os.environ["SHOTGUN_SITE"],
+        )
+    else:
+        user = authenticator.get_user()
+
+    manager = sgtk.bootstrap.ToolkitManager(sg_user=user)
+    manager.plugin_id = "basic.nuke"
+    return manager.bootstrap_engine(
+        "tk-nuke", entity={"type": "Project", "id": project_id}
+    )
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--project-id", type=int)
+    (args, export_argv) = parser.parse_known_args(argv)
+
+    engine = start_engine(args.project_id)
+    for app in engine.apps.values():
+        if hasattr(app, "run_batch_export"):
+            return app.run_batch_export(export_argv)
+
+    sys.stderr.write("The tk-hiero-export app is not set up in this environment.\n")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,141 @@
+"""
+Benchmarks the export of synthetic sequences outside Nuke Studio.
+
+Runs the shot processor, the shot updater and the exporters against the
+Hiero stand-ins and an in-memory site, and reports the wall time and the
+number of api calls of each export::
+
+    python tests/benchmark.py --shots 10 100 1000 5000 --latency 0.05
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import harness  # noqa: E402
+
+
+# the config hook turning off the creation of Cuts
+CUTS_DISABLED_HOOK = (
+    "{self}/hiero_update_cuts.py:{config}/hiero_update_cuts_disabled.py"
+)
+
+
+def benchmark(
+    shots,
+    latency=0.0,
+    tracks=1,
+    collate=False,
+    audio=False,
+    deadline=False,
+    cuts=True,
+    cut_type="",
+):
+    """
+    Exports a sequence of the given number of shots to a temporary project
+    and returns the :class:`~harness.ExportResult`.
+    """
+    root = tempfile.mkdtemp(prefix="tk-hiero-export-bench-")
+    try:
+        settings = {}
+        if not cuts:
+            settings["hook_update_cuts"] = CUTS_DISABLED_HOOK
+        shotgun = harness.FakeShotgun(latency=latency)
+        app = harness.create_app(shotgun, root, settings)
+        sequence = harness.build_sequence(shots, tracks=tracks, audio=audio)
+        submission = None
+        if deadline:
+            submission = harness.make_deadline_submission(temp_path=root)
+        preset = harness.make_preset(
+            app, root, audio=audio, collate=collate, cut_type=cut_type
+        )
+        return harness.run_export(app, harness.shot_items(sequence), preset, submission)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def _report(result):
+    lines = [
+        "%d shots: %.2fs, %d api calls (%.1f per shot)"
+        % (
+            result.shots,
+            result.wall_time,
+            result.sg_call_count,
+            result.sg_calls_per_shot,
+        ),
+        "    calls by method: %s"
+        % ", ".join("%s %d" % item for item in result.sg_calls.most_common()),
+    ]
+    for phase, seconds in sorted(result.times.items(), key=lambda item: -item[1]):
+        lines.append(
+            "    %-40s %8.3fs %6d calls" % (phase, seconds, result.calls[phase])
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--shots",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000, 5000],
+        help="The sequence sizes to export.",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Seconds added to every api call.",
+    )
+    parser.add_argument(
+        "--tracks", type=int, default=1, help="The number of video tracks."
+    )
+    parser.add_argument(
+        "--collate", action="store_true", help="Collate the shots of all tracks."
+    )
+    parser.add_argument("--audio", action="store_true", help="Export audio.")
+    parser.add_argument(
+        "--deadline", action="store_true", help="Render with the Deadline submission."
+    )
+    parser.add_argument(
+        "--no-cuts",
+        dest="cuts",
+        action="store_false",
+        help="Do not create Cuts, as if the update cuts hook disallowed it.",
+    )
+    parser.add_argument(
+        "--cut-type", default="", help="The cut type of the created Cut."
+    )
+    parser.add_argument(
+        "--json", dest="json_path", help="Write the results to a json file."
+    )
+    args = parser.parse_args(argv)
+
+    results = []
+    for shots in args.shots:
+        result = benchmark(
+            shots,
+            latency=args.latency,
+            tracks=args.tracks,
+            collate=args.collate,
+            audio=args.audio,
+            deadline=args.deadline,
+            cuts=args.cuts,
+            cut_type=args.cut_type,
+        )
+        print(_report(result))
+        results.append(result.as_dict())
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# make the harness importable, which installs the Hiero and toolkit
+# stand-ins when the real modules are not available
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
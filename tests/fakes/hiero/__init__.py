@@ -0,0 +1,8 @@
+"""
+Stand-in for the Hiero python API, covering what the app uses during an
+export so that the processor and tasks can run outside Nuke Studio.
+"""
+
+from . import core
+from . import ui
+from . import exporters
@@ -0,0 +1,12 @@
+"""
+Stand-in for ``hiero.core.FnExporterBase``.
+"""
+
+
+def tagsFromSelection(items, includeChildren=False, includeParents=False):
+    tags = []
+    for item in items:
+        item = getattr(item, "item", lambda: item)()
+        for tag in item.tags():
+            tags.append((tag, type(item)))
+    return tags
@@ -0,0 +1,7 @@
+"""
+Stand-in for ``hiero.core.FnNukeHelpers``.
+"""
+
+
+def offsetNodeAnimationFrames(node, offset):
+    pass
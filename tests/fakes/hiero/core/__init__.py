@@ -0,0 +1,843 @@
+"""
+Stand-in for ``hiero.core``: an in-memory timeline model and the task base
+classes.
+"""
+
+import os
+import logging
+import itertools
+
+__all__ = [
+    "AudioTrack",
+    "BinItem",
+    "Clip",
+    "EffectTrackItem",
+    "Format",
+    "ItemWrapper",
+    "MediaSource",
+    "Project",
+    "Sequence",
+    "SequenceBase",
+    "Tag",
+    "TaskBase",
+    "TaskPresetBase",
+    "TimeBase",
+    "Timecode",
+    "TrackItem",
+    "VideoTrack",
+]
+
+log = logging.getLogger("hiero.core")
+
+env = {"HomeDirectory": os.path.expanduser("~")}
+
+_guids = itertools.count(1)
+
+
+def _guid():
+    return "{%08d-fake}" % next(_guids)
+
+
+class TimeBase(object):
+    def __init__(self, fps):
+        self._fps = float(fps)
+
+    def toFloat(self):
+        return self._fps
+
+    def isValid(self):
+        return self._fps > 0
+
+    def __str__(self):
+        return ("%.3f" % self._fps).rstrip("0").rstrip(".")
+
+    def __eq__(self, other):
+        return isinstance(other, TimeBase) and other._fps == self._fps
+
+    def __hash__(self):
+        return hash(self._fps)
+
+
+class Format(object):
+    def __init__(self, width=1920, height=1080, name="HD_1080"):
+        self._width = width
+        self._height = height
+        self._name = name
+
+    def width(self):
+        return self._width
+
+    def height(self):
+        return self._height
+
+    def name(self):
+        return self._name
+
+
+class Timecode(object):
+    kDisplayTimecode = 0
+    kDisplayDropFrameTimecode = 1
+    kDisplayFrame = 2
+
+    @staticmethod
+    def timeToString(frame, fps, displayType):
+        if hasattr(fps, "toFloat"):
+            fps = fps.toFloat()
+        nominal = int(round(fps))
+        frame = int(frame)
+
+        if displayType == Timecode.kDisplayFrame:
+            return str(frame)
+
+        separator = ":"
+        if displayType == Timecode.kDisplayDropFrameTimecode and nominal in (30, 60):
+            # drop 2 (or 4) frame numbers every minute but every tenth one
+            separator = ";"
+            drop = nominal // 15
+            per_ten_minutes = nominal * 600 - drop * 9
+            per_minute = nominal * 60 - drop
+            (tens, rest) = divmod(frame, per_ten_minutes)
+            frame += drop * 9 * tens
+            if rest > drop:
+                frame += drop * ((rest - drop) // per_minute)
+
+        (seconds, frames) = divmod(frame, nominal)
+        (minutes, seconds) = divmod(seconds, 60)
+        (hours, minutes) = divmod(minutes, 60)
+        return "%02d:%02d:%02d%s%02d" % (
+            hours % 24,
+            minutes,
+            seconds,
+            separator,
+            frames,
+        )
+
+
+class Image(object):
+    """
+    Thumbnail returned by the ``thumbnail`` methods.
+    """
+
+    def scaledToWidth(self, width, *args):
+        return self
+
+    def save(self, target, format=None):
+        if hasattr(target, "write"):
+            target.write(b"\x89PNG\r\n\x1a\n")
+            return True
+        with open(target, "wb") as fh:
+            fh.write(b"\x89PNG\r\n\x1a\n")
+        return True
+
+
+class Tag(object):
+    def __init__(self, name, note=""):
+        if isinstance(name, Tag):
+            (name, note) = (name.name(), name.note())
+        self._name = name
+        self._note = note
+        self._guid = _guid()
+
+    def name(self):
+        return self._name
+
+    def note(self):
+        return self._note
+
+    def visible(self):
+        return True
+
+    def icon(self):
+        return ""
+
+    def guid(self):
+        return self._guid
+
+
+class _Tagged(object):
+    def tags(self):
+        return list(self.__dict__.setdefault("_tags", []))
+
+    def addTag(self, tag):
+        self.__dict__.setdefault("_tags", []).append(tag)
+        return tag
+
+
+class MediaSource(object):
+    def __init__(self, path, has_audio=False):
+        self._path = path
+        self._has_audio = has_audio
+
+    def firstpath(self):
+        return self._path
+
+    def fileinfos(self):
+        return []
+
+    def hasAudio(self):
+        return self._has_audio
+
+    def isMediaPresent(self):
+        return True
+
+
+class ReadNode(object):
+    def __init__(self, colorspace):
+        self._knobs = {"colorspace": colorspace}
+
+    def knob(self, name):
+        return _Knob(self._knobs.get(name))
+
+
+class _Knob(object):
+    def __init__(self, value):
+        self._value = value
+
+    def value(self):
+        return self._value
+
+
+class SequenceBase(_Tagged):
+    def __init__(self, name):
+        self._name = name
+        self._guid = _guid()
+        self._framerate = TimeBase(24)
+        self._format = Format()
+        self._posterFrame = 0
+
+    def name(self):
+        return self._name
+
+    def setName(self, name):
+        self._name = name
+
+    def guid(self):
+        return self._guid
+
+    def framerate(self):
+        return self._framerate
+
+    def setFramerate(self, framerate):
+        if not isinstance(framerate, TimeBase):
+            framerate = TimeBase(framerate)
+        self._framerate = framerate
+
+    def format(self):
+        return self._format
+
+    def setFormat(self, format):
+        self._format = format
+
+    def posterFrame(self):
+        return self._posterFrame
+
+    def setPosterFrame(self, frame):
+        self._posterFrame = frame
+
+    def thumbnail(self, frame=None):
+        return Image()
+
+
+class Clip(SequenceBase):
+    def __init__(
+        self, name, path=None, duration=100, timecode_start=86400, colorspace="linear"
+    ):
+        SequenceBase.__init__(self, name)
+        self._media = MediaSource(path or "/media/%s.####.exr" % name)
+        self._duration = duration
+        self._timecodeStart = timecode_start
+        self._colorspace = colorspace
+
+    def mediaSource(self):
+        return self._media
+
+    def isMediaPresent(self):
+        return True
+
+    def readNode(self):
+        return ReadNode(self._colorspace)
+
+    def duration(self):
+        return self._duration
+
+    def timecodeStart(self):
+        return self._timecodeStart
+
+    def sourceIn(self):
+        return 0
+
+    def sourceOut(self):
+        return self._duration - 1
+
+    def writeAudioToFile(self, path, *args):
+        _write_silence(path)
+
+
+class Sequence(SequenceBase):
+    def __init__(self, name):
+        SequenceBase.__init__(self, name)
+        self._tracks = []
+        self._dropFrame = False
+        self._timecodeStart = 0
+        self._inTime = None
+        self._outTime = None
+
+    def videoTracks(self):
+        return [track for track in self._tracks if isinstance(track, VideoTrack)]
+
+    def audioTracks(self):
+        return [track for track in self._tracks if isinstance(track, AudioTrack)]
+
+    def items(self):
+        return list(self._tracks)
+
+    def addTrack(self, track):
+        track._parent = self
+        self._tracks.append(track)
+        return track
+
+    def removeTrack(self, track):
+        self._tracks.remove(track)
+
+    def dropFrame(self):
+        return self._dropFrame
+
+    def setDropFrame(self, dropFrame):
+        self._dropFrame = dropFrame
+
+    def timecodeStart(self):
+        return self._timecodeStart
+
+    def setTimecodeStart(self, start):
+        self._timecodeStart = start
+
+    def duration(self):
+        ends = [item.timelineOut() + 1 for track in self._tracks for item in track]
+        return max(ends) if ends else 0
+
+    def inTime(self):
+        if self._inTime is None:
+            raise RuntimeError("No in time set")
+        return self._inTime
+
+    def setInTime(self, time):
+        self._inTime = time
+
+    def outTime(self):
+        if self._outTime is None:
+            raise RuntimeError("No out time set")
+        return self._outTime
+
+    def setOutTime(self, time):
+        self._outTime = time
+
+    def writeAudioToFile(self, path, start=0, end=None, *args):
+        _write_silence(path)
+
+    def copy(self):
+        copy = Sequence(self._name)
+        copy.__dict__.update(
+            dict((k, v) for (k, v) in self.__dict__.items() if k != "_guid")
+        )
+        return copy
+
+
+class _Track(_Tagged):
+    def __init__(self, name):
+        self._name = name
+        self._guid = _guid()
+        self._items = []
+        self._subTrackItems = []
+        self._parent = None
+        self._blend = False
+
+    def name(self):
+        return self._name
+
+    def guid(self):
+        return self._guid
+
+    def parent(self):
+        return self._parent
+
+    def items(self):
+        return list(self._items)
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def addItem(self, item):
+        item._parent = self
+        self._items.append(item)
+        return item
+
+    def trackIndex(self):
+        if self._parent is None:
+            return 0
+        return self._parent._tracks.index(self)
+
+    def isBlendEnabled(self):
+        return self._blend
+
+    def setBlendEnabled(self, enabled):
+        self._blend = enabled
+
+    def subTrackItems(self):
+        return self._subTrackItems
+
+    def addSubTrackItem(self, item, index):
+        while len(self._subTrackItems) <= index:
+            self._subTrackItems.append([])
+        item._parent = self
+        self._subTrackItems[index].append(item)
+
+    def addTransition(self, transition):
+        pass
+
+
+class VideoTrack(_Track):
+    pass
+
+
+class AudioTrack(_Track):
+    pass
+
+
+class _ReformatState(object):
+    def type(self):
+        from . import nuke
+
+        return nuke.ReformatNode.kToFormat
+
+
+class TrackItem(_Tagged):
+    class MediaType(object):
+        kVideo = "video"
+        kAudio = "audio"
+
+    def __init__(self, name, mediaType=None):
+        self._name = name
+        self._guid = _guid()
+        self._mediaType = mediaType or TrackItem.MediaType.kVideo
+        self._source = None
+        self._parent = None
+        self._timelineIn = 0
+        self._timelineOut = 0
+        self._sourceIn = 0
+        self._sourceOut = 0
+        self._playbackSpeed = 1.0
+        self._linked = []
+
+    def name(self):
+        return self._name
+
+    def guid(self):
+        return self._guid
+
+    def mediaType(self):
+        return self._mediaType
+
+    def source(self):
+        return self._source
+
+    def setSource(self, source):
+        self._source = source
+
+    def parent(self):
+        return self._parent
+
+    def parentTrack(self):
+        return self._parent
+
+    def parentSequence(self):
+        return self._parent.parent() if self._parent is not None else None
+
+    def sequence(self):
+        return self.parentSequence()
+
+    def timelineIn(self):
+        return self._timelineIn
+
+    def timelineOut(self):
+        return self._timelineOut
+
+    def setTimelineIn(self, time):
+        self._timelineIn = time
+
+    def setTimelineOut(self, time):
+        self._timelineOut = time
+
+    def sourceIn(self):
+        return self._sourceIn
+
+    def sourceOut(self):
+        return self._sourceOut
+
+    def setTimes(self, timelineIn, timelineOut, sourceIn, sourceOut):
+        self._timelineIn = timelineIn
+        self._timelineOut = timelineOut
+        self._sourceIn = sourceIn
+        self._sourceOut = sourceOut
+
+    def trimIn(self, frames):
+        self._timelineIn += frames
+        self._sourceIn += frames
+
+    def trimOut(self, frames):
+        self._timelineOut -= frames
+        self._sourceOut -= frames
+
+    def duration(self):
+        return self._timelineOut - self._timelineIn + 1
+
+    def sourceDuration(self):
+        return self._sourceOut - self._sourceIn + 1
+
+    def playbackSpeed(self):
+        return self._playbackSpeed
+
+    def handleInLength(self):
+        return int(self._sourceIn)
+
+    def handleOutLength(self):
+        return int(self._source.duration() - 1 - self._sourceOut)
+
+    def linkedItems(self):
+        return list(self._linked)
+
+    def link(self, item):
+        self._linked.append(item)
+        item._linked.append(self)
+
+    def inTransition(self):
+        return None
+
+    def outTransition(self):
+        return None
+
+    def reformatState(self):
+        return _ReformatState()
+
+    def isEnabled(self):
+        return True
+
+    def copy(self):
+        copy = TrackItem(self._name, self._mediaType)
+        for key in (
+            "_source",
+            "_timelineIn",
+            "_timelineOut",
+            "_sourceIn",
+            "_sourceOut",
+            "_playbackSpeed",
+        ):
+            setattr(copy, key, getattr(self, key))
+        copy.__dict__["_tags"] = self.tags()
+        return copy
+
+
+class EffectTrackItem(TrackItem):
+    def node(self):
+        return None
+
+
+class ItemWrapper(object):
+    """
+    An item selected in the export dialog.
+    """
+
+    def __init__(self, item):
+        self._item = item
+
+    def trackItem(self):
+        return self._item if isinstance(self._item, TrackItem) else None
+
+    def sequence(self):
+        return self._item if isinstance(self._item, Sequence) else None
+
+    def clip(self):
+        return self._item if isinstance(self._item, Clip) else None
+
+    def item(self):
+        return self._item
+
+
+class BinItem(object):
+    def __init__(self, item):
+        self._item = item
+
+
+def _write_silence(path):
+    with open(path, "wb") as fh:
+        fh.write(b"RIFF\x24\x00\x00\x00WAVEfmt \x10\x00\x00\x00")
+        fh.write(b"\x01\x00\x02\x00\x80\xbb\x00\x00\x00\xee\x02\x00\x04\x00\x10\x00")
+        fh.write(b"data\x00\x00\x00\x00")
+
+
+def isVideoFileExtension(ext):
+    return ext.lower().lstrip(".") in ("mov", "mp4", "mxf", "avi")
+
+
+class Project(object):
+    """
+    A project, opened with :func:`openProject`.
+    """
+
+    def __init__(self, path, sequences=None, presets=None):
+        self._path = path
+        self._sequences = list(sequences or [])
+        self._presets = list(presets or [])
+        self.closed = False
+
+    def name(self):
+        return os.path.splitext(os.path.basename(self._path))[0]
+
+    def path(self):
+        return self._path
+
+    def sequences(self):
+        return list(self._sequences)
+
+    def close(self):
+        self.closed = True
+
+
+# the projects which can be opened, by path
+_projects = {}
+
+
+def addProject(project):
+    """
+    Makes a project openable with :func:`openProject`, harness only.
+    """
+    _projects[os.path.abspath(project.path())] = project
+
+
+def openProject(path):
+    try:
+        project = _projects[os.path.abspath(path)]
+    except KeyError:
+        raise RuntimeError("Unable to open project %s" % path)
+    project.closed = False
+    return project
+
+
+def projects():
+    return [project for project in _projects.values() if not project.closed]
+
+
+def project(name):
+    return None
+
+
+def findProjectTags(project):
+    return []
+
+
+class ResolveTable(object):
+    """
+    Maps the {keywords} of export paths to the functions resolving them.
+    """
+
+    def __init__(self):
+        self._resolvers = {}
+
+    def addResolver(self, keyword, description, resolver):
+        self._resolvers[keyword] = resolver
+
+    def entries(self):
+        return list(self._resolvers.keys())
+
+    def resolve(self, task, path):
+        for keyword, resolver in self._resolvers.items():
+            if keyword in path:
+                path = path.replace(keyword, str(resolver(keyword, task)))
+        return path
+
+
+class TaskPresetBase(object):
+    kAllItems = "all"
+    kTrackItem = "trackitem"
+
+    def __init__(self, parentType, presetName):
+        self._parentType = parentType
+        self._name = presetName
+        self._properties = {}
+
+    def name(self):
+        return self._name
+
+    def properties(self):
+        return self._properties
+
+    def ofType(self):
+        return self._parentType
+
+    def supportedItems(self):
+        return TaskPresetBase.kTrackItem
+
+    def addDefaultResolveEntries(self, resolver):
+        resolver.addResolver("{shot}", "", lambda keyword, task: task.shotName())
+        resolver.addResolver("{clip}", "", lambda keyword, task: task.clipName())
+        resolver.addResolver(
+            "{sequence}", "", lambda keyword, task: task.sequenceName()
+        )
+        resolver.addResolver("{track}", "", lambda keyword, task: task.trackName())
+        resolver.addResolver(
+            "{version}", "", lambda keyword, task: task.versionString()
+        )
+        resolver.addResolver("{project}", "", lambda keyword, task: task.projectName())
+
+    def addUserResolveEntries(self, resolver):
+        pass
+
+    def createResolver(self):
+        resolver = ResolveTable()
+        self.addDefaultResolveEntries(resolver)
+        self.addUserResolveEntries(resolver)
+        return resolver
+
+
+class TaskBase(object):
+    def __init__(self, initDict):
+        self._init_dict = initDict
+        self._item = initDict.get("item")
+        self._preset = initDict["preset"]
+        self._submission = initDict.get("submission")
+        self._exportPath = initDict.get("exportPath", "")
+        self._exportRoot = initDict.get("exportRoot", "")
+        self._resolver = initDict.get("resolver")
+        self._project = initDict.get("project")
+        self._version = initDict.get("version", 1)
+        self._projectSettings = {}
+        self._nothingToDo = False
+        self._finished = False
+        self._error = None
+
+        self._sequence = None
+        self._clip = None
+        self._source = None
+        if isinstance(self._item, TrackItem):
+            self._sequence = self._item.parentSequence()
+            self._clip = self._item.source()
+            self._source = self._clip
+        elif isinstance(self._item, Sequence):
+            self._sequence = self._item
+        elif isinstance(self._item, Clip):
+            self._clip = self._item
+            self._source = self._item
+
+    def resolvedExportPath(self):
+        path = self._exportPath
+        if self._resolver is not None:
+            path = self._resolver.resolve(self, path)
+        return os.path.join(self._exportRoot, path).replace("\\", "/")
+
+    def versionString(self):
+        return "v%d" % self._version
+
+    def projectName(self):
+        return "bench"
+
+    def shotName(self):
+        return self._item.name()
+
+    def clipName(self):
+        return self._clip.name() if self._clip is not None else self._item.name()
+
+    def sequenceName(self):
+        return self._sequence.name() if self._sequence is not None else ""
+
+    def trackName(self):
+        try:
+            return self._item.parentTrack().name()
+        except AttributeError:
+            return ""
+
+    def hasNothingToDo(self):
+        return self._nothingToDo
+
+    def startTask(self):
+        pass
+
+    def taskStep(self):
+        return False
+
+    def finishTask(self):
+        self._finished = True
+
+    def forcedAbort(self):
+        pass
+
+    def progress(self):
+        return 1.0 if self._finished else 0.0
+
+    def error(self):
+        return self._error
+
+    def setError(self, error):
+        self._error = error
+
+    def outputSequenceTime(self):
+        return False
+
+
+class _TaskRegistry(object):
+    def __init__(self):
+        self._defaultPresets = lambda overwrite: None
+        self._processorPresets = {}
+        self._processors = {}
+        self._localPresets = []
+
+    def registerTask(self, presetType, taskType):
+        pass
+
+    def registerProcessor(self, presetType, processorType):
+        self._processors[presetType] = processorType
+
+    def addSubmission(self, name, submissionType):
+        pass
+
+    def setDefaultPresets(self, callback):
+        self._defaultPresets = callback
+
+    def localPresets(self):
+        return list(self._localPresets)
+
+    def projectPresets(self, project):
+        return list(project._presets)
+
+    def createAndExecuteProcessor(self, preset, items, synchronous=False):
+        """
+        Exports items with a processor preset, running the tasks one after
+        the other the way Nuke Studio does in terminal mode.
+        """
+        from hiero.exporters.FnSubmission import Submission
+
+        submission = Submission()
+        processor = self._processors[type(preset)](preset, submission, synchronous)
+        processor.startProcessing(items)
+        for group in submission.children():
+            for task in group.children():
+                task.startTask()
+                while task.taskStep():
+                    pass
+                task.finishTask()
+        return processor
+
+    def removeProcessorPreset(self, name):
+        self._processorPresets.pop(name, None)
+
+    def addProcessorPreset(self, name, preset):
+        self._processorPresets[name] = preset
+
+
+taskRegistry = _TaskRegistry()
+
+
+from . import nuke  # noqa: E402
+from . import FnExporterBase  # noqa: E402
+from . import FnNukeHelpers  # noqa: E402
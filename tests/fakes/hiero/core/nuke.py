@@ -0,0 +1,75 @@
+"""
+Stand-in for ``hiero.core.nuke``, the Nuke script writing helpers.
+"""
+
+
+class Node(object):
+    def __init__(self, nodeClass, inputs=1, **knobs):
+        self._nodeClass = nodeClass
+        self._knobValues = dict(knobs)
+        self._name = nodeClass
+
+    def setKnob(self, name, value):
+        self._knobValues[name] = value
+
+    def knob(self, name):
+        return self._knobValues.get(name)
+
+    def setName(self, name):
+        self._name = name
+
+    def name(self):
+        return self._name
+
+
+class RootNode(Node):
+    def __init__(self, first, last, fps=None, *args, **kwargs):
+        Node.__init__(self, "Root", first_frame=first, last_frame=last, fps=fps)
+
+
+class ReadNode(Node):
+    def __init__(self, path, *args, **kwargs):
+        Node.__init__(self, "Read", file=path, **kwargs)
+
+
+class WriteNode(Node):
+    def __init__(self, path, *args, **kwargs):
+        Node.__init__(self, "Write", file=path)
+
+
+class MetadataNode(Node):
+    def __init__(self, metadatavalues=None, **kwargs):
+        Node.__init__(self, "ModifyMetaData", metadata=metadatavalues)
+
+
+class ReformatNode(Node):
+    kToFormat = "to format"
+    kToBox = "to box"
+    kToScale = "scale"
+    kDisabled = "disabled"
+
+
+class _LayoutContext(object):
+    def __init__(self):
+        self._nodes = []
+
+    def getNodes(self):
+        return self._nodes
+
+
+class ScriptWriter(object):
+    def __init__(self):
+        self._nodes = []
+        self._layoutContextStack = [_LayoutContext()]
+
+    def addNode(self, node):
+        self._nodes.append(node)
+        self._layoutContextStack[-1].getNodes().append(node)
+
+    def getNodes(self):
+        return self._nodes
+
+    def writeToDisk(self, path):
+        with open(path, "w") as fh:
+            for node in self._nodes:
+                fh.write("%s %r\n" % (node._nodeClass, node._knobValues))
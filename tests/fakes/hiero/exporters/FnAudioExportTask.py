@@ -0,0 +1,49 @@
+"""
+Stand-in for ``hiero.exporters.FnAudioExportTask``.
+"""
+
+import os
+
+import hiero.core
+
+from .FnShotExporter import ShotTask
+
+
+class AudioExportTask(ShotTask):
+    def __init__(self, initDict):
+        ShotTask.__init__(self, initDict)
+        self._audioFile = None
+
+    def startTask(self):
+        # like Hiero, make sure the destination folder exists
+        folder = os.path.dirname(self.resolvedExportPath())
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+
+    def _sequenceHasAudio(self, sequence):
+        return bool(sequence.audioTracks())
+
+    def sequenceInOutPoints(self, sequence, start, end):
+        try:
+            start = sequence.inTime()
+        except RuntimeError:
+            pass
+        try:
+            end = sequence.outTime()
+        except RuntimeError:
+            pass
+        return (start, end)
+
+
+class AudioExportPreset(hiero.core.TaskPresetBase):
+    def __init__(self, name, properties):
+        hiero.core.TaskPresetBase.__init__(self, AudioExportTask, name)
+        self._properties.update(
+            {
+                "numChannels": "stereo",
+                "sampleRate": "48000 Hz",
+                "bitDepth": "24 bit",
+                "bitRate": "320 kbp/s",
+            }
+        )
+        self._properties.update(properties)
@@ -0,0 +1,16 @@
+"""
+Stand-in for ``hiero.exporters.FnEffectHelpers``.
+"""
+
+import hiero.core
+
+
+def findEffectsAnnotationsForTrackItems(trackItems):
+    effects = []
+    for item in trackItems:
+        effects.extend(
+            linked
+            for linked in item.linkedItems()
+            if isinstance(linked, hiero.core.EffectTrackItem)
+        )
+    return (effects, [])
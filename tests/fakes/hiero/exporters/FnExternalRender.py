@@ -0,0 +1,70 @@
+"""
+Stand-in for ``hiero.exporters.FnExternalRender``.
+"""
+
+import os
+import tempfile
+
+import hiero.core
+from hiero.core import nuke
+
+from .FnShotExporter import ShotTask
+from .FnSubmission import Submission
+
+
+def createWriteNode(ctx, path, preset, nodeName=None, framerate=None, project=None):
+    node = nuke.WriteNode(path)
+    node.setName(nodeName)
+    return node
+
+
+class NukeRenderTask(ShotTask):
+    """
+    Builds a Nuke script and hands it to the submission to be rendered.
+    """
+
+    def __init__(self, initDict):
+        ShotTask.__init__(self, initDict)
+        self._script = None
+        self._scriptfile = None
+        self._renderTask = None
+        self._renderStarted = False
+
+    def buildScript(self):
+        self._script = nuke.ScriptWriter()
+        (first, last) = self.outputRange()
+        self._script.addNode(nuke.RootNode(first, last))
+        self._script.addNode(nuke.ReadNode(self._source.mediaSource().firstpath()))
+        self._script.addNode(nuke.WriteNode(self.resolvedExportPath()))
+
+    def startTask(self):
+        self.buildScript()
+
+        (handle, self._scriptfile) = tempfile.mkstemp(suffix=".nk", prefix="render_")
+        os.close(handle)
+        self._script.writeToDisk(self._scriptfile)
+
+        (start, end) = self.outputRange()
+        self._init_dict["startFrame"] = start
+        self._init_dict["endFrame"] = end
+        self._renderTask = self._submission.addJob(
+            Submission.kNukeRender, self._init_dict, self._scriptfile
+        )
+
+    def taskStep(self):
+        if self._renderTask is not None and not self._renderStarted:
+            self._renderStarted = True
+            self._renderTask.startTask()
+        return False
+
+    def finishTask(self):
+        if self._scriptfile and os.path.exists(self._scriptfile):
+            os.remove(self._scriptfile)
+        ShotTask.finishTask(self)
+
+
+class NukeRenderPreset(hiero.core.TaskPresetBase):
+    def __init__(self, name, properties):
+        hiero.core.TaskPresetBase.__init__(self, NukeRenderTask, name)
+        self._properties.update({"file_type": "exr", "colourspace": "default"})
+        self._properties.update(properties)
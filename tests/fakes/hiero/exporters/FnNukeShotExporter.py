@@ -0,0 +1,54 @@
+"""
+Stand-in for ``hiero.exporters.FnNukeShotExporter``.
+"""
+
+import hiero.core
+
+from .FnShotExporter import ShotTask
+
+
+class NukeShotExporter(ShotTask):
+    kCollatedSequenceFrameOffset = 1000
+
+    def __init__(self, initDict):
+        ShotTask.__init__(self, initDict)
+        self._collate = False
+        self._collatedItems = [self._item]
+
+        properties = self._preset.properties()
+        if isinstance(self._item, hiero.core.TrackItem) and (
+            properties.get("collateTracks") or properties.get("collateShotNames")
+        ):
+            self._collatedItems = _collatedItems(
+                self._item,
+                properties.get("collateTracks"),
+                properties.get("collateShotNames"),
+            )
+            self._collate = len(self._collatedItems) > 1
+
+    def _beforeNukeScriptWrite(self, script):
+        pass
+
+
+def _collatedItems(item, collateTracks, collateShotNames):
+    items = []
+    for track in item.parentSequence().videoTracks():
+        for other in track:
+            if collateShotNames and other.name() == item.name():
+                items.append(other)
+            elif (
+                collateTracks
+                and other.timelineIn() <= item.timelineOut()
+                and other.timelineOut() >= item.timelineIn()
+            ):
+                items.append(other)
+    return items
+
+
+class NukeShotPreset(hiero.core.TaskPresetBase):
+    def __init__(self, name, properties):
+        hiero.core.TaskPresetBase.__init__(self, NukeShotExporter, name)
+        self._properties.update(
+            {"readPaths": [], "writePaths": [], "includeEffects": True}
+        )
+        self._properties.update(properties)
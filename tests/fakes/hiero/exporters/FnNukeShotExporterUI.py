@@ -0,0 +1,11 @@
+"""
+Stand-in for ``hiero.exporters.FnNukeShotExporterUI``. The export dialog isn't built.
+"""
+
+
+class NukeShotExporterUI(object):
+    def __init__(self, preset):
+        self._preset = preset
+
+    def populateUI(self, *args, **kwargs):
+        pass
@@ -0,0 +1,43 @@
+"""
+Stand-in for ``hiero.exporters.FnShotExporter``.
+"""
+
+import math
+
+import hiero.core
+
+
+class ShotTask(hiero.core.TaskBase):
+    def __init__(self, initDict):
+        hiero.core.TaskBase.__init__(self, initDict)
+        properties = self._preset.properties()
+
+        self._cutHandles = None
+        if properties.get("cutUseHandles"):
+            self._cutHandles = properties.get("cutHandles", 0)
+
+        self._startFrame = None
+        if properties.get("startFrameSource") == "Custom":
+            self._startFrame = properties.get("startFrameIndex", 1001)
+
+        self._retime = properties.get("includeRetimes", False)
+        self._skipOffline = properties.get("skipOffline", True)
+
+    def inputRange(self, ignoreHandles=False, ignoreRetimes=True, clampToSource=True):
+        start = self._item.sourceIn()
+        end = self._item.sourceOut()
+        if self._cutHandles and not ignoreHandles:
+            start -= self._cutHandles
+            end += self._cutHandles
+        if clampToSource and isinstance(self._item, hiero.core.TrackItem):
+            start = max(0, start)
+            end = min(self._item.source().duration() - 1, end)
+        return (start, end)
+
+    def outputRange(self, ignoreHandles=False, ignoreRetimes=True, clampToSource=True):
+        (start, end) = self.inputRange(ignoreHandles, ignoreRetimes, clampToSource)
+        start = int(math.floor(start))
+        end = int(math.ceil(end))
+        if self._startFrame is not None:
+            (start, end) = (self._startFrame, self._startFrame + end - start)
+        return (start, end)
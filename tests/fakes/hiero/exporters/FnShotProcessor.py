@@ -0,0 +1,124 @@
+"""
+Stand-in for ``hiero.exporters.FnShotProcessor``.
+"""
+
+import tempfile
+
+import hiero.core
+
+# processor properties passed on to the presets of the tasks
+_PROCESSOR_PROPERTIES = (
+    "cutHandles",
+    "cutUseHandles",
+    "cutLength",
+    "startFrameSource",
+    "startFrameIndex",
+    "includeRetimes",
+)
+
+
+class ExportStructure(object):
+    """
+    The export template of a processor: the (path, preset) pairs of its tasks.
+    """
+
+    def __init__(self, elements=()):
+        self._elements = list(elements)
+
+    def flatten(self):
+        return [
+            (path, preset) for (path, preset) in self._elements if preset is not None
+        ]
+
+    def restore(self, elements):
+        self._elements = list(elements)
+
+
+class TaskGroup(object):
+    """
+    The tasks exporting a single item.
+    """
+
+    def __init__(self, item):
+        self._item = item
+        self._children = []
+
+    def item(self):
+        return self._item
+
+    def children(self):
+        return list(self._children)
+
+    def addChild(self, task):
+        self._children.append(task)
+
+
+class ShotProcessor(object):
+    def __init__(self, preset, submission=None, synchronous=False):
+        self._preset = preset
+        self._submission = submission
+        self._synchronous = synchronous
+        self._exportTemplate = ExportStructure(preset.properties()["exportTemplate"])
+        self._resolver = preset.createResolver()
+
+    def startProcessing(self, exportItems, preview=False):
+        properties = self._preset.properties()
+
+        items = []
+        for wrapper in exportItems:
+            if wrapper.trackItem() is not None:
+                items.append(wrapper.trackItem())
+            elif wrapper.sequence() is not None:
+                for track in wrapper.sequence().videoTracks():
+                    items.extend(track.items())
+
+        tasks = []
+        for shotNameIndex, item in enumerate(items):
+            group = TaskGroup(item)
+            for path, preset in self._exportTemplate.flatten():
+                for key in _PROCESSOR_PROPERTIES:
+                    preset.properties()[key] = properties[key]
+                initDict = {
+                    "item": item,
+                    "preset": preset,
+                    "submission": self._submission,
+                    "exportPath": path,
+                    "exportRoot": properties["exportRoot"],
+                    "resolver": self._resolver,
+                    "version": properties["versionIndex"],
+                    "shotNameIndex": shotNameIndex,
+                }
+                task = preset._parentType(initDict)
+                group.addChild(task)
+                tasks.append(task)
+            if not preview:
+                self._submission.addChild(group)
+
+        if preview:
+            return tasks
+
+        self.processTaskPreQueue()
+        self._submission.addToQueue()
+        return tasks
+
+    def processTaskPreQueue(self):
+        pass
+
+
+class ShotProcessorPreset(hiero.core.TaskPresetBase):
+    def __init__(self, name, properties):
+        hiero.core.TaskPresetBase.__init__(self, ShotProcessor, name)
+        self._properties.update(
+            {
+                "exportTemplate": (),
+                "exportRoot": tempfile.gettempdir(),
+                "cutHandles": 12,
+                "cutUseHandles": False,
+                "cutLength": True,
+                "startFrameSource": "Custom",
+                "startFrameIndex": 1001,
+                "includeRetimes": False,
+                "versionIndex": 1,
+            }
+        )
+        self._properties.update(properties)
@@ -0,0 +1,46 @@
+"""
+Stand-in for ``hiero.exporters.FnSubmission``.
+"""
+
+
+class _LocalRenderTask(object):
+    """
+    The render job of a script, rendered locally. Nothing is written.
+    """
+
+    def __init__(self, initDict, filePath):
+        self._initDict = initDict
+        self._filePath = filePath
+
+    def startTask(self):
+        pass
+
+
+class Submission(object):
+    kNukeRender = "Nuke Render"
+    kCommandLine = "Command Line"
+
+    def __init__(self):
+        self._children = []
+        self._error = None
+
+    def initialise(self):
+        pass
+
+    def children(self):
+        return list(self._children)
+
+    def addChild(self, child):
+        self._children.append(child)
+
+    def addJob(self, jobType, initDict, filePath):
+        return _LocalRenderTask(initDict, filePath)
+
+    def addToQueue(self):
+        pass
+
+    def setError(self, error):
+        self._error = error
+
+    def error(self):
+        return self._error
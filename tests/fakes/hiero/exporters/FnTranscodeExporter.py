@@ -0,0 +1,35 @@
+"""
+Stand-in for ``hiero.exporters.FnTranscodeExporter``.
+"""
+
+import hiero.core
+
+from . import FnExternalRender
+
+
+class TranscodeExporter(FnExternalRender.NukeRenderTask):
+    def writeAudio(self):
+        return None
+
+
+class TranscodePreset(hiero.core.TaskPresetBase):
+    def __init__(self, name, properties):
+        hiero.core.TaskPresetBase.__init__(self, TranscodeExporter, name)
+        self._properties.update(
+            {
+                "file_type": "dpx",
+                "dpx": {"datatype": "10 bit"},
+                "colourspace": "default",
+                "channels": "rgb",
+                "views": ["all"],
+                "reformat": {"to_type": "None"},
+                "burninDataEnabled": False,
+                "burninData": {},
+                "additionalNodesEnabled": False,
+                "additionalNodesData": [],
+                "includeEffects": True,
+                "includeAnnotations": False,
+                "writeNodeName": "Write_{ext}",
+            }
+        )
+        self._properties.update(properties)
@@ -0,0 +1,16 @@
+"""
+Stand-in for ``hiero.ui.FnUIProperty``.
+"""
+
+
+class UIProperty(object):
+    def __init__(self, key, value, dictionary, label=None, tooltip=None):
+        self._key = key
+        self._dictionary = dictionary
+        dictionary.setdefault(key, value)
+
+
+class UIPropertyFactory(object):
+    @staticmethod
+    def create(type, key, value, dictionary, label=None, tooltip=None):
+        return UIProperty(key, value, dictionary, label, tooltip)
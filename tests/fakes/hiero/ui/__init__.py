@@ -0,0 +1,20 @@
+"""
+Stand-in for ``hiero.ui``.
+"""
+
+__all__ = []
+
+
+class _TaskUIRegistry(object):
+    def registerTaskUI(self, presetType, uiType):
+        pass
+
+    def registerProcessorUI(self, presetType, uiType):
+        pass
+
+
+taskUIRegistry = _TaskUIRegistry()
+
+
+def mainWindow():
+    return None
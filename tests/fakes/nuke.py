@@ -0,0 +1,11 @@
+"""
+Stand-in for the ``nuke`` module of Nuke Studio.
+"""
+
+NUKE_VERSION_MAJOR = 13
+NUKE_VERSION_MINOR = 2
+NUKE_VERSION_RELEASE = 5
+NUKE_VERSION_STRING = "13.2v5"
+
+WRITE_NON_DEFAULT_ONLY = 0x1
+TO_SCRIPT = 0x2
@@ -0,0 +1,19 @@
+"""
+``sgtk`` is an alias of ``tank``, like in the real core.
+"""
+
+import sys
+
+import tank
+import tank.util
+import tank.platform
+import tank.platform.qt
+
+sys.modules.update(
+    {
+        "sgtk": tank,
+        "sgtk.util": tank.util,
+        "sgtk.platform": tank.platform,
+        "sgtk.platform.qt": tank.platform.qt,
+    }
+)
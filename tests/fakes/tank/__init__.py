@@ -0,0 +1,13 @@
+"""
+Stand-in for the Toolkit core API (``tank``, aliased as ``sgtk``), covering
+what the app and its hooks use during an export.
+"""
+
+from .errors import TankError, TankHookMethodDoesNotExistError
+from .hook import Hook, get_hook_baseclass
+from .context import Context
+from .api import Tank
+from . import errors
+from . import util
+from . import platform
+from . import templatekey
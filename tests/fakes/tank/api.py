@@ -0,0 +1,77 @@
+"""
+Stand-in for the ``tank.Tank`` api instance of a project.
+"""
+
+import os
+
+from .context import Context
+
+
+class TemplatePath(object):
+    def __init__(self, name, fields=None):
+        self.name = name
+        self._fields = fields or {}
+
+    def apply_fields(self, fields):
+        if "version" in fields and len(fields) == 1:
+            return "%03d" % fields["version"]
+        return "/".join(str(value) for value in fields.values())
+
+    def get_fields(self, path):
+        return dict(self._fields)
+
+
+class _PipelineConfiguration(object):
+    def __init__(self, path):
+        self._path = path
+
+    def get_path(self):
+        return self._path
+
+    def is_auto_path(self):
+        return False
+
+    def get_project_disk_name(self):
+        return "bench"
+
+
+class Tank(object):
+    """
+    The api of a project, talking to the connection it is given.
+    """
+
+    def __init__(self, shotgun, project, root):
+        self.shotgun = shotgun
+        self.project = project
+        self.roots = {"primary": root}
+        self.pipeline_configuration = _PipelineConfiguration(root)
+        self.templates = {
+            "template_version": TemplatePath("version"),
+            "template_plate_path": TemplatePath(
+                "hiero_plate_path", {"output": "plate", "colorspace": "linear"}
+            ),
+        }
+        self._current_user = None
+
+    def template_from_path(self, path):
+        if path and os.path.abspath(path).startswith(
+            os.path.abspath(self.roots["primary"])
+        ):
+            return self.templates["template_plate_path"]
+        return None
+
+    def context_from_entity(self, entity_type, entity_id):
+        entity = self.shotgun.find_one(
+            entity_type, [["id", "is", entity_id]], ["code", "project"]
+        )
+        if entity is not None:
+            entity = {"type": entity_type, "id": entity_id, "name": entity.get("code")}
+        return Context(self, project=self.project, entity=entity)
+
+    def context_from_path(self, path):
+        return Context(self, project=self.project)
+
+    def create_filesystem_structure(self, entity_type, entity_ids, engine=None):
+        for entity_id in entity_ids:
+            self.shotgun.find_one(entity_type, [["id", "is", entity_id]], ["code"])
+        return len(entity_ids)
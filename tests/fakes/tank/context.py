@@ -0,0 +1,31 @@
+"""
+Stand-in for ``tank.context``.
+"""
+
+import json
+
+
+class Context(object):
+    def __init__(self, tk, project=None, entity=None, step=None, task=None, user=None):
+        self.tank = tk
+        self.project = project
+        self.entity = entity
+        self.step = step
+        self.task = task
+        self.user = user
+
+    def to_dict(self):
+        return {
+            "project": self.project,
+            "entity": self.entity,
+            "step": self.step,
+            "task": self.task,
+            "user": self.user,
+        }
+
+    @classmethod
+    def from_dict(cls, tk, data):
+        return cls(tk, **data)
+
+    def serialize(self, with_user_credentials=True, use_json=False):
+        return json.dumps(self.to_dict())
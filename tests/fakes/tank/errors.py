@@ -0,0 +1,11 @@
+"""
+Stand-in for ``tank.errors``.
+"""
+
+
+class TankError(Exception):
+    pass
+
+
+class TankHookMethodDoesNotExistError(TankError):
+    pass
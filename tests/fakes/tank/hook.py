@@ -0,0 +1,73 @@
+"""
+Stand-in for ``tank.hook``: the hook base class and hook loading.
+"""
+
+import os
+import sys
+import importlib.util
+
+from .errors import TankError
+
+# base classes of the hooks being loaded, see get_hook_baseclass()
+_base_classes = []
+
+
+class Hook(object):
+    def __init__(self, parent):
+        self.__parent = parent
+
+    @property
+    def parent(self):
+        return self.__parent
+
+    @property
+    def sgtk(self):
+        return self.__parent.sgtk
+
+    @property
+    def tank(self):
+        return self.__parent.tank
+
+    @property
+    def logger(self):
+        return self.__parent.logger
+
+
+def get_hook_baseclass():
+    """
+    Returns the class the hook being loaded should derive from.
+    """
+    return _base_classes[-1] if _base_classes else Hook
+
+
+def load_hook_class(path, base_class=None):
+    """
+    Loads a hook file and returns the hook class it defines, which derives
+    from ``base_class`` or, failing that, from :class:`Hook`.
+    """
+    base_class = base_class or Hook
+    name = "tk_hook_%d_%s" % (
+        len(sys.modules),
+        os.path.splitext(os.path.basename(path))[0],
+    )
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+
+    _base_classes.append(base_class)
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        _base_classes.pop()
+
+    for valid_base in (base_class, Hook):
+        found = [
+            cls
+            for cls in vars(module).values()
+            if isinstance(cls, type)
+            and cls.__module__ == name
+            and issubclass(cls, valid_base)
+        ]
+        if found:
+            return found[-1]
+
+    raise TankError("No hook class found in %s" % path)
@@ -0,0 +1,131 @@
+"""
+Stand-in for ``tank.platform``: the application base class.
+"""
+
+import os
+import logging
+
+from ..hook import load_hook_class
+from ..errors import TankHookMethodDoesNotExistError
+from . import qt
+
+
+class Application(object):
+    """
+    An app instance with its settings, running in an engine.
+
+    :param engine: The engine the app runs in.
+    :param tk: The :class:`tank.Tank` of the project.
+    :param context: The context of the app.
+    :param dict settings: The app settings.
+    :param dict hook_roots: The folders the ``{self}`` and ``{config}``
+        tokens of hook paths resolve to.
+    :param str cache_location: The app's cache folder.
+    :param dict frameworks: The frameworks of the app, by name.
+    """
+
+    def __init__(
+        self, engine, tk, context, settings, hook_roots, cache_location, frameworks=None
+    ):
+        self.__engine = engine
+        self.__tk = tk
+        self.__context = context
+        self.__settings = settings
+        self.__hook_roots = hook_roots
+        self.__cache_location = cache_location
+        self.__frameworks = frameworks or {}
+        self.__hook_classes = {}
+        self.logger = logging.getLogger("tk-hiero-export")
+
+    def init_app(self):
+        pass
+
+    @property
+    def shotgun(self):
+        return self.__tk.shotgun
+
+    @property
+    def sgtk(self):
+        return self.__tk
+
+    tank = sgtk
+
+    @property
+    def context(self):
+        return self.__context
+
+    @property
+    def engine(self):
+        return self.__engine
+
+    @property
+    def frameworks(self):
+        return self.__frameworks
+
+    @property
+    def cache_location(self):
+        return self.__cache_location
+
+    def get_setting(self, key, default=None):
+        return self.__settings.get(key, default)
+
+    def get_template(self, key):
+        return self.__tk.templates.get(key)
+
+    def execute_hook(self, key, **kwargs):
+        return self.__execute_hook_method(key, "execute", **kwargs)
+
+    def execute_hook_method(self, key, method_name, **kwargs):
+        return self.__execute_hook_method(key, method_name, **kwargs)
+
+    def create_hook_instance(self, hook_expression, base_class=None):
+        return self.__hook_class(hook_expression, base_class)(self)
+
+    def __execute_hook_method(self, key, method_name, base_class=None, **kwargs):
+        hook = self.__hook_class(self.get_setting(key), base_class)(self)
+        method = getattr(hook, method_name, None)
+        if method is None:
+            raise TankHookMethodDoesNotExistError(
+                "Hook %s has no method %s" % (key, method_name)
+            )
+        return method(**kwargs)
+
+    def __hook_class(self, setting, base_class):
+        """
+        Returns the class of a hook setting, resolving the inheritance chain
+        of ``path:path`` settings. Classes are cached, a new hook instance is
+        created for every call, like the real thing.
+        """
+        cache_key = (setting, base_class)
+        if cache_key not in self.__hook_classes:
+            cls = base_class
+            for path in setting.split(":"):
+                cls = load_hook_class(self.__hook_path(path), cls)
+            self.__hook_classes[cache_key] = cls
+        return self.__hook_classes[cache_key]
+
+    def __hook_path(self, path):
+        for token, root in self.__hook_roots.items():
+            path = path.replace("{%s}" % token, root)
+        if not os.path.isabs(path):
+            # legacy form, a hook name in the app's hooks folder
+            path = os.path.join(self.__hook_roots["self"], path + ".py")
+        return path
+
+    def log_debug(self, msg):
+        self.logger.debug(msg)
+
+    def log_info(self, msg):
+        self.logger.info(msg)
+
+    def log_warning(self, msg):
+        self.logger.warning(msg)
+
+    def log_error(self, msg):
+        self.logger.error(msg)
+
+    def log_exception(self, msg):
+        self.logger.exception(msg)
+
+    def log_metric(self, action, log_version=False):
+        pass
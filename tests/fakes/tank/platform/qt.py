@@ -0,0 +1,54 @@
+"""
+Stand-in for ``tank.platform.qt``. No widget is ever shown, every Qt name
+resolves to an inert object.
+"""
+
+
+class _QtStub(object):
+    def __init__(self, name="Qt"):
+        self._name = name
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _QtStub("%s.%s" % (self._name, name))
+
+    def __call__(self, *args, **kwargs):
+        return _QtStub(self._name)
+
+    def __repr__(self):
+        return "<%s>" % self._name
+
+
+class _ByteArray(object):
+    def __init__(self):
+        self._data = b""
+
+    def data(self):
+        return self._data
+
+
+class _Buffer(object):
+    """
+    The in memory device images are saved to.
+    """
+
+    def __init__(self, data):
+        self._data = data
+
+    def open(self, mode):
+        self._data._data = b""
+        return True
+
+    def write(self, data):
+        self._data._data += bytes(data)
+        return len(data)
+
+    def close(self):
+        pass
+
+
+QtCore = _QtStub("QtCore")
+QtCore.QByteArray = _ByteArray
+QtCore.QBuffer = _Buffer
+QtGui = _QtStub("QtGui")
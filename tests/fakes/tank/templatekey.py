@@ -0,0 +1,3 @@
+"""
+Stand-in for ``tank.templatekey``.
+"""
@@ -0,0 +1,54 @@
+"""
+Stand-in for ``tank.util``.
+"""
+
+import sys
+
+
+def is_linux():
+    return sys.platform.startswith("linux")
+
+
+def is_windows():
+    return sys.platform == "win32"
+
+
+def is_macos():
+    return sys.platform == "darwin"
+
+
+def get_published_file_entity_type(tk):
+    return "PublishedFile"
+
+
+def get_current_user(tk):
+    # cached for the session, like the real thing
+    if tk._current_user is None:
+        tk._current_user = tk.shotgun.find_one(
+            "HumanUser", [["login", "is", "bench"]], ["login", "name"]
+        )
+    return tk._current_user
+
+
+def register_publish(tk, context, path, name, version_number, **kwargs):
+    sg = tk.shotgun
+    publish_type = sg.find_one(
+        "PublishedFileType", [["code", "is", kwargs.get("published_file_type")]]
+    )
+    if publish_type is None:
+        publish_type = sg.create(
+            "PublishedFileType", {"code": kwargs.get("published_file_type")}
+        )
+
+    data = {
+        "code": name,
+        "name": name,
+        "path": {"local_path": path},
+        "version_number": version_number,
+        "project": context.project,
+        "entity": context.entity,
+        "published_file_type": publish_type,
+    }
+    if kwargs.get("task"):
+        data["task"] = kwargs["task"]
+    return sg.create("PublishedFile", data)
@@ -0,0 +1,7 @@
+"""
+Stand-in for the ``six`` module vendored with the core.
+"""
+
+PY2 = False
+PY3 = True
+string_types = (str,)
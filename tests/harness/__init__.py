@@ -0,0 +1,22 @@
+"""
+A headless harness running the app's exports outside Nuke Studio.
+
+Stand-ins for the Hiero, Nuke and toolkit modules live in ``tests/fakes``
+and the site is an in-memory connection counting the api calls, so the
+processor, the shot updater and the exporters run end to end and can be
+timed at any number of shots.
+"""
+
+from .app import install_fakes
+
+install_fakes()
+
+from .shotgun import FakeShotgun  # noqa: E402
+from .app import create_app, DeadlineSettings  # noqa: E402
+from .timeline import build_sequence, shot_items  # noqa: E402
+from .runner import (  # noqa: E402
+    ExportResult,
+    make_preset,
+    make_deadline_submission,
+    run_export,
+)
@@ -0,0 +1,201 @@
+"""
+Bootstraps the app against the stand-ins: an engine, the frameworks it
+needs and a project backed by the in-memory connection.
+"""
+
+import os
+import sys
+import itertools
+import importlib.util
+
+import yaml
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+FAKES_ROOT = os.path.join(REPO_ROOT, "tests", "fakes")
+FIXTURES_ROOT = os.path.join(REPO_ROOT, "tests", "fixtures")
+
+
+def install_fakes():
+    """
+    Makes the Hiero, Nuke and toolkit stand-ins importable, unless the real
+    modules are available.
+    """
+    try:
+        import hiero.core  # noqa: F401
+    except ImportError:
+        sys.path.insert(0, FAKES_ROOT)
+
+
+class FakeEngine(object):
+    """
+    The engine the app runs in, with the other apps of the environment.
+    """
+
+    def __init__(self, apps=None):
+        self.apps = apps or {}
+        self.name = "tk-hiero"
+        self.has_ui = True
+
+    def show_busy(self, title, details):
+        pass
+
+    def clear_busy(self):
+        pass
+
+
+class FakeNozmovApp(object):
+    """
+    The movie app the Deadline submission relies on.
+    """
+
+    def calc_output_filepath(self, path, preset_name):
+        return os.path.splitext(path)[0] + "_%s.mov" % preset_name
+
+    def get_setting(self, key, default=None):
+        return "/deadline/%s.py" % key
+
+
+class _ColorSpace(object):
+    def get_read_colorspace_name(self, read_node):
+        return read_node.knob("colorspace").value()
+
+
+class _ColorSpaceModule(object):
+    ColorSpace = _ColorSpace
+
+
+class FakeNozonFramework(object):
+    def import_module(self, name):
+        if name != "colorspace":
+            raise ImportError(name)
+        return _ColorSpaceModule
+
+
+class _Jobs(object):
+    def __init__(self):
+        self.submitted = []
+        self._ids = itertools.count(1)
+
+    def SubmitJob(self, job_info, plugin_info):
+        self.submitted.append((job_info, plugin_info))
+        return {"_id": "job%d" % next(self._ids)}
+
+
+class _DeadlineConnection(object):
+    def __init__(self):
+        self.Jobs = _Jobs()
+
+
+class FakeDeadlineFramework(object):
+    def __init__(self):
+        self.connection = _DeadlineConnection()
+
+    def deadline_connection(self):
+        return self.connection
+
+
+class DeadlineSettings(object):
+    """
+    The submission settings normally read from the Deadline ini file.
+    """
+
+    def __init__(self, values=None):
+        self._values = {
+            "BatchName": "bench",
+            "FramesPerTask": 10,
+            "Priority": 50,
+            "SubmitScript": "false",
+            "SubmitSuspended": "false",
+            "CreateFirstCompOutput": "false",
+        }
+        self._values.update(values or {})
+
+    def value(self, key):
+        return self._values.get(key, "")
+
+
+def default_settings():
+    """
+    Returns the app settings with the default values of info.yml.
+    """
+    with open(os.path.join(REPO_ROOT, "info.yml")) as fh:
+        manifest = yaml.safe_load(fh)
+
+    settings = {}
+    for name, spec in manifest["configuration"].items():
+        if "default_value" in spec:
+            settings[name] = spec["default_value"]
+    settings.update(
+        {
+            "nuke_script_toolkit_write_nodes": [],
+            "custom_template_fields": [],
+            "template_plate_path": "hiero_plate_path",
+            "template_nuke_script_path": "hiero_nuke_script_path",
+            "template_render_path": "hiero_render_path",
+            "template_version": "version",
+        }
+    )
+    return settings
+
+
+def load_app_module():
+    """
+    Imports the app's entry point, registering the exporters with Hiero.
+    """
+    install_fakes()
+    name = "tk_hiero_export_app"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            name, os.path.join(REPO_ROOT, "app.py")
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+def create_app(shotgun, root, settings=None, cache_location=None):
+    """
+    Creates and initializes the app for a project on the given connection.
+
+    :param shotgun: The :class:`~harness.shotgun.FakeShotgun` connection.
+    :param str root: The project root the exports are written to.
+    :param dict settings: Settings overriding the info.yml defaults.
+    :param str cache_location: The app's cache folder, defaults to a folder
+        in the project root.
+    """
+    module = load_app_module()
+
+    import tank
+
+    project = {"type": "Project", "id": 1, "name": "bench"}
+    if not shotgun.records("Project"):
+        shotgun.seed("Project", {"name": "bench", "tank_name": "bench"})
+        shotgun.seed("HumanUser", {"login": "bench", "name": "Bench User"})
+        shotgun.seed("TaskTemplate", {"code": "Basic shot template"})
+        shotgun.seed("Step", {"code": "Comp", "name": "Comp"})
+
+    app_settings = default_settings()
+    app_settings.update(settings or {})
+
+    tk = tank.Tank(shotgun, project, root)
+    engine = FakeEngine({"tk-multi-nozmov": FakeNozmovApp()})
+    frameworks = {
+        "tk-framework-nozon": FakeNozonFramework(),
+        "tk-framework-deadline": FakeDeadlineFramework(),
+    }
+    hook_roots = {
+        "self": os.path.join(REPO_ROOT, "hooks"),
+        "config": os.path.join(FIXTURES_ROOT, "config", "hooks"),
+    }
+    app = module.HieroExport(
+        engine,
+        tk,
+        tank.Context(tk, project=project),
+        app_settings,
+        hook_roots,
+        cache_location or os.path.join(root, ".cache"),
+        frameworks,
+    )
+    app.init_app()
+    return app
@@ -0,0 +1,222 @@
+"""
+Runs exports of synthetic sequences and measures them.
+"""
+
+import time
+import collections
+
+import hiero.core
+from hiero.exporters.FnSubmission import Submission
+
+
+class ExportResult(object):
+    """
+    The measurements of an export.
+
+    :ivar int shots: The number of exported shots, items sharing a name
+        count once.
+    :ivar float wall_time: Seconds spent in the whole export.
+    :ivar times: Seconds spent per phase, keyed by phase name, for instance
+        ``processTaskPreQueue`` or ``ShotgunShotUpdater.taskStep``.
+    :ivar calls: Api calls made per phase.
+    :ivar sg_calls: Api calls made during the export, by method.
+    :ivar sg_entity_calls: Api calls made during the export, by method and
+        entity type.
+    :ivar tasks: The export tasks that ran.
+    """
+
+    def __init__(self, shots):
+        self.shots = shots
+        self.wall_time = 0.0
+        self.times = collections.OrderedDict()
+        self.calls = collections.Counter()
+        self.sg_calls = collections.Counter()
+        self.sg_entity_calls = collections.Counter()
+        self.tasks = []
+
+    @property
+    def sg_call_count(self):
+        return sum(self.sg_calls.values())
+
+    @property
+    def sg_calls_per_shot(self):
+        return float(self.sg_call_count) / max(self.shots, 1)
+
+    def as_dict(self):
+        return {
+            "shots": self.shots,
+            "wall_time": self.wall_time,
+            "times": dict(self.times),
+            "calls": dict(self.calls),
+            "sg_calls": dict(self.sg_calls),
+            "sg_call_count": self.sg_call_count,
+            "sg_calls_per_shot": self.sg_calls_per_shot,
+        }
+
+
+class _Meter(object):
+    """
+    Accumulates the time and api calls of the phases of an export.
+    """
+
+    def __init__(self, shotgun, result):
+        self._shotgun = shotgun
+        self._result = result
+
+    def measure(self, phase, fn, *args, **kwargs):
+        calls = self._shotgun.call_count()
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._result.times[phase] = self._result.times.get(phase, 0.0) + (
+                time.perf_counter() - start
+            )
+            self._result.calls[phase] += self._shotgun.call_count() - calls
+
+
+def make_preset(
+    app,
+    root,
+    transcode=True,
+    nuke_script=True,
+    audio=False,
+    collate=False,
+    cut_type="",
+    properties=None,
+):
+    """
+    Returns a shot processor preset exporting plates, Nuke scripts and
+    audio the way a typical project template does.
+
+    :param app: The app instance.
+    :param str root: The export root.
+    :param bool transcode: Whether to transcode plates.
+    :param bool nuke_script: Whether to write Nuke scripts.
+    :param bool audio: Whether to export audio.
+    :param bool collate: Whether to collate the shots of the upper tracks.
+    :param str cut_type: The cut type of the created Cut entities.
+    :param dict properties: Extra ``shotgunShotCreateProperties``.
+    """
+    from tk_hiero_export import (
+        ShotgunShotProcessorPreset,
+        ShotgunTranscodePreset,
+        ShotgunNukeShotPreset,
+        ShotgunAudioPreset,
+    )
+
+    template = []
+    if nuke_script:
+        template.append(
+            (
+                "{sequence}/{shot}/nuke/{shot}_comp_{tk_version}.nk",
+                ShotgunNukeShotPreset("", {"readPaths": [], "writePaths": []}),
+            )
+        )
+    if transcode:
+        template.append(
+            (
+                "{sequence}/{shot}/plates/{shot}_plate_{tk_version}.mov",
+                ShotgunTranscodePreset(
+                    "",
+                    {
+                        "file_type": "mov",
+                        "mov": {"encoder": app.get_default_encoder_name()},
+                    },
+                ),
+            )
+        )
+    if audio:
+        template.append(
+            (
+                "{sequence}/{shot}/audio/{shot}_audio_{tk_version}.wav",
+                ShotgunAudioPreset("", {}),
+            )
+        )
+
+    create_properties = {
+        "collateTracks": collate,
+        "collateShotNames": collate,
+        "sg_cut_type": cut_type,
+    }
+    create_properties.update(properties or {})
+
+    return ShotgunShotProcessorPreset(
+        "bench",
+        {
+            "exportTemplate": tuple(template),
+            "exportRoot": root,
+            "shotgunShotCreateProperties": create_properties,
+        },
+    )
+
+
+def make_deadline_submission(settings=None, temp_path=None):
+    """
+    Returns a Deadline submission, set up as if the user had accepted the
+    submission dialog.
+
+    :param dict settings: Submission settings overriding the defaults.
+    :param str temp_path: The Deadline temp folder.
+    """
+    from tk_hiero_export import ShotgunDeadlineRenderSubmission
+    from .app import DeadlineSettings
+
+    submission = ShotgunDeadlineRenderSubmission()
+    submission.settings = DeadlineSettings(settings)
+    submission.deadlineTemp = temp_path or "/tmp"
+    return submission
+
+
+def run_export(app, items, preset, submission=None):
+    """
+    Exports items the way Nuke Studio does: the processor creates and
+    pre-processes the tasks, then each task is started, stepped until done
+    and finished.
+
+    :param app: The app instance.
+    :param items: The track items to export.
+    :param preset: The shot processor preset, see :func:`make_preset`.
+    :param submission: The submission the tasks render with, a local one by
+        default.
+    :returns: An :class:`ExportResult`.
+    """
+    from tk_hiero_export import ShotgunShotProcessor
+
+    shotgun = app.sgtk.shotgun
+    result = ExportResult(len(set(item.name() for item in items)))
+    meter = _Meter(shotgun, result)
+    submission = submission or Submission()
+
+    calls = collections.Counter(shotgun.calls)
+    entity_calls = collections.Counter(shotgun.entity_calls)
+    start = time.perf_counter()
+
+    processor = meter.measure(
+        "ShotgunShotProcessor.__init__", ShotgunShotProcessor, preset, submission, True
+    )
+
+    # time the pre-queue step apart from the task creation around it
+    pre_queue = processor.processTaskPreQueue
+    processor.processTaskPreQueue = lambda: meter.measure(
+        "processTaskPreQueue", pre_queue
+    )
+
+    wrappers = [hiero.core.ItemWrapper(item) for item in items]
+    meter.measure("startProcessing", processor.startProcessing, wrappers)
+    result.times["startProcessing"] -= result.times.get("processTaskPreQueue", 0.0)
+    result.calls["startProcessing"] -= result.calls["processTaskPreQueue"]
+
+    for group in submission.children():
+        for task in group.children():
+            result.tasks.append(task)
+            name = type(task).__name__
+            meter.measure("%s.startTask" % name, task.startTask)
+            while meter.measure("%s.taskStep" % name, task.taskStep):
+                pass
+            meter.measure("%s.finishTask" % name, task.finishTask)
+
+    result.wall_time = time.perf_counter() - start
+    result.sg_calls = collections.Counter(shotgun.calls) - calls
+    result.sg_entity_calls = collections.Counter(shotgun.entity_calls) - entity_calls
+    return result
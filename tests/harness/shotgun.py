@@ -0,0 +1,370 @@
+"""
+In-memory stand-in for a Flow Production Tracking connection.
+
+Implements the subset of the python api used by the app and its hooks,
+counts every call and can add a fixed latency to each of them to mimic the
+round trips to a real site.
+"""
+
+import time
+import itertools
+import threading
+import collections
+
+# the api methods counted as calls
+CALL_METHODS = (
+    "find",
+    "find_one",
+    "create",
+    "update",
+    "delete",
+    "batch",
+    "upload",
+    "upload_thumbnail",
+    "schema_field_read",
+)
+
+
+class ServerCaps(object):
+    def __init__(self, version):
+        self.version = version
+
+
+class FakeShotgun(object):
+    """
+    A connection to an in-memory site.
+
+    :param float latency: Seconds added to every api call.
+    :param tuple server_version: The version reported by ``server_caps``.
+
+    Setting :attr:`online` to False makes every call fail with a
+    ``ConnectionError``, like a site which can't be reached.
+    """
+
+    def __init__(self, latency=0.0, server_version=(8, 0, 0)):
+        self.latency = latency
+        self.online = True
+        self.server_caps = ServerCaps(server_version)
+        self.base_url = "https://bench.shotgrid.invalid"
+        self.calls = collections.Counter()
+        self.entity_calls = collections.Counter()
+        self._records = collections.defaultdict(dict)
+        self._codes = collections.defaultdict(lambda: collections.defaultdict(set))
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self.schema = {
+            "Shot": {
+                "sg_camera_colorspace": [
+                    "linear",
+                    "AlexaV3LogC",
+                    "rec709",
+                    "ACES2065-1",
+                ]
+            }
+        }
+
+    # ---- bookkeeping
+
+    def _call(self, method, entity_type):
+        if not self.online:
+            raise ConnectionError("%s is unreachable" % self.base_url)
+        with self._lock:
+            self.calls[method] += 1
+            self.entity_calls[(method, entity_type)] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def call_count(self):
+        """
+        Returns the total number of api calls made so far.
+        """
+        return sum(self.calls.values())
+
+    def reset_calls(self):
+        with self._lock:
+            self.calls.clear()
+            self.entity_calls.clear()
+
+    def seed(self, entity_type, data):
+        """
+        Adds an entity without counting a call.
+        """
+        return self._create(entity_type, data, None)
+
+    def records(self, entity_type):
+        """
+        Returns every stored entity of a type, for assertions.
+        """
+        with self._lock:
+            return [dict(record) for record in self._records[entity_type].values()]
+
+    # ---- api
+
+    def find(
+        self,
+        entity_type,
+        filters,
+        fields=None,
+        order=None,
+        filter_operator=None,
+        limit=0,
+        **kwargs
+    ):
+        self._call("find", entity_type)
+        return self._find(entity_type, filters, fields, order, filter_operator, limit)
+
+    def find_one(
+        self,
+        entity_type,
+        filters,
+        fields=None,
+        order=None,
+        filter_operator=None,
+        **kwargs
+    ):
+        self._call("find_one", entity_type)
+        found = self._find(entity_type, filters, fields, order, filter_operator, 1)
+        return found[0] if found else None
+
+    def create(self, entity_type, data, return_fields=None):
+        self._call("create", entity_type)
+        return self._create(entity_type, data, return_fields)
+
+    def update(self, entity_type, entity_id, data, multi_entity_update_modes=None):
+        self._call("update", entity_type)
+        return self._update(entity_type, entity_id, data)
+
+    def delete(self, entity_type, entity_id):
+        self._call("delete", entity_type)
+        with self._lock:
+            return self._records[entity_type].pop(entity_id, None) is not None
+
+    def batch(self, requests):
+        self._call("batch", ",".join(sorted(set(r["entity_type"] for r in requests))))
+        results = []
+        for request in requests:
+            request_type = request["request_type"]
+            if request_type == "create":
+                results.append(
+                    self._create(
+                        request["entity_type"],
+                        request["data"],
+                        request.get("return_fields"),
+                    )
+                )
+            elif request_type == "update":
+                results.append(
+                    self._update(
+                        request["entity_type"], request["entity_id"], request["data"]
+                    )
+                )
+            elif request_type == "delete":
+                with self._lock:
+                    self._records[request["entity_type"]].pop(
+                        request["entity_id"], None
+                    )
+                results.append(True)
+            else:
+                raise ValueError("Unknown batch request type %s" % request_type)
+        return results
+
+    def upload(
+        self,
+        entity_type,
+        entity_id,
+        path,
+        field_name=None,
+        display_name=None,
+        tag_list=None,
+    ):
+        self._call("upload", entity_type)
+        return self._create("Attachment", {"this_file": path}, None)["id"]
+
+    def upload_thumbnail(self, entity_type, entity_id, path, **kwargs):
+        self._call("upload_thumbnail", entity_type)
+        return self._create("Attachment", {"this_file": path}, None)["id"]
+
+    def schema_field_read(self, entity_type, field_name=None, project_entity=None):
+        self._call("schema_field_read", entity_type)
+        fields = self.schema.get(entity_type, {})
+        if field_name is not None:
+            fields = {field_name: fields.get(field_name, [])}
+        return dict(
+            (
+                name,
+                {
+                    "data_type": {"value": "list"},
+                    "properties": {"valid_values": {"value": list(values)}},
+                },
+            )
+            for (name, values) in fields.items()
+        )
+
+    # ---- storage
+
+    def _create(self, entity_type, data, return_fields):
+        with self._lock:
+            entity_id = next(self._ids)
+            record = {"type": entity_type, "id": entity_id}
+            record.update(_links(data))
+            self._records[entity_type][entity_id] = record
+            if "code" in record:
+                self._codes[entity_type][record["code"]].add(entity_id)
+            result = self._format(record, list(data.keys()) + list(return_fields or []))
+        return result
+
+    def _update(self, entity_type, entity_id, data):
+        with self._lock:
+            record = self._records[entity_type].get(entity_id)
+            if record is None:
+                raise ValueError("%s %s does not exist" % (entity_type, entity_id))
+            if "code" in data and "code" in record:
+                self._codes[entity_type][record["code"]].discard(entity_id)
+            record.update(_links(data))
+            if "code" in record:
+                self._codes[entity_type][record["code"]].add(entity_id)
+            return self._format(record, list(data.keys()))
+
+    def _find(self, entity_type, filters, fields, order, filter_operator, limit):
+        with self._lock:
+            records = self._records[entity_type]
+
+            # narrow down the usual lookups by id or name
+            candidates = None
+            if filter_operator in (None, "all"):
+                for condition in filters:
+                    if not isinstance(condition, (list, tuple)):
+                        continue
+                    if list(condition[:2]) == ["id", "is"]:
+                        candidates = (
+                            [records[condition[2]]] if condition[2] in records else []
+                        )
+                        break
+                    if list(condition[:2]) == ["code", "is"]:
+                        candidates = [
+                            records[entity_id]
+                            for entity_id in sorted(
+                                self._codes[entity_type].get(condition[2], ())
+                            )
+                        ]
+                        break
+            if candidates is None:
+                candidates = list(records.values())
+
+            found = [
+                record
+                for record in candidates
+                if self._matches(record, filters, filter_operator or "all")
+            ]
+
+            for sort in reversed(order or []):
+                found.sort(
+                    key=lambda record: _sort_key(record.get(sort["field_name"])),
+                    reverse=sort.get("direction") == "desc",
+                )
+
+            if limit:
+                found = found[:limit]
+
+            return [self._format(record, fields or []) for record in found]
+
+    def _matches(self, record, filters, operator):
+        results = (self._condition(record, condition) for condition in filters)
+        return all(results) if operator == "all" else any(results)
+
+    def _condition(self, record, condition):
+        if isinstance(condition, dict):
+            return self._matches(
+                record, condition["filters"], condition.get("filter_operator", "all")
+            )
+
+        (field, relation) = condition[:2]
+        values = list(condition[2:])
+        value = values[0] if len(values) == 1 else values
+        actual = self._value(record, field)
+
+        if relation == "is":
+            return _equals(actual, value)
+        if relation == "is_not":
+            return not _equals(actual, value)
+        if relation == "in":
+            return any(_equals(actual, v) for v in value)
+        if relation == "not_in":
+            return not any(_equals(actual, v) for v in value)
+        if relation == "greater_than":
+            return actual is not None and actual > value
+        raise ValueError("Unsupported filter relation %s" % relation)
+
+    def _value(self, record, field):
+        """
+        Returns the value of a field, following ``link.Type.field`` paths.
+        """
+        parts = field.split(".")
+        value = record.get(parts[0])
+        while len(parts) >= 3:
+            if not isinstance(value, dict):
+                return None
+            linked = self._records[value["type"]].get(value["id"])
+            if linked is None:
+                return None
+            parts = parts[2:]
+            value = linked.get(parts[0])
+        return value
+
+    def _format(self, record, fields):
+        result = {"type": record["type"], "id": record["id"]}
+        for field in fields:
+            value = self._value(record, field)
+            if isinstance(value, dict) and "type" in value and "id" in value:
+                value = self._link(value)
+            elif isinstance(value, list):
+                value = [
+                    self._link(v) if isinstance(v, dict) and "id" in v else v
+                    for v in value
+                ]
+            result[field] = value
+        return result
+
+    def _link(self, entity):
+        linked = self._records[entity["type"]].get(entity["id"], {})
+        return {
+            "type": entity["type"],
+            "id": entity["id"],
+            "name": linked.get("code", linked.get("name")),
+        }
+
+
+def _links(data):
+    """
+    Returns a copy of entity data, with the entity dictionaries reduced to
+    their type and id as the server would store them.
+    """
+    stored = {}
+    for key, value in data.items():
+        if isinstance(value, dict) and "type" in value and "id" in value:
+            value = {"type": value["type"], "id": value["id"]}
+        elif isinstance(value, list):
+            value = [
+                (
+                    {"type": v["type"], "id": v["id"]}
+                    if isinstance(v, dict) and "type" in v and "id" in v
+                    else v
+                )
+                for v in value
+            ]
+        stored[key] = value
+    return stored
+
+
+def _equals(actual, value):
+    if isinstance(value, dict) and "id" in value:
+        return (
+            isinstance(actual, dict)
+            and actual.get("type") == value.get("type")
+            and actual.get("id") == value.get("id")
+        )
+    return actual == value
+
+
+def _sort_key(value):
+    return (value is None, value)
@@ -0,0 +1,91 @@
+"""
+Builds synthetic sequences to export.
+"""
+
+import hiero.core
+
+# statuses cycled through the shots, see the status map of the shot updater
+STATUS_TAGS = ("Ready To Start", "In Progress", "On Hold", "Final")
+
+
+def build_sequence(
+    shots,
+    name="bench_seq",
+    tracks=1,
+    shot_length=48,
+    handles=24,
+    fps=24,
+    audio=False,
+    update_tag="shotguntype=plate",
+):
+    """
+    Returns a sequence of cut-to-cut shots on one or more video tracks.
+
+    Every track holds the same cut, so that the items of the upper tracks
+    are collated with the items of the bottom one when exported together.
+
+    :param int shots: The number of shots.
+    :param str name: The sequence name.
+    :param int tracks: The number of video tracks.
+    :param int shot_length: The number of frames of each shot.
+    :param int handles: The number of source frames around each shot.
+    :param int fps: The frame rate of the sequence.
+    :param bool audio: Whether to add an audio track linked to the bottom
+        video track.
+    :param str update_tag: The tag marking items as shots to update, see
+        the ``shot_update_tag`` setting.
+    """
+    sequence = hiero.core.Sequence(name)
+    sequence.setFramerate(hiero.core.TimeBase(fps))
+    sequence.setTimecodeStart(86400)
+
+    video_tracks = [
+        sequence.addTrack(hiero.core.VideoTrack("Video %d" % (index + 1)))
+        for index in range(tracks)
+    ]
+    audio_track = None
+    if audio:
+        audio_track = sequence.addTrack(hiero.core.AudioTrack("Audio 1"))
+
+    for index in range(shots):
+        shot_name = "sh%04d" % ((index + 1) * 10)
+        timeline_in = index * shot_length
+        timeline_out = timeline_in + shot_length - 1
+        source_in = handles
+        source_out = handles + shot_length - 1
+
+        for track_index, track in enumerate(video_tracks):
+            clip = hiero.core.Clip(
+                "%s_l%d" % (shot_name, track_index + 1),
+                duration=shot_length + 2 * handles,
+                timecode_start=86400 + index * (shot_length + 2 * handles),
+            )
+            clip.setFramerate(hiero.core.TimeBase(fps))
+
+            item = hiero.core.TrackItem(shot_name)
+            item.setSource(clip)
+            item.setTimes(timeline_in, timeline_out, source_in, source_out)
+            item.addTag(hiero.core.Tag(update_tag))
+            item.addTag(hiero.core.Tag(STATUS_TAGS[index % len(STATUS_TAGS)]))
+            track.addItem(item)
+
+            if audio_track is not None and track_index == 0:
+                audio_item = hiero.core.TrackItem(
+                    shot_name, hiero.core.TrackItem.MediaType.kAudio
+                )
+                audio_item.setSource(clip)
+                audio_item.setTimes(timeline_in, timeline_out, source_in, source_out)
+                audio_track.addItem(audio_item)
+                item.link(audio_item)
+
+    sequence.setInTime(0)
+    sequence.setOutTime(shots * shot_length - 1)
+    return sequence
+
+
+def shot_items(sequence):
+    """
+    Returns the items of every video track, as when the user selects the
+    whole sequence to export.
+    """
+    return [item for track in sequence.videoTracks() for item in track.items()]
@@ -0,0 +1,135 @@
+"""
+Tests of the headless batch exports.
+"""
+
+import os
+import json
+
+import harness
+
+harness.app.load_app_module()
+
+import hiero.core  # noqa: E402
+
+
+def batch_app(tmp_path, shotgun, sequences):
+    app = harness.create_app(shotgun, str(tmp_path))
+    app.engine.has_ui = False
+    preset = harness.make_preset(app, str(tmp_path), nuke_script=False)
+    project = hiero.core.Project(
+        str(tmp_path / "show.hrox"), sequences=sequences, presets=[preset]
+    )
+    hiero.core.addProject(project)
+    return (app, project)
+
+
+def run(app, tmp_path, *args):
+    summary_path = str(tmp_path / "summary.json")
+    code = app.run_batch_export(
+        [str(tmp_path / "show.hrox"), "--preset", "bench", "--summary", summary_path]
+        + list(args)
+    )
+    with open(summary_path) as fh:
+        return (code, json.load(fh))
+
+
+def test_batch_export(tmp_path):
+    shotgun = harness.FakeShotgun()
+    sequences = [harness.build_sequence(3, name="reel_%d" % i) for i in (1, 2, 3)]
+    (app, project) = batch_app(tmp_path, shotgun, sequences)
+
+    (code, summary) = run(
+        app, tmp_path, "--sequence", "reel_1", "--sequence", "reel_3", "--job", "reels"
+    )
+
+    assert code == 0
+    assert summary["status"] == "ok"
+    assert summary["job"] == "reels"
+    assert summary["missing_sequences"] == []
+    assert summary["pending_writes"] == 0
+    [exported] = summary["projects"]
+    assert [s["name"] for s in exported["sequences"]] == ["reel_1", "reel_3"]
+    for sequence in exported["sequences"]:
+        assert sequence["shots"] == 3
+        # the shot updater and the plate of each shot
+        assert sequence["tasks"] == 6
+        assert sequence["failed"] == []
+
+    assert sorted(cut["code"] for cut in shotgun.records("Cut")) == ["reel_1", "reel_3"]
+    # the state of the job is kept apart from the one of the other jobs
+    assert summary["state_location"] == os.path.join(
+        app.cache_location, "batch", "reels"
+    )
+    assert os.path.isdir(summary["state_location"])
+    assert project.closed
+    assert app.batch_job is None
+
+
+def test_missing_sequence(tmp_path):
+    shotgun = harness.FakeShotgun()
+    (app, project) = batch_app(tmp_path, shotgun, [harness.build_sequence(2)])
+
+    (code, summary) = run(app, tmp_path, "--sequence", "reel_9")
+
+    assert code == 1
+    assert summary["status"] == "failed"
+    assert summary["missing_sequences"] == ["reel_9"]
+    assert not shotgun.records("Cut")
+
+
+def test_unknown_preset(tmp_path):
+    shotgun = harness.FakeShotgun()
+    (app, project) = batch_app(tmp_path, shotgun, [harness.build_sequence(2)])
+
+    (code, summary) = run(app, tmp_path, "--preset", "nope")
+
+    assert code == 1
+    assert "nope" in summary["error"]
+    assert project.closed
+
+
+def test_unfinished_task_fails_the_job(tmp_path, monkeypatch):
+    from tk_hiero_export import ShotgunTranscodeExporter
+
+    shotgun = harness.FakeShotgun()
+    (app, project) = batch_app(tmp_path, shotgun, [harness.build_sequence(2)])
+    finish_task = ShotgunTranscodeExporter.finishTask
+
+    def finish_some(task):
+        # the plate of the first shot never reports back
+        if task._item.name() != "sh0010":
+            finish_task(task)
+
+    monkeypatch.setattr(ShotgunTranscodeExporter, "finishTask", finish_some)
+    (code, summary) = run(app, tmp_path)
+
+    assert code == 1
+    assert summary["status"] == "failed"
+    [sequence] = summary["projects"][0]["sequences"]
+    assert sequence["tasks"] == 4
+    [failed] = sequence["failed"]
+    assert "sh0010" in failed["task"]
+    assert failed["error"] == "The task never finished."
+
+
+def test_failing_task_fails_the_job(tmp_path, monkeypatch):
+    from tk_hiero_export import ShotgunTranscodeExporter
+
+    shotgun = harness.FakeShotgun()
+    (app, project) = batch_app(tmp_path, shotgun, [harness.build_sequence(2)])
+    finish_preview_render = ShotgunTranscodeExporter._finish_preview_render
+
+    def fail(task):
+        # the plate of the last shot is the last task
+        if task._item.name() == "sh0020":
+            raise RuntimeError("preview render crashed")
+        finish_preview_render(task)
+
+    monkeypatch.setattr(ShotgunTranscodeExporter, "_finish_preview_render", fail)
+    (code, summary) = run(app, tmp_path)
+
+    assert code == 1
+    assert summary["status"] == "failed"
+    [sequence] = summary["projects"][0]["sequences"]
+    assert [f["error"] for f in sequence["failed"]] == ["preview render crashed"]
+    assert project.closed
@@ -0,0 +1,29 @@
+import pytest
+
+import benchmark
+
+
+@pytest.mark.parametrize("shots", [1, 10])
+def test_local_export(shots):
+    result = benchmark.benchmark(shots)
+    assert result.shots == shots
+    assert not [task.error() for task in result.tasks if task.error()]
+    assert result.sg_call_count > 0
+    assert result.calls["ShotgunShotUpdater.taskStep"] > 0
+
+
+def test_collated_export():
+    result = benchmark.benchmark(10, tracks=2, collate=True)
+    assert result.shots == 10
+    assert not [task.error() for task in result.tasks if task.error()]
+
+
+def test_deadline_export():
+    result = benchmark.benchmark(10, deadline=True, audio=True)
+    assert result.shots == 10
+    assert not [task.error() for task in result.tasks if task.error()]
+
+
+def test_call_counts_per_phase_add_up():
+    result = benchmark.benchmark(10)
+    assert sum(result.calls.values()) == result.sg_call_count
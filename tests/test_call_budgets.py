@@ -0,0 +1,86 @@
+"""
+Budgets of api calls per exported shot.
+
+Each export configuration is run at two sizes against a site adding a
+delay to every call. The difference between both runs is the cost of a
+shot, which must stay within budget so that new hook or exporter code does
+not bring back per-shot round trips.
+"""
+
+import pytest
+
+import benchmark
+
+# seconds added to every api call
+LATENCY = 0.0005
+
+# the sizes of the two exports compared
+SMALL = 4
+LARGE = 12
+
+# api calls the shot updater makes per shot: find and update the Shot,
+# upload its thumbnail, create its folders and update its CutItem
+UPDATER_CALLS_PER_SHOT = 5
+
+# api calls the processor makes per shot before queueing, when creating
+# the CutItems of a Cut
+PRE_QUEUE_CALLS_PER_SHOT = 2
+
+CONFIGS = [
+    # (id, benchmark options, api calls per shot)
+    ("local", {}, 20),
+    ("local-no-cuts", {"cuts": False}, 16),
+    ("local-audio", {"audio": True}, 27),
+    ("collated", {"tracks": 2, "collate": True}, 26),
+    ("deadline", {"deadline": True}, 17),
+    ("deadline-no-cuts", {"deadline": True, "cuts": False}, 15),
+]
+
+
+def _per_shot(small, large, count):
+    return float(count(large) - count(small)) / (LARGE - SMALL)
+
+
+@pytest.fixture(scope="module", params=CONFIGS, ids=[config[0] for config in CONFIGS])
+def exports(request):
+    (name, options, budget) = request.param
+    small = benchmark.benchmark(SMALL, latency=LATENCY, **options)
+    large = benchmark.benchmark(LARGE, latency=LATENCY, **options)
+    return (options, budget, small, large)
+
+
+def test_export_calls_per_shot(exports):
+    (options, budget, small, large) = exports
+    per_shot = _per_shot(small, large, lambda result: result.sg_call_count)
+    assert per_shot <= budget, dict(large.sg_entity_calls)
+
+
+def test_shot_updater_calls_per_shot(exports):
+    (options, budget, small, large) = exports
+    per_shot = _per_shot(
+        small, large, lambda result: result.calls["ShotgunShotUpdater.taskStep"]
+    )
+    assert per_shot <= UPDATER_CALLS_PER_SHOT
+
+
+def test_pre_queue_calls_per_shot(exports):
+    (options, budget, small, large) = exports
+    per_shot = _per_shot(
+        small, large, lambda result: result.calls["processTaskPreQueue"]
+    )
+    if options.get("cuts", True) and not options.get("collate"):
+        assert per_shot <= PRE_QUEUE_CALLS_PER_SHOT
+    else:
+        # no Cut is created
+        assert per_shot == 0
+
+
+def test_schema_is_read_once(exports):
+    (options, budget, small, large) = exports
+    assert small.sg_calls["schema_field_read"] <= 1
+    assert large.sg_calls["schema_field_read"] <= 1
+
+
+def test_latency_is_paid_per_call(exports):
+    (options, budget, small, large) = exports
+    assert large.wall_time >= large.sg_call_count * LATENCY
@@ -0,0 +1,189 @@
+"""
+Property tests of the cut math, on randomly generated shots.
+
+The cut math computed for a list of shots is compared against the per shot
+computation the shot updater used to do, and checked for properties that
+must hold whatever the shots.
+"""
+
+import random
+
+import pytest
+
+import harness
+
+harness.app.load_app_module()
+
+from tk_hiero_export.cut_math import (  # noqa: E402
+    INPUT_COLUMNS,
+    OUTPUT_COLUMNS,
+    compute_cut_math,
+    cut_math_rows,
+)
+
+# the number of random shots of each test
+SHOTS = 2000
+
+
+def random_shot(rng):
+    """
+    Returns the cut math inputs of a random shot.
+    """
+    source_in = rng.randint(0, 500)
+    duration = rng.randint(1, 300)
+    # retimed shots don't have the same source and timeline durations
+    source_duration = duration if rng.random() < 0.8 else rng.randint(1, 600)
+    handles = rng.choice([0, 0, 4, 8, 12])
+    start_frame = rng.choice([0, 0, 1, 1001, 1009])
+    head_in = rng.choice([start_frame, source_in + start_frame - handles])
+    timeline_in = rng.randint(0, 100000)
+    return {
+        "head_in": head_in,
+        "tail_out": head_in + duration + 2 * handles - 1,
+        "source_in": source_in + rng.choice([0.0, 0.25, 0.5]),
+        "source_out": source_in + source_duration - 1,
+        "duration": duration,
+        "timeline_in": timeline_in,
+        "timeline_out": timeline_in + duration - 1,
+        "timecode_start": rng.choice([0, 86400, 90000]),
+        "handles": handles,
+        "start_frame": start_frame,
+        "cut_length": rng.random() < 0.7,
+        "clamp_in_handle": rng.random() < 0.8,
+        "head_room_offset": rng.choice([0, 0, 0, 1000]),
+    }
+
+
+def reference_cut_math(shot):
+    """
+    The cut math of a shot, as computed one shot at a time by the shot
+    updater.
+    """
+    (head_in, tail_out) = (shot["head_in"], shot["tail_out"])
+    handles = shot["handles"]
+    in_handle = handles
+    out_handle = handles
+    startFrame = shot["start_frame"]
+    source_in = int(shot["source_in"])
+    source_out = int(shot["source_out"])
+
+    if shot["clamp_in_handle"] and source_in < in_handle:
+        in_handle = source_in
+
+    if shot["cut_length"]:
+        cut_in = head_in + in_handle
+        cut_out = tail_out - out_handle
+    else:
+        cut_in = source_in + startFrame
+        cut_out = source_out + startFrame
+
+    if startFrame and handles and shot["cut_length"]:
+        head_in = startFrame
+        cut_in = startFrame + in_handle
+        cut_out = cut_in + shot["duration"] - 1
+        tail_out = cut_out + out_handle
+
+    edit_in = shot["timeline_in"] + shot["timecode_start"]
+    edit_out = shot["timeline_out"] + shot["timecode_start"]
+    working_duration = tail_out - head_in + 1
+    head_in -= shot["head_room_offset"]
+    tail_out -= shot["head_room_offset"]
+
+    return {
+        "cut_item_in": cut_in,
+        "cut_item_out": cut_out,
+        "cut_item_duration": cut_out - cut_in + 1,
+        "edit_in": edit_in,
+        "edit_out": edit_out,
+        "edit_duration": edit_out - edit_in + 1,
+        "head_in": head_in,
+        "tail_out": tail_out,
+        "working_duration": working_duration,
+    }
+
+
+def columns(shots):
+    return dict((name, [shot[name] for shot in shots]) for name in INPUT_COLUMNS)
+
+
+@pytest.fixture(params=[1, 2, 3])
+def shots(request):
+    rng = random.Random(request.param)
+    return [random_shot(rng) for _ in range(SHOTS)]
+
+
+def test_same_as_reference(shots):
+    rows = cut_math_rows(compute_cut_math(columns(shots)))
+    assert rows == [reference_cut_math(shot) for shot in shots]
+
+
+def test_shots_are_independent(shots):
+    # computing the shots together or one at a time, in any order, gives
+    # the same result
+    rows = cut_math_rows(compute_cut_math(columns(shots)))
+    order = list(range(len(shots)))
+    random.Random(0).shuffle(order)
+    shuffled = cut_math_rows(compute_cut_math(columns([shots[i] for i in order])))
+    assert [rows[i] for i in order] == shuffled
+    for i in order[:50]:
+        assert cut_math_rows(compute_cut_math(columns([shots[i]]))) == [rows[i]]
+
+
+def test_properties(shots):
+    results = compute_cut_math(columns(shots))
+    assert set(results) == set(OUTPUT_COLUMNS)
+    for shot, row in zip(shots, cut_math_rows(results)):
+        assert row["cut_item_duration"] == row["cut_item_out"] - row["cut_item_in"] + 1
+        assert row["edit_duration"] == row["edit_out"] - row["edit_in"] + 1
+        assert row["edit_duration"] == shot["duration"]
+        # the head room offset doesn't change the working duration
+        assert row["working_duration"] == row["tail_out"] - row["head_in"] + 1
+        if shot["cut_length"]:
+            # the handles are around the cut
+            offset = shot["head_room_offset"]
+            assert row["head_in"] + offset <= row["cut_item_in"]
+            assert row["cut_item_out"] + shot["handles"] == row["tail_out"] + offset
+        else:
+            assert row["cut_item_in"] == int(shot["source_in"]) + shot["start_frame"]
+
+
+def test_empty():
+    results = compute_cut_math(dict((name, []) for name in INPUT_COLUMNS))
+    assert cut_math_rows(results) == []
+
+
+def test_invalid_columns():
+    shot = random_shot(random.Random(0))
+    with pytest.raises(ValueError):
+        compute_cut_math(dict((name, [shot[name]]) for name in INPUT_COLUMNS[1:]))
+    invalid = columns([shot])
+    invalid["handles"] = []
+    with pytest.raises(ValueError):
+        compute_cut_math(invalid)
+
+
+def test_computed_once_per_export(tmp_path):
+    shotgun = harness.FakeShotgun()
+    app = harness.create_app(shotgun, str(tmp_path))
+    sequence = harness.build_sequence(4)
+    preset = harness.make_preset(app, str(tmp_path))
+
+    from tk_hiero_export import ShotgunShotUpdater
+
+    calls = []
+    compute = ShotgunShotUpdater.compute_cut_item_data.__func__
+
+    def count_compute(cls, tasks):
+        calls.append(len(tasks))
+        return compute(cls, tasks)
+
+    ShotgunShotUpdater.compute_cut_item_data = classmethod(count_compute)
+    try:
+        result = harness.run_export(app, harness.shot_items(sequence), preset)
+    finally:
+        ShotgunShotUpdater.compute_cut_item_data = classmethod(compute)
+
+    assert not [task.error() for task in result.tasks if task.error()]
+    assert calls == [4]
+    for shot in shotgun.records("Shot"):
+        assert shot["sg_cut_duration"] == shot["sg_cut_out"] - shot["sg_cut_in"] + 1
@@ -0,0 +1,30 @@
+"""
+Tests of the Deadline submission registered with Nuke Studio.
+"""
+
+import harness
+
+harness.app.load_app_module()
+
+from hiero.exporters.FnSubmission import Submission  # noqa: E402
+
+from tk_hiero_export import ShotgunDeadlineSubmission  # noqa: E402
+
+
+def test_registered_submission_is_a_submission():
+    assert ShotgunDeadlineSubmission.__name__ == "ShotgunDeadlineSubmission"
+    assert issubclass(ShotgunDeadlineSubmission, Submission)
+    assert ShotgunDeadlineSubmission.kNukeRender == "deadline_submission"
+
+
+def test_creates_the_deadline_submission():
+    from tk_hiero_export.deadline_submission import ShotgunDeadlineRenderSubmission
+
+    submission = ShotgunDeadlineSubmission()
+
+    assert type(submission) is ShotgunDeadlineRenderSubmission
+    assert isinstance(submission, ShotgunDeadlineSubmission)
+    assert isinstance(submission, Submission)
+    # initialized by the Deadline submission
+    assert submission.jobId is None
+    assert submission.children() == []
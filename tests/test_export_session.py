@@ -0,0 +1,88 @@
+"""
+Tests of the end of the exports, the finalizers of their session running once
+every task reported back.
+"""
+
+import os
+
+import pytest
+
+import harness
+
+harness.app.load_app_module()
+
+from tk_hiero_export import ShotgunTranscodeExporter, NULL_TRACER  # noqa: E402
+from tk_hiero_export.export_session import ExportSession  # noqa: E402
+
+
+@pytest.fixture
+def finalized(monkeypatch):
+    """
+    Counts the sessions finalized, and the tasks they were waiting for at
+    the time.
+    """
+    sessions = []
+    finalize = ExportSession.finalize
+
+    def counting(session):
+        sessions.append(len(session._tasks))
+        finalize(session)
+
+    monkeypatch.setattr(ExportSession, "finalize", counting)
+    return sessions
+
+
+def test_export_is_finalized(tmp_path, finalized):
+    app = harness.create_app(harness.FakeShotgun(), str(tmp_path))
+    preset = harness.make_preset(app, str(tmp_path))
+
+    harness.run_export(app, harness.shot_items(harness.build_sequence(2)), preset)
+
+    assert finalized == [0]
+    assert app.export_journal is None
+
+
+def test_failing_task_is_finished(tmp_path, monkeypatch, finalized):
+    app = harness.create_app(harness.FakeShotgun(), str(tmp_path))
+    preset = harness.make_preset(app, str(tmp_path), nuke_script=False)
+
+    def fail(task):
+        raise RuntimeError("preview render crashed")
+
+    # the plate is the last task of the only shot
+    monkeypatch.setattr(ShotgunTranscodeExporter, "_finish_preview_render", fail)
+    with pytest.raises(RuntimeError):
+        harness.run_export(app, harness.shot_items(harness.build_sequence(1)), preset)
+
+    assert finalized == [0]
+    # and the failure is recorded, the shot is exported again the next time
+    assert app.fingerprint_store._fingerprints == {}
+
+
+def test_export_without_tasks_is_finalized(tmp_path, finalized):
+    app = harness.create_app(harness.FakeShotgun(), str(tmp_path))
+    preset = harness.make_preset(
+        app, str(tmp_path), properties={"skipUnchangedShots": True}
+    )
+    sequence = harness.build_sequence(2)
+
+    harness.run_export(app, harness.shot_items(sequence), preset)
+    # nothing changed, every shot is skipped
+    result = harness.run_export(app, harness.shot_items(sequence), preset)
+
+    assert all(task._skip_export for task in result.tasks)
+    assert finalized == [0, 0]
+    assert app.export_journal is None
+
+
+def test_trace_is_released(tmp_path):
+    app = harness.create_app(
+        harness.FakeShotgun(), str(tmp_path), {"trace_exports": True}
+    )
+    preset = harness.make_preset(app, str(tmp_path))
+
+    harness.run_export(app, harness.shot_items(harness.build_sequence(2)), preset)
+
+    [trace] = os.listdir(os.path.join(app.export_state_location, "traces"))
+    assert trace.endswith(".json")
+    assert app.tracer is NULL_TRACER
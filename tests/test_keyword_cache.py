@@ -0,0 +1,99 @@
+"""
+Tests of the custom keyword values resolved in bulk before the tasks are
+queued.
+"""
+
+import pytest
+
+import harness
+
+harness.app.load_app_module()
+
+from tk_hiero_export.keyword_cache import CustomKeywordCache  # noqa: E402
+
+SETTINGS = {
+    "custom_template_fields": [{"keyword": "code", "description": "The shot code"}]
+}
+
+
+@pytest.fixture
+def resolved(monkeypatch):
+    """
+    The shot names whose keyword values were cached.
+    """
+    names = []
+    update = CustomKeywordCache.update
+
+    def recording(cache, task, values):
+        update(cache, task, values)
+        names.append(task._item.name())
+
+    monkeypatch.setattr(CustomKeywordCache, "update", recording)
+    return names
+
+
+def keyword_app(tmp_path, monkeypatch, resolve_keywords):
+    """
+    Returns an app whose resolve_keywords hook method is replaced.
+    """
+    app = harness.create_app(harness.FakeShotgun(), str(tmp_path), SETTINGS)
+    execute_hook_method = app.execute_hook_method
+
+    def execute(hook_name, method_name, **kwargs):
+        if method_name == "resolve_keywords":
+            return resolve_keywords(kwargs["tasks"], kwargs["keywords"])
+        return execute_hook_method(hook_name, method_name, **kwargs)
+
+    monkeypatch.setattr(app, "execute_hook_method", execute)
+    return app
+
+
+def test_bulk_failure_resolves_lazily(tmp_path, monkeypatch, resolved):
+    def fail(tasks, keywords):
+        raise RuntimeError("query timed out")
+
+    app = keyword_app(tmp_path, monkeypatch, fail)
+    preset = harness.make_preset(app, str(tmp_path))
+    result = harness.run_export(
+        app, harness.shot_items(harness.build_sequence(3)), preset
+    )
+
+    assert not [task.error() for task in result.tasks if task.error()]
+    assert resolved == []
+
+
+def test_bad_values_of_a_shot(tmp_path, monkeypatch, resolved):
+    def resolve(tasks, keywords):
+        values = [{"{code}": task._item.name()} for task in tasks]
+        # not a dictionary of values
+        values[0] = ["bogus"]
+        return values
+
+    app = keyword_app(tmp_path, monkeypatch, resolve)
+    preset = harness.make_preset(app, str(tmp_path))
+    sequence = harness.build_sequence(3)
+    result = harness.run_export(app, harness.shot_items(sequence), preset)
+
+    assert not [task.error() for task in result.tasks if task.error()]
+    names = [item.name() for item in harness.shot_items(sequence)]
+    assert resolved == names[1:]
+
+
+def test_skipped_shots_are_not_resolved(tmp_path, monkeypatch, resolved):
+    requested = []
+
+    def resolve(tasks, keywords):
+        requested.append(len(tasks))
+        return [{} for task in tasks]
+
+    app = keyword_app(tmp_path, monkeypatch, resolve)
+    preset = harness.make_preset(
+        app, str(tmp_path), properties={"skipUnchangedShots": True}
+    )
+    sequence = harness.build_sequence(3)
+
+    harness.run_export(app, harness.shot_items(sequence), preset)
+    # nothing changed, every shot is skipped
+    harness.run_export(app, harness.shot_items(sequence), preset)
+
+    assert requested == [3]
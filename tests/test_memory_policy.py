@@ -0,0 +1,146 @@
+"""
+Tests of the memory policy of the exports: the tasks release what they hold
+once finished, and the memory ceiling holds back the start of new tasks.
+"""
+
+import logging
+
+import pytest
+
+import harness
+
+harness.app.load_app_module()
+
+from tk_hiero_export import memory_policy  # noqa: E402
+from tk_hiero_export.memory_policy import ExportMemoryPolicy  # noqa: E402
+
+LOGGER = logging.getLogger("test_memory_policy")
+
+MB = 1024 * 1024
+
+
+class Task(object):
+    def __init__(self, collate=False):
+        self._thumbnail = b"png"
+        self._version_data = {"code": "sh010"}
+        self._sequence = object()
+        self._collatedItemsMap = {"a": 1}
+        self._collate = collate
+
+
+def test_release(monkeypatch):
+    policy = ExportMemoryPolicy(LOGGER)
+    (task, collated) = (Task(), Task(collate=True))
+    policy.task_finished(task)
+    policy.task_finished(collated)
+
+    assert task._thumbnail is None
+    assert task._version_data is None
+    # only the sequences of the collated tasks are copies
+    assert task._sequence is not None
+    assert collated._sequence is None
+    assert collated._collatedItemsMap == {}
+    # attributes the task didn't have aren't added
+    assert not hasattr(task, "_cut_item_data")
+
+
+def test_ceiling(monkeypatch):
+    rss = [900 * MB]
+    monkeypatch.setattr(memory_policy, "resident_memory", lambda: rss[0])
+    policy = ExportMemoryPolicy(LOGGER, ceiling_mb=500)
+    (first, second, third) = (Task(), Task(), Task())
+
+    # nothing else is running, waiting would not free anything
+    assert policy.admit(first)
+    assert not policy.admit(second)
+    assert not policy.admit(second)
+
+    # once the running tasks are done, the next one starts whatever the
+    # memory
+    policy.task_finished(first)
+    assert policy.admit(second)
+    assert policy.admit(second)
+
+    # and below the ceiling, the tasks start right away
+    rss[0] = 100 * MB
+    assert policy.admit(third)
+
+
+def test_hold_time(monkeypatch):
+    monkeypatch.setattr(memory_policy, "resident_memory", lambda: 900 * MB)
+    now = [0.0]
+    policy = ExportMemoryPolicy(
+        LOGGER, ceiling_mb=500, max_hold_time=60.0, clock=lambda: now[0]
+    )
+    (first, second) = (Task(), Task())
+
+    # the first task never reports back
+    assert policy.admit(first)
+    assert not policy.admit(second)
+    now[0] = 59.0
+    assert not policy.admit(second)
+
+    # the second one starts anyway once held back long enough
+    now[0] = 60.0
+    assert policy.admit(second)
+
+
+def test_no_ceiling(monkeypatch):
+    monkeypatch.setattr(memory_policy, "resident_memory", lambda: 900 * MB)
+    policy = ExportMemoryPolicy(LOGGER)
+    assert all(policy.admit(Task()) for _ in range(10))
+
+
+def test_phases(monkeypatch, caplog):
+    rss = [100 * MB]
+    monkeypatch.setattr(memory_policy, "resident_memory", lambda: rss[0])
+    policy = ExportMemoryPolicy(LOGGER)
+    rss[0] = 300 * MB
+    policy.sample()
+    rss[0] = 200 * MB
+    with caplog.at_level(logging.DEBUG, logger="test_memory_policy"):
+        policy.end_phase("preprocessing")
+        policy.end_phase("the tasks")
+    assert [record.getMessage() for record in caplog.records] == [
+        "Memory of the export after preprocessing: 200MB, peak 300MB.",
+        "Memory of the export after the tasks: 200MB, peak 200MB.",
+    ]
+
+
+def test_export_releases_the_tasks(tmp_path):
+    shotgun = harness.FakeShotgun()
+    app = harness.create_app(shotgun, str(tmp_path), {"export_memory_ceiling": 1})
+    sequence = harness.build_sequence(3)
+    preset = harness.make_preset(app, str(tmp_path))
+
+    result = harness.run_export(app, harness.shot_items(sequence), preset)
+
+    assert not [task.error() for task in result.tasks if task.error()]
+    for task in result.tasks:
+        assert getattr(task, "_thumbnail", None) is None
+        assert getattr(task, "_version_data", None) is None
+    # the compressed thumbnails were uploaded
+    assert shotgun.calls["upload_thumbnail"] > 0
+
+
+def test_failing_task_is_released(tmp_path, monkeypatch):
+    from tk_hiero_export import ShotgunTranscodeExporter
+    from tk_hiero_export.export_fingerprint import ExportFingerprintStore
+
+    app = harness.create_app(
+        harness.FakeShotgun(), str(tmp_path), {"export_memory_ceiling": 1}
+    )
+    preset = harness.make_preset(app, str(tmp_path), nuke_script=False)
+    task_finished = ExportFingerprintStore.task_finished
+
+    def failing(store, task, success):
+        if isinstance(task, ShotgunTranscodeExporter):
+            raise IOError("disk full")
+        task_finished(store, task, success)
+
+    # the plate is the last task of the only shot
+    monkeypatch.setattr(ExportFingerprintStore, "task_finished", failing)
+    with pytest.raises(IOError):
+        harness.run_export(app, harness.shot_items(harness.build_sequence(1)), preset)
+
+    assert app.memory_policy._running == set()
@@ -0,0 +1,186 @@
+"""
+Tests of the parallel multipart uploads, against a local http server standing
+in for the storage and an api stand-in handing out its upload links.
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import harness
+
+harness.app.load_app_module()
+
+from tk_hiero_export.multipart_upload import (  # noqa: E402
+    MultipartUploader,
+    UploadError,
+)
+
+LOGGER = logging.getLogger("test_multipart_upload")
+
+PART_SIZE = 1024
+
+
+class Storage(ThreadingHTTPServer):
+    """
+    Keeps the parts PUT to ``/<upload id>/<part number>``, ``fail`` lists the
+    parts refused with a 500 error.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        self.parts = {}
+        self.puts = []
+        self.fail = set()
+        self.lock = threading.Lock()
+        ThreadingHTTPServer.__init__(self, ("127.0.0.1", 0), StorageHandler)
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%d" % self.server_address[1]
+
+
+class StorageHandler(BaseHTTPRequestHandler):
+    def do_PUT(self):
+        (upload_id, part_number) = self.path.strip("/").split("/")
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if int(part_number) in self.server.fail:
+            self.send_response(500)
+            self.end_headers()
+            return
+        etag = hashlib.md5(body).hexdigest()
+        with self.server.lock:
+            self.server.puts.append((upload_id, int(part_number)))
+            self.server.parts[(upload_id, int(part_number))] = (etag, body)
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class Site(object):
+    """
+    The upload steps of the api: a new upload id for every upload, the
+    uploads of ``expired`` being refused.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.expired = set()
+        self.linked = []
+        self.next_id = 0
+
+    def upload(self, entity_type, entity_id, path, field_name=None, **kwargs):
+        self.next_id += 1
+        upload_info = {"upload_id": "upload%d" % self.next_id, "timestamp": "now"}
+        self._multipart_upload_file_to_storage(path, upload_info)
+        self.linked.append(upload_info["upload_id"])
+        return self.next_id
+
+    def _get_upload_part_link(self, upload_info, filename, part_number):
+        if upload_info["upload_id"] in self.expired:
+            raise Exception("NoSuchUpload")
+        return "%s/%s/%d" % (self.storage.url, upload_info["upload_id"], part_number)
+
+    def _complete_multipart_upload(self, upload_info, filename, etags):
+        upload_id = upload_info["upload_id"]
+        if upload_id in self.expired:
+            raise Exception("NoSuchUpload")
+        for part_number, etag in enumerate(etags, 1):
+            if self.storage.parts[(upload_id, part_number)][0] != etag:
+                raise Exception("InvalidPart %d" % part_number)
+
+    def content(self, upload_id):
+        parts = sorted(
+            (number, body)
+            for ((uid, number), (_, body)) in self.storage.parts.items()
+            if uid == upload_id
+        )
+        return b"".join(body for (_, body) in parts)
+
+
+@pytest.fixture
+def site():
+    storage = Storage()
+    thread = threading.Thread(target=storage.serve_forever)
+    thread.daemon = True
+    thread.start()
+    try:
+        yield Site(storage)
+    finally:
+        storage.shutdown()
+        storage.server_close()
+
+
+@pytest.fixture
+def movie(tmp_path):
+    path = str(tmp_path / "sh010_v001.mov")
+    with open(path, "wb") as fh:
+        fh.write(os.urandom(PART_SIZE * 4 + 100))
+    return path
+
+
+def _uploader(site, tmp_path):
+    return MultipartUploader(
+        site,
+        str(tmp_path / "uploads"),
+        part_size=PART_SIZE,
+        max_retries=0,
+        logger=LOGGER,
+    )
+
+
+def _read(path):
+    with open(path, "rb") as fh:
+        return fh.read()
+
+
+def test_upload(site, movie, tmp_path):
+    _uploader(site, tmp_path).upload("Version", 1, movie, "sg_uploaded_movie")
+
+    assert site.linked == ["upload1"]
+    assert site.content("upload1") == _read(movie)
+    assert sorted(site.storage.puts) == [("upload1", p) for p in range(1, 6)]
+    # nothing left to resume
+    assert os.listdir(str(tmp_path / "uploads")) == []
+
+
+def test_aborted_upload_is_resumed(site, movie, tmp_path):
+    site.storage.fail = {4}
+    with pytest.raises(UploadError):
+        _uploader(site, tmp_path).upload("Version", 1, movie)
+    assert site.linked == []
+
+    site.storage.fail = set()
+    del site.storage.puts[:]
+    _uploader(site, tmp_path).upload("Version", 1, movie)
+
+    # only the missing part was sent, to the upload which was aborted
+    assert site.storage.puts == [("upload1", 4)]
+    assert site.linked == ["upload1"]
+    assert site.content("upload1") == _read(movie)
+
+
+def test_expired_upload_starts_over(site, movie, tmp_path):
+    site.storage.fail = {4}
+    with pytest.raises(UploadError):
+        _uploader(site, tmp_path).upload("Version", 1, movie)
+
+    # the site dropped the aborted upload in the meantime
+    site.storage.fail = set()
+    site.expired.add("upload1")
+    del site.storage.puts[:]
+    _uploader(site, tmp_path).upload("Version", 1, movie)
+
+    # every part was sent again, to the new upload
+    assert sorted(site.storage.puts) == [("upload2", p) for p in range(1, 6)]
+    assert site.linked == ["upload2"]
+    assert site.content("upload2") == _read(movie)
+    assert os.listdir(str(tmp_path / "uploads")) == []
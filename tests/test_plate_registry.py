@@ -0,0 +1,122 @@
+"""
+Tests of the registry of the plates rendered by previous exports.
+"""
+
+import os
+
+import harness
+
+harness.app.load_app_module()
+
+import hiero.core  # noqa: E402
+
+from tk_hiero_export.plate_registry import (  # noqa: E402
+    PlateRegistry,
+    compute_plate_key,
+    frame_path,
+)
+
+PLATE = "/plates/sh010.####.exr"
+
+
+class Task(object):
+    def __init__(self, item):
+        self._item = item
+        self._preset = hiero.core.TaskPresetBase(None, "plate")
+        self._preset.properties().update({"file_type": "exr", "exr": {}})
+
+    def inputRange(self):
+        return (0, 47)
+
+
+def make_item(media_path, colorspace="linear"):
+    clip = hiero.core.Clip("sh010", path=media_path, colorspace=colorspace)
+    item = hiero.core.TrackItem("sh010")
+    item.setSource(clip)
+    item.setTimes(0, 47, 0, 47)
+    return item
+
+
+def write_frames(path, first, last, content=b"frame"):
+    folder = os.path.dirname(frame_path(path, first))
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    for frame in range(first, last + 1):
+        with open(frame_path(path, frame), "wb") as fh:
+            fh.write(content)
+
+
+def test_key_follows_the_colour_transform(tmp_path):
+    media = str(tmp_path / "sh010.mov")
+    write_frames(media, 0, 0)
+
+    key = compute_plate_key(Task(make_item(media)))
+    assert compute_plate_key(Task(make_item(media))) == key
+    assert compute_plate_key(Task(make_item(media, colorspace="rec709"))) != key
+
+
+def test_key_follows_the_media_files(tmp_path):
+    media = str(tmp_path / "sh010.mov")
+    write_frames(media, 0, 0)
+    key = compute_plate_key(Task(make_item(media)))
+
+    # the media delivered again at the same path
+    write_frames(media, 0, 0, content=b"new delivery")
+    os.utime(media, (1, 1))
+    assert compute_plate_key(Task(make_item(media))) != key
+
+
+def test_register_forgets_overwritten_plates(tmp_path):
+    registry = PlateRegistry(str(tmp_path / "registry.json"))
+    path = str(tmp_path / "sh010" / "sh010.####.exr")
+    write_frames(path, 1001, 1010)
+
+    registry.register("old", path, 1001, 1010)
+    # rendered again at the same path with other settings
+    registry.register("new", path, 1001, 1010)
+
+    assert registry.find("old", 10) is None
+    assert registry.find("new", 10)["path"] == path
+    # and saved that way
+    reloaded = PlateRegistry(str(tmp_path / "registry.json"))
+    assert reloaded.find("old", 10) is None
+
+
+def test_release_breaks_the_hard_links(tmp_path):
+    registry = PlateRegistry(str(tmp_path / "registry.json"))
+    source = str(tmp_path / "v001" / "sh010.####.exr")
+    linked = str(tmp_path / "v002" / "sh010.####.exr")
+    write_frames(source, 1001, 1010)
+    registry.register("plate", source, 1001, 1010)
+
+    registry.link(registry.find("plate", 10), linked, 1001)
+    assert (
+        os.stat(frame_path(linked, 1001)).st_ino
+        == os.stat(frame_path(source, 1001)).st_ino
+    )
+
+    # the linked plate is about to be rendered with other settings
+    registry.release(linked, 1001, 1010)
+    write_frames(linked, 1001, 1010, content=b"other settings")
+
+    with open(frame_path(source, 1001), "rb") as fh:
+        assert fh.read() == b"frame"
+    assert registry.find("plate", 10)["path"] == source
+
+    # releasing the registered path forgets the plate
+    registry.release(source, 1001, 1010)
+    assert registry.find("plate", 10) is None
+
+
+def test_link_forgets_the_plate_it_replaces(tmp_path):
+    registry = PlateRegistry(str(tmp_path / "registry.json"))
+    (first, second) = (str(tmp_path / "a.####.exr"), str(tmp_path / "b.####.exr"))
+    write_frames(first, 1, 5)
+    write_frames(second, 1, 5, content=b"b")
+    registry.register("a", first, 1, 5)
+    registry.register("b", second, 1, 5)
+
+    registry.link(registry.find("a", 5), second, 1)
+
+    assert registry.find("b", 5) is None
+    assert registry.find("a", 5)["path"] == first
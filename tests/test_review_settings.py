@@ -0,0 +1,31 @@
+"""
+Tests of the review movie settings of the get_quicktime_settings hook.
+"""
+
+import harness
+
+harness.app.load_app_module()
+
+from tk_hiero_export import ShotgunTranscodeExporter  # noqa: E402
+
+LEGACY_HOOK = "{config}/hiero_get_quicktime_settings_legacy.py"
+
+
+class Task(object):
+    def __init__(self, app):
+        self.app = app
+
+
+def review_settings(tmp_path, hook=None):
+    settings = {"hook_get_quicktime_settings": hook} if hook else None
+    app = harness.create_app(harness.FakeShotgun(), str(tmp_path), settings)
+    return ShotgunTranscodeExporter._get_review_settings(Task(app))
+
+
+def test_default_hook(tmp_path):
+    assert review_settings(tmp_path) == {"max_width": 2048}
+
+
+def test_hook_overridden_before_the_review_settings(tmp_path):
+    # the review movie keeps the plate's resolution
+    assert review_settings(tmp_path, LEGACY_HOOK) == {}
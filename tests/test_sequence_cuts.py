@@ -0,0 +1,81 @@
+"""
+Tests of the exports of several sequences at once, each sequence getting its
+own Cut.
+"""
+
+import threading
+
+import pytest
+
+import harness
+
+harness.app.load_app_module()
+
+
+def export_sequences(tmp_path, shotgun, settings=None):
+    app = harness.create_app(shotgun, str(tmp_path), settings)
+    sequences = [
+        harness.build_sequence(3, name="reel_%d" % (index + 1)) for index in range(3)
+    ]
+    preset = harness.make_preset(app, str(tmp_path))
+    items = [item for sequence in sequences for item in harness.shot_items(sequence)]
+    result = harness.run_export(app, items, preset)
+    assert not [task.error() for task in result.tasks if task.error()]
+    return result
+
+
+@pytest.mark.parametrize("cut_threads", [1, 4])
+def test_a_cut_per_sequence(tmp_path, cut_threads):
+    shotgun = harness.FakeShotgun()
+    export_sequences(tmp_path, shotgun, {"cut_threads": cut_threads})
+
+    cuts = dict((cut["code"], cut) for cut in shotgun.records("Cut"))
+    assert sorted(cuts) == ["reel_1", "reel_2", "reel_3"]
+
+    for cut in cuts.values():
+        items = [
+            item
+            for item in shotgun.records("CutItem")
+            if item["cut"]["id"] == cut["id"]
+        ]
+        # each cut has its own cut order
+        assert sorted(item["cut_order"] for item in items) == [1, 2, 3]
+        assert cut["duration"] == sum(item["cut_item_duration"] for item in items)
+
+
+def test_cuts_are_created_concurrently(tmp_path):
+    shotgun = harness.FakeShotgun()
+    threads = set()
+    create = shotgun.create
+
+    def record_thread(entity_type, data, *args, **kwargs):
+        if entity_type == "Cut":
+            threads.add(threading.current_thread().ident)
+        return create(entity_type, data, *args, **kwargs)
+
+    shotgun.create = record_thread
+    export_sequences(tmp_path, shotgun)
+
+    assert len(shotgun.records("Cut")) == 3
+    assert threading.current_thread().ident not in threads
+
+
+def test_hooks_run_on_the_main_thread(tmp_path):
+    shotgun = harness.FakeShotgun()
+    threads = set()
+
+    # the get_shot hook looks up and creates the Shots and their Sequences,
+    # reading the Hiero items
+    def recording(method):
+        def record_thread(entity_type, *args, **kwargs):
+            if entity_type in ("Shot", "Sequence"):
+                threads.add(threading.current_thread().ident)
+            return method(entity_type, *args, **kwargs)
+
+        return record_thread
+
+    for name in ("find", "find_one", "create"):
+        setattr(shotgun, name, recording(getattr(shotgun, name)))
+    export_sequences(tmp_path, shotgun)
+
+    assert threads == set([threading.current_thread().ident])
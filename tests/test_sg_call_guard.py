@@ -0,0 +1,313 @@
+"""
+Tests of the rate limiting, retries and circuit breaker of the api calls,
+against the in-memory site throttling and dropping calls.
+"""
+
+import logging
+
+import pytest
+
+import harness
+
+harness.app.load_app_module()
+
+from tk_hiero_export.sg_call_guard import (  # noqa: E402
+    AdaptiveRateLimiter,
+    CircuitBreaker,
+    SGCallGuard,
+    SGSiteUnavailableError,
+    RELEASED_RATE,
+    THROTTLED_RATE,
+)
+
+LOGGER = logging.getLogger("test_sg_call_guard")
+
+
+class ProtocolError(Exception):
+    """
+    Raised by the api for the http errors of the site.
+    """
+
+    def __init__(self, errcode):
+        super(ProtocolError, self).__init__("%d error" % errcode)
+        self.errcode = errcode
+
+
+class Clock(object):
+    """
+    A clock only moving forward when something sleeps.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FlakySite(object):
+    """
+    Fails the next calls of a connection with the given errors.
+    """
+
+    def __init__(self, shotgun):
+        self.shotgun = shotgun
+        self.errors = []
+        # the methods failing, all of them by default
+        self.failing = None
+        # whether the failing creates go through before the error
+        self.create_before_failing = False
+
+    def _fail(self, method):
+        if self.errors and (self.failing is None or method in self.failing):
+            raise self.errors.pop(0)
+
+    def find_one(self, *args, **kwargs):
+        self._fail("find_one")
+        return self.shotgun.find_one(*args, **kwargs)
+
+    def create(self, entity_type, data, return_fields=None):
+        if self.errors and self.create_before_failing:
+            self.shotgun.create(entity_type, data, return_fields)
+        self._fail("create")
+        return self.shotgun.create(entity_type, data, return_fields)
+
+    def delete(self, *args):
+        self._fail("delete")
+        return self.shotgun.delete(*args)
+
+
+def make_guard(clock, **kwargs):
+    return SGCallGuard(
+        LOGGER, clock=clock, sleep=clock.sleep, jitter=lambda: 1.0, **kwargs
+    )
+
+
+@pytest.fixture
+def site():
+    shotgun = harness.FakeShotgun()
+    shotgun.seed("Shot", {"code": "sh010"})
+    return FlakySite(shotgun)
+
+
+def test_reads_are_retried(site):
+    clock = Clock()
+    sg = make_guard(clock).wrap(site)
+    site.errors = [ConnectionError("down"), ProtocolError(502)]
+
+    assert sg.find_one("Shot", [["code", "is", "sh010"]])["id"]
+    # exponential backoff between the attempts
+    assert clock.sleeps == [0.5, 1.0]
+
+
+def test_retries_give_up(site):
+    clock = Clock()
+    sg = make_guard(clock, retries=2).wrap(site)
+    site.errors = [ConnectionError("down")] * 3
+
+    with pytest.raises(ConnectionError):
+        sg.find_one("Shot", [])
+    assert clock.sleeps == [0.5, 1.0]
+
+
+def test_refused_calls_are_not_retried(site):
+    clock = Clock()
+    sg = make_guard(clock).wrap(site)
+    site.errors = [ValueError("invalid filter")]
+
+    with pytest.raises(ValueError):
+        sg.find_one("Shot", [])
+    assert clock.sleeps == []
+
+
+def test_unsafe_calls_are_not_retried(site):
+    clock = Clock()
+    sg = make_guard(clock).wrap(site)
+
+    site.errors = [ConnectionError("down")]
+    with pytest.raises(ConnectionError):
+        sg.delete("Shot", 1)
+
+    # creates can only be looked up with a code
+    site.errors = [ConnectionError("down")]
+    with pytest.raises(ConnectionError):
+        sg.create("Note", {"subject": "hello"})
+    assert site.shotgun.records("Note") == []
+
+
+@pytest.mark.parametrize("created", [False, True])
+def test_creates_are_not_duplicated(site, created):
+    clock = Clock()
+    sg = make_guard(clock).wrap(site)
+    site.errors = [ConnectionError("reset")]
+    site.failing = {"create"}
+    site.create_before_failing = created
+
+    version = sg.create("Version", {"code": "sh010_v001", "description": "plate"})
+
+    assert site.errors == []
+    [record] = site.shotgun.records("Version")
+    assert version["id"] == record["id"]
+    assert version["code"] == "sh010_v001"
+
+
+@pytest.mark.parametrize("created", [False, True])
+def test_creates_ignore_previous_exports(site, created):
+    clock = Clock()
+    sg = make_guard(clock).wrap(site)
+    # the Version of an earlier export, with the same code
+    previous = site.shotgun.seed("Version", {"code": "sh010_v001"})
+    # the Cut of the export before
+    site.shotgun.seed("Cut", {"code": "reel_1", "revision_number": 1})
+    site.errors = [ConnectionError("reset")] * 2
+    site.failing = {"create"}
+    site.create_before_failing = created
+
+    version = sg.create("Version", {"code": "sh010_v001", "description": "plate"})
+    cut = sg.create("Cut", {"code": "reel_1", "revision_number": 2})
+
+    assert version["id"] != previous["id"]
+    assert len(site.shotgun.records("Version")) == 2
+    assert sorted(c["revision_number"] for c in site.shotgun.records("Cut")) == [1, 2]
+    assert cut["revision_number"] == 2
+    assert site.errors == []
+
+
+def test_last_ids_are_read_once_per_export(site):
+    clock = Clock()
+    guard = make_guard(clock)
+    sg = guard.wrap(site)
+
+    sg.create("Version", {"code": "sh010_v001"})
+    sg.create("Version", {"code": "sh020_v001"})
+    assert site.shotgun.calls["find_one"] == 1
+
+    # the next export looks past the Versions of this one
+    guard.start_export()
+    sg.create("Version", {"code": "sh030_v001"})
+    assert site.shotgun.calls["find_one"] == 2
+
+
+def test_throttling_slows_down_the_calls(site):
+    clock = Clock()
+    guard = make_guard(clock, max_rate=8)
+    sg = guard.wrap(site)
+
+    site.errors = [ProtocolError(429)]
+    sg.find_one("Shot", [])
+    assert guard.limiter.rate == pytest.approx(4.0 + 8 / 100.0)
+
+    # the calls are spaced out, they would all have gone through right away
+    # at the maximum rate
+    clock.sleeps[:] = []
+    for _ in range(4):
+        sg.find_one("Shot", [])
+    assert sum(clock.sleeps) > 0.5
+
+
+def test_limiter_without_maximum():
+    clock = Clock()
+    limiter = AdaptiveRateLimiter(clock=clock, sleep=clock.sleep)
+    assert limiter.rate is None
+    assert limiter.acquire() == 0
+
+    limiter.throttled()
+    assert limiter.rate == THROTTLED_RATE
+    limiter.throttled()
+    assert limiter.rate == THROTTLED_RATE / 2
+
+    # the limit is lifted once the rate is back up
+    while limiter.rate is not None:
+        assert limiter.rate < RELEASED_RATE
+        limiter.succeeded()
+    assert limiter.acquire() == 0
+
+
+def test_circuit_breaker():
+    clock = Clock()
+    breaker = CircuitBreaker(threshold=3, cool_off=30.0, clock=clock)
+
+    assert not breaker.failed()
+    assert not breaker.failed()
+    assert breaker.failed()
+    assert breaker.wait_time() == 30.0
+
+    # a single probe once the cool off is over
+    clock.now += 30.0
+    assert breaker.wait_time() == 0
+    assert breaker.wait_time() == 1.0
+    # the probe failing opens the breaker again
+    assert breaker.failed()
+    assert breaker.wait_time() == 30.0
+
+    clock.now += 30.0
+    assert breaker.wait_time() == 0
+    breaker.succeeded()
+    assert not breaker.is_open
+    assert breaker.wait_time() == 0
+
+
+def test_calls_wait_for_the_site(site):
+    clock = Clock()
+    guard = make_guard(clock, retries=3, cool_off=30.0)
+    sg = guard.wrap(site)
+
+    # the site comes back after the breaker opened
+    site.errors = [ConnectionError("down")] * 5
+    with pytest.raises(ConnectionError):
+        sg.find_one("Shot", [])
+    assert sg.find_one("Shot", [], ["code"])["code"] == "sh010"
+    # the call waited for the cool off of the breaker
+    assert clock.now > 30.0
+    assert not guard.breaker.is_open
+
+    # and gives up when it stays down
+    site.errors = [ConnectionError("down")] * 20
+    with pytest.raises((ConnectionError, SGSiteUnavailableError)):
+        sg.find_one("Shot", [])
+    with pytest.raises(SGSiteUnavailableError):
+        sg.find_one("Shot", [])
+
+
+def test_export_on_a_busy_site(tmp_path):
+    shotgun = harness.FakeShotgun()
+    app = harness.create_app(shotgun, str(tmp_path))
+    clock = Clock()
+    app.sg_call_guard = make_guard(clock)
+
+    # every fourth read and create of the app is throttled
+    calls = {"count": 0}
+
+    class Throttling(object):
+        def __init__(self, sg):
+            self._sg = sg
+
+        def __getattr__(self, name):
+            method = getattr(self._sg, name)
+            if name not in ("find", "find_one", "create"):
+                return method
+
+            def throttled(*args, **kwargs):
+                calls["count"] += 1
+                if calls["count"] % 4 == 0:
+                    raise ProtocolError(503)
+                return method(*args, **kwargs)
+
+            return throttled
+
+    wrap = app.sg_call_guard.wrap
+    app.sg_call_guard.wrap = lambda sg: wrap(Throttling(sg))
+
+    sequence = harness.build_sequence(4)
+    preset = harness.make_preset(app, str(tmp_path))
+    result = harness.run_export(app, harness.shot_items(sequence), preset)
+
+    assert not [task.error() for task in result.tasks if task.error()]
+    assert app.sg_call_guard.retried > 0
+    assert len(shotgun.records("Shot")) == 4
+    assert len(shotgun.records("Cut")) == 1
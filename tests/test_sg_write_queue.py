@@ -0,0 +1,254 @@
+"""
+Tests of the write-ahead queue of the Flow Production Tracking writes,
+against the in-memory site going up and down.
+"""
+
+import os
+import time
+import logging
+import threading
+
+import pytest
+
+import harness
+
+harness.app.load_app_module()
+
+from tk_hiero_export.sg_write_queue import SGWriteQueue, SGWriteFlusher  # noqa: E402
+
+LOGGER = logging.getLogger("test_sg_write_queue")
+
+
+@pytest.fixture
+def site():
+    shotgun = harness.FakeShotgun()
+    shot = shotgun.seed("Shot", {"code": "sh010", "description": ""})
+    return (shotgun, shot)
+
+
+def _flusher(queue, shotgun):
+    return SGWriteFlusher(
+        queue, lambda: shotgun, LOGGER, retry_delay=0.01, max_retry_delay=0.05
+    )
+
+
+def _drain(flusher, timeout=5.0):
+    flusher.finish()
+    assert flusher.join(timeout), "the queue was not drained"
+
+
+def test_writes_are_sent_in_order(tmp_path, site):
+    (shotgun, shot) = site
+    queue = SGWriteQueue(str(tmp_path / "queue.db"))
+    sg = queue.wrap(shotgun)
+
+    for description in ["first", "second", "third"]:
+        result = sg.update("Shot", shot["id"], {"description": description})
+        assert result == {"type": "Shot", "id": shot["id"], "description": description}
+
+    # nothing was sent yet
+    assert shotgun.calls["update"] == 0
+    assert queue.pending_count() == 3
+
+    flusher = _flusher(queue, shotgun)
+    flusher.start()
+    _drain(flusher)
+
+    assert shotgun.calls["update"] == 3
+    assert shotgun.records("Shot")[0]["description"] == "third"
+    assert queue.pending_count() == 0
+
+
+def test_writes_wait_for_the_site_to_come_back(tmp_path, site):
+    (shotgun, shot) = site
+    queue = SGWriteQueue(str(tmp_path / "queue.db"))
+    shotgun.online = False
+
+    flusher = _flusher(queue, shotgun)
+    flusher.start()
+    queue.wrap(shotgun).update("Shot", shot["id"], {"description": "offline"})
+    queue.wrap(shotgun).update("Shot", shot["id"], {"description": "back"})
+
+    time.sleep(0.2)
+    assert queue.pending_count() == 2
+
+    shotgun.online = True
+    _drain(flusher)
+
+    assert shotgun.records("Shot")[0]["description"] == "back"
+    assert shotgun.calls["update"] == 2
+
+
+def test_site_flapping(tmp_path, site):
+    (shotgun, shot) = site
+    queue = SGWriteQueue(str(tmp_path / "queue.db"))
+    flusher = _flusher(queue, shotgun)
+    flusher.start()
+
+    stop = threading.Event()
+
+    def flap():
+        while not stop.is_set():
+            shotgun.online = not shotgun.online
+            time.sleep(0.003)
+        shotgun.online = True
+
+    flapper = threading.Thread(target=flap)
+    flapper.start()
+    try:
+        for i in range(50):
+            queue.wrap(shotgun).update("Shot", shot["id"], {"sg_cut_order": i})
+    finally:
+        time.sleep(0.1)
+        stop.set()
+        flapper.join()
+    _drain(flusher)
+
+    assert shotgun.records("Shot")[0]["sg_cut_order"] == 49
+    assert shotgun.calls["update"] == 50
+
+
+def test_identical_writes_are_queued_once(tmp_path, site):
+    (shotgun, shot) = site
+    queue = SGWriteQueue(str(tmp_path / "queue.db"))
+
+    assert queue.put("update", ("Shot", shot["id"], {"description": "a"}))
+    assert not queue.put("update", ("Shot", shot["id"], {"description": "a"}))
+    assert queue.put("update", ("Shot", shot["id"], {"description": "b"}), key="b")
+    assert not queue.put("update", ("Shot", shot["id"], {"description": "c"}), key="b")
+    assert queue.pending_count() == 2
+
+
+def test_value_written_back_is_sent(tmp_path, site):
+    (shotgun, shot) = site
+    queue = SGWriteQueue(str(tmp_path / "queue.db"))
+    sg = queue.wrap(shotgun)
+
+    for description in ["X", "Y", "X"]:
+        sg.update("Shot", shot["id"], {"description": description})
+    # the same value for another entity
+    sg.update("Shot", shot["id"] + 1000, {"description": "X"})
+    assert queue.pending_count() == 4
+
+    flusher = _flusher(queue, shotgun)
+    flusher.start()
+    _drain(flusher)
+
+    assert shotgun.records("Shot")[0]["description"] == "X"
+
+
+def test_writes_survive_a_restart(tmp_path, site):
+    (shotgun, shot) = site
+    path = str(tmp_path / "queue.db")
+
+    queue = SGWriteQueue(path)
+    queue.wrap(shotgun).update("Shot", shot["id"], {"description": "persisted"})
+    queue.close()
+
+    queue = SGWriteQueue(path)
+    assert queue.pending_count() == 1
+    flusher = _flusher(queue, shotgun)
+    flusher.start()
+    _drain(flusher)
+
+    assert shotgun.records("Shot")[0]["description"] == "persisted"
+
+
+def test_refused_writes_are_set_aside(tmp_path, site):
+    (shotgun, shot) = site
+    queue = SGWriteQueue(str(tmp_path / "queue.db"))
+    sg = queue.wrap(shotgun)
+
+    sg.update("Shot", shot["id"] + 1000, {"description": "missing"})
+    sg.update("Shot", shot["id"], {"description": "sent"})
+
+    flusher = _flusher(queue, shotgun)
+    flusher.start()
+    _drain(flusher)
+
+    assert shotgun.records("Shot")[0]["description"] == "sent"
+    assert [(method, args[1]) for (method, args, error) in queue.failed()] == [
+        ("update", shot["id"] + 1000)
+    ]
+
+
+def test_uploaded_files_are_spooled(tmp_path, site):
+    (shotgun, shot) = site
+    queue = SGWriteQueue(str(tmp_path / "queue.db"))
+
+    path = tmp_path / "thumbnail.png"
+    path.write_bytes(b"png")
+    queue.wrap(shotgun).upload_thumbnail("Shot", shot["id"], str(path))
+    # the caller is free to remove its file
+    path.unlink()
+
+    uploaded = []
+    upload_thumbnail = shotgun.upload_thumbnail
+
+    def check_upload_thumbnail(entity_type, entity_id, path, **kwargs):
+        uploaded.append(open(path, "rb").read())
+        return upload_thumbnail(entity_type, entity_id, path, **kwargs)
+
+    shotgun.upload_thumbnail = check_upload_thumbnail
+    flusher = _flusher(queue, shotgun)
+    flusher.start()
+    _drain(flusher)
+
+    assert uploaded == [b"png"]
+    assert os.listdir(str(tmp_path / "queue.files")) == []
+
+
+def test_export_with_the_site_down(tmp_path):
+    shotgun = harness.FakeShotgun()
+    app = harness.create_app(shotgun, str(tmp_path), {"queue_sg_writes": True})
+    sequence = harness.build_sequence(5)
+    preset = harness.make_preset(app, str(tmp_path))
+
+    # the site goes down once the shots and Versions are created, the
+    # updates and uploads wait for it
+    create = shotgun.create
+
+    def create_then_go_down(entity_type, data, *args, **kwargs):
+        result = create(entity_type, data, *args, **kwargs)
+        if entity_type == "Version" and data["code"].startswith("Sh005"):
+            shotgun.online = False
+        return result
+
+    shotgun.create = create_then_go_down
+    result = harness.run_export(app, harness.shot_items(sequence), preset)
+    assert not [task.error() for task in result.tasks if task.error()]
+
+    flusher = app.sg_write_flusher
+    assert app.sg_write_queue is None
+    assert flusher.queue.pending_count() > 0
+
+    shotgun.online = True
+    assert flusher.join(5.0)
+    assert flusher.queue.pending_count() == 0
+    assert all(shot.get("sg_cut_order") for shot in shotgun.records("Shot"))
+
+
+def test_queued_writes_are_in_the_ledger(tmp_path, monkeypatch):
+    from tk_hiero_export import ShotgunShotProcessor
+
+    shotgun = harness.FakeShotgun()
+    app = harness.create_app(
+        shotgun, str(tmp_path), {"queue_sg_writes": True, "sg_call_ledger": True}
+    )
+    ledgers = []
+    report_ledger = ShotgunShotProcessor._reportLedger
+
+    def keep_ledger(processor, path):
+        ledgers.append(app.sg_ledger)
+        report_ledger(processor, path)
+
+    monkeypatch.setattr(ShotgunShotProcessor, "_reportLedger", keep_ledger)
+    preset = harness.make_preset(app, str(tmp_path))
+    harness.run_export(app, harness.shot_items(harness.build_sequence(3)), preset)
+    assert app.sg_write_flusher.join(5.0)
+
+    [ledger] = ledgers
+    for method in ("update", "upload_thumbnail"):
+        recorded = [call for call in ledger.calls if call["method"] == method]
+        assert recorded
+        assert len(recorded) == shotgun.calls[method]
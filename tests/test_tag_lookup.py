@@ -0,0 +1,43 @@
+"""
+Tests of the tags listed by the tag mapping table of the export dialog.
+"""
+
+import harness
+
+harness.app.load_app_module()
+
+import hiero.core  # noqa: E402
+
+from tk_hiero_export import ShotgunShotProcessorUI  # noqa: E402
+
+
+def test_tags_follow_the_open_projects(tmp_path, monkeypatch):
+    app = harness.create_app(harness.FakeShotgun(), str(tmp_path))
+    ui = ShotgunShotProcessorUI(harness.make_preset(app, str(tmp_path)))
+
+    tags = {}
+
+    def find_project_tags(project):
+        return tags.get(project.path() if project else None, [])
+
+    monkeypatch.setattr(hiero.core, "findProjectTags", find_project_tags)
+
+    first = hiero.core.Project(str(tmp_path / "first.hrox"))
+    tags[first.path()] = [hiero.core.Tag("plate")]
+    hiero.core.addProject(first)
+    try:
+        assert ui._get_all_tag_icons() == {"plate": ""}
+        # only names and icon paths are kept, not the tags of the project
+        for key, values in app.ui_lookup_cache.items():
+            assert all(isinstance(value, str) for pair in values for value in pair)
+
+        second = hiero.core.Project(str(tmp_path / "second.hrox"))
+        tags[second.path()] = [hiero.core.Tag("cg")]
+        hiero.core.addProject(second)
+        assert ui._get_all_tag_icons() == {"plate": "", "cg": ""}
+
+        first.close()
+        assert ui._get_all_tag_icons() == {"cg": ""}
+    finally:
+        for project in hiero.core.projects():
+            project.close()
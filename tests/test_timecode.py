@@ -0,0 +1,120 @@
+"""
+Tests of the conversion of frame numbers to timecodes, against a table of
+SMPTE timecodes, as displayed by Nuke Studio.
+"""
+
+import collections
+
+import pytest
+
+import harness
+
+harness.app.load_app_module()
+
+import hiero.core  # noqa: E402
+
+from tk_hiero_export.timecode import (  # noqa: E402
+    frames_to_timecodes,
+    frame_to_timecode,
+)
+
+# frame numbers and their timecodes, around the minute and ten minute
+# boundaries, where the drop frame timecodes skip frame numbers, and up to the
+# day wrap around
+KNOWN_TIMECODES = [
+    (0, 23.976, False, "00:00:00:00"),
+    (23, 23.976, False, "00:00:00:23"),
+    (24, 23.976, False, "00:00:01:00"),
+    (1439, 23.976, False, "00:00:59:23"),
+    (1440, 23.976, False, "00:01:00:00"),
+    (86399, 23.976, False, "00:59:59:23"),
+    (86400, 23.976, False, "01:00:00:00"),
+    (2073599, 23.976, False, "23:59:59:23"),
+    (2073600, 23.976, False, "00:00:00:00"),
+    (2074601, 23.976, False, "00:00:41:17"),
+    (0, 24.0, False, "00:00:00:00"),
+    (86399, 24.0, False, "00:59:59:23"),
+    (2073600, 24.0, False, "00:00:00:00"),
+    (24, 25.0, False, "00:00:00:24"),
+    (25, 25.0, False, "00:00:01:00"),
+    (89999, 25.0, False, "00:59:59:24"),
+    (90000, 25.0, False, "01:00:00:00"),
+    (2159999, 25.0, False, "23:59:59:24"),
+    (2160000, 25.0, False, "00:00:00:00"),
+    (1799, 29.97, False, "00:00:59:29"),
+    (1800, 29.97, False, "00:01:00:00"),
+    (107892, 29.97, False, "00:59:56:12"),
+    (107999, 29.97, False, "00:59:59:29"),
+    (0, 29.97, True, "00:00:00;00"),
+    (29, 29.97, True, "00:00:00;29"),
+    (30, 29.97, True, "00:00:01;00"),
+    (1799, 29.97, True, "00:00:59;29"),
+    (1800, 29.97, True, "00:01:00;02"),
+    (1801, 29.97, True, "00:01:00;03"),
+    (3597, 29.97, True, "00:01:59;29"),
+    (3598, 29.97, True, "00:02:00;02"),
+    (17981, 29.97, True, "00:09:59;29"),
+    (17982, 29.97, True, "00:10:00;00"),
+    (17983, 29.97, True, "00:10:00;01"),
+    (107891, 29.97, True, "00:59:59;29"),
+    (107892, 29.97, True, "01:00:00;00"),
+    (2589407, 29.97, True, "23:59:59;29"),
+    (2589408, 29.97, True, "00:00:00;00"),
+    (1800, 30.0, False, "00:01:00:00"),
+    (108000, 30.0, False, "01:00:00:00"),
+    (2592000, 30.0, False, "00:00:00:00"),
+    (47, 48.0, False, "00:00:00:47"),
+    (48, 48.0, False, "00:00:01:00"),
+    (172800, 48.0, False, "01:00:00:00"),
+    (49, 50.0, False, "00:00:00:49"),
+    (50, 50.0, False, "00:00:01:00"),
+    (180000, 50.0, False, "01:00:00:00"),
+    (4320000, 50.0, False, "00:00:00:00"),
+    (59, 59.94, True, "00:00:00;59"),
+    (60, 59.94, True, "00:00:01;00"),
+    (3599, 59.94, True, "00:00:59;59"),
+    (3600, 59.94, True, "00:01:00;04"),
+    (3603, 59.94, True, "00:01:00;07"),
+    (3604, 59.94, True, "00:01:00;08"),
+    (7195, 59.94, True, "00:01:59;59"),
+    (7196, 59.94, True, "00:02:00;04"),
+    (35963, 59.94, True, "00:09:59;59"),
+    (35964, 59.94, True, "00:10:00;00"),
+    (215784, 59.94, True, "01:00:00;00"),
+    (5178816, 59.94, True, "00:00:00;00"),
+    (3600, 59.94, False, "00:01:00:00"),
+    (216000, 59.94, False, "01:00:00:00"),
+    (3600, 60.0, False, "00:01:00:00"),
+    (216000, 60.0, False, "01:00:00:00"),
+    (5184000, 60.0, False, "00:00:00:00"),
+    # the drop frame display is ignored by the other frame rates
+    (1800, 25.0, True, "00:01:12:00"),
+    (1800, 24.0, True, "00:01:15:00"),
+]
+
+
+@pytest.mark.parametrize("frame, fps, drop_frame, timecode", KNOWN_TIMECODES)
+def test_known_timecodes(frame, fps, drop_frame, timecode):
+    assert frame_to_timecode(frame, fps, drop_frame) == timecode
+
+
+def test_bulk_conversion():
+    # the timecodes of each frame rate converted in one call, in reverse
+    # order
+    rates = collections.defaultdict(list)
+    for frame, fps, drop_frame, timecode in reversed(KNOWN_TIMECODES):
+        rates[(fps, drop_frame)].append((frame, timecode))
+    for (fps, drop_frame), known in rates.items():
+        frames = [frame for (frame, _) in known]
+        expected = [timecode for (_, timecode) in known]
+        assert frames_to_timecodes(frames, fps, drop_frame) == expected
+
+
+def test_time_base():
+    fps = hiero.core.TimeBase(29.97)
+    assert frames_to_timecodes([0, 17982], fps, True) == ["00:00:00;00", "00:10:00;00"]
+
+
+def test_invalid_frame_rate():
+    with pytest.raises(ValueError):
+        frames_to_timecodes([0], 0.0)